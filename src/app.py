@@ -6,19 +6,38 @@ Flaskを使用した勤怠管理システムのエントリーポイントです
 
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
 from applications.DBAccess import DBAccess
+from applications import (archive, assets, attendance_export, attendance_history, compression, conditional,
+                          csv_export, employee_directory, monthly_summary, pagination, project_report, range_report,
+                          xlsx_export)
+from applications.models import AttendanceRecord
+from applications.reference_cache import reference_cache
+from applications.time_format import to_minutes
 from functools import wraps
-from datetime import datetime, date, timedelta
+from datetime import date
 import hashlib
 import os
 
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
-# データベースの初期化（起動時）
+# ハッシュ付きの静的ファイル（テンプレートからはasset_url('css/app.css')で参照する）
+app.register_blueprint(assets.assets)
+app.add_template_global(assets.asset_url)
+try:
+    assets.ensure_built(app.static_folder)
+except OSError as e:
+    print(f"静的ファイルのビルドエラー（起動時）: {str(e)}")
+
+# HTML・JSONなどの応答をAccept-Encodingに応じてgzip・brotliで圧縮する
+compression.init_app(app)
+
+# データベースのバージョン確認（起動時）
+# 最新であればschema_versionへの1回のクエリのみで、マイグレーションはデプロイ時に
+# python -m applications.db_init で1回だけ実行する
 # Flask 2.x対応
 try:
-    from applications.db_init import init_database
-    init_database()
+    from applications.db_init import ensure_database
+    ensure_database()
 except Exception as e:
     print(f"データベース初期化エラー（起動時）: {str(e)}")
 
@@ -139,50 +158,30 @@ def dashboard():
         today = date.today()
         first_day = today.replace(day=1)
         
+        # 今月の勤怠記録が変わっていなければ、クエリと描画を行わずに304を返す
+        validator = conditional.probe(db, ('dashboard', session['user_id'], first_day), """
+            SELECT COUNT(*) AS record_count,
+                   UNIX_TIMESTAMP(MAX(updated_at)) AS records_modified,
+                   UNIX_TIMESTAMP() AS now
+            FROM attendance_records
+            WHERE employee_id = %s AND date >= %s
+        """, (session['user_id'], first_day))
+        if validator is not None and validator.matches():
+            return validator.not_modified()
+        
         records = db.execute_query("""
-            SELECT date, attendance_type, start_time, end_time, break_time
+            SELECT date, attendance_type, start_minute, end_minute, break_minutes
             FROM attendance_records
             WHERE employee_id = %s AND date >= %s
             ORDER BY date DESC
             LIMIT 10
-        """, (session['user_id'], first_day))
+        """, (session['user_id'], first_day), compact=True)
         
-        # timedeltaオブジェクトを文字列に変換
-        from datetime import timedelta
-        formatted_records = []
-        for record in records:
-            formatted_record = dict(record)
-            # start_time, end_time, break_timeをフォーマット
-            if formatted_record.get('start_time'):
-                if isinstance(formatted_record['start_time'], timedelta):
-                    total_seconds = int(formatted_record['start_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    formatted_record['start_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(formatted_record['start_time'], 'strftime'):
-                    formatted_record['start_time'] = formatted_record['start_time'].strftime('%H:%M')
-            
-            if formatted_record.get('end_time'):
-                if isinstance(formatted_record['end_time'], timedelta):
-                    total_seconds = int(formatted_record['end_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    formatted_record['end_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(formatted_record['end_time'], 'strftime'):
-                    formatted_record['end_time'] = formatted_record['end_time'].strftime('%H:%M')
-            
-            if formatted_record.get('break_time'):
-                if isinstance(formatted_record['break_time'], timedelta):
-                    total_seconds = int(formatted_record['break_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    formatted_record['break_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(formatted_record['break_time'], 'strftime'):
-                    formatted_record['break_time'] = formatted_record['break_time'].strftime('%H:%M')
-            
-            formatted_records.append(formatted_record)
+        # 時刻はテンプレートで参照したときにHH:MM形式の文字列に変換される
+        records = AttendanceRecord.from_rows(records)
         
-        return render_template('dashboard.html', records=formatted_records, user_name=session['user_name'])
+        response = render_template('dashboard.html', records=records, user_name=session['user_name'])
+        return validator.apply(response) if validator is not None else response
     except Exception as e:
         flash(f'エラー: {str(e)}', 'error')
         return render_template('dashboard.html', records=[], user_name=session.get('user_name', ''))
@@ -217,15 +216,23 @@ def attendance_input():
                 flash('日付と出勤区分は必須です', 'error')
                 return redirect(url_for('attendance_input'))
             
-            # 既存の記録があるか確認
+            # アーカイブ済みの記録は変更できない（通常のテーブルに同じ日の記録が重複して作成されるため）
+            if archive.may_be_archived(record_date) and db.execute_query(
+                f"SELECT id FROM {archive.ARCHIVE_RECORDS_TABLE} WHERE employee_id = %s AND date = %s LIMIT 1",
+                (session['user_id'], record_date)
+            ):
+                flash('締め済みの年度の勤怠記録は変更できません', 'error')
+                return redirect(url_for('attendance_input'))
+            
+            # 既存の記録があるか確認（月次集計の差分を正しく反映するため行をロック）
             existing = db.execute_query(
-                "SELECT id FROM attendance_records WHERE employee_id = %s AND date = %s",
+                "SELECT id FROM attendance_records WHERE employee_id = %s AND date = %s FOR UPDATE",
                 (session['user_id'], record_date)
             )
             
             # プロジェクト作業時間の取得
             project_hours = []
-            projects = db.execute_query("SELECT id, name FROM projects")
+            projects = reference_cache.get(db, 'projects')
             for project in projects:
                 hours_key = f'project_hours_{project["id"]}'
                 hours = request.form.get(hours_key)
@@ -236,22 +243,30 @@ def attendance_input():
             if existing:
                 # 更新
                 record_id = existing[0]['id']
+                # 月次集計から変更前の値を差し引き、変更後の値を加算する
+                monthly_summary.remove_record(db, record_id)
                 db.execute_query("""
                     UPDATE attendance_records
                     SET attendance_type = %s, start_time = %s, end_time = %s,
-                        break_time = %s, notes = %s
+                        break_time = %s, notes = %s,
+                        start_minute = %s, end_minute = %s, break_minutes = %s
                     WHERE id = %s
-                """, (attendance_type, start_time, end_time, break_time, notes, record_id))
+                """, (attendance_type, start_time, end_time, break_time, notes,
+                      to_minutes(start_time), to_minutes(end_time), to_minutes(break_time), record_id))
+                monthly_summary.add_record(db, record_id)
                 flash('勤怠記録を更新しました', 'success')
             else:
                 # 新規作成
                 cursor = db.get_cursor()
                 cursor.execute("""
                     INSERT INTO attendance_records
-                    (employee_id, date, attendance_type, start_time, end_time, break_time, notes)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (session['user_id'], record_date, attendance_type, start_time, end_time, break_time, notes))
+                    (employee_id, date, attendance_type, start_time, end_time, break_time, notes,
+                     start_minute, end_minute, break_minutes)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, (session['user_id'], record_date, attendance_type, start_time, end_time, break_time, notes,
+                      to_minutes(start_time), to_minutes(end_time), to_minutes(break_time)))
                 record_id = cursor.lastrowid
+                monthly_summary.add_record(db, record_id, new_record=True)
                 flash('勤怠記録を保存しました', 'success')
             
             db.commit()
@@ -264,19 +279,19 @@ def attendance_input():
                     (record_id,)
                 )
                 
-                # 新しいプロジェクト作業時間を追加
-                for project_id, hours in project_hours:
-                    db.execute_query("""
-                        INSERT INTO project_hours (attendance_record_id, project_id, hours)
-                        VALUES (%s, %s, %s)
-                    """, (record_id, project_id, hours))
+                # 新しいプロジェクト作業時間を一括で追加
+                db.execute_many("""
+                    INSERT INTO project_hours (attendance_record_id, project_id, hours)
+                    VALUES (%s, %s, %s)
+                """, [(record_id, project_id, hours) for project_id, hours in project_hours])
                 
                 db.commit()
             
             return redirect(url_for('dashboard'))
         
         # GETリクエスト: フォームを表示
-        projects = db.execute_query("SELECT id, name FROM projects ORDER BY name")
+        # キャッシュの行は共有しているため、作業時間を書き込む前にコピーする
+        projects = [dict(project) for project in reference_cache.get(db, 'projects')]
         date_str = request.args.get('date', date.today().isoformat())
         
         # 指定日の記録があれば取得
@@ -285,50 +300,21 @@ def attendance_input():
             FROM attendance_records ar
             WHERE ar.employee_id = %s AND ar.date = %s
             LIMIT 1
-        """, (session['user_id'], date_str))
+        """, (session['user_id'], date_str), compact=True)
         
         record_data = None
         project_hours_list = []
         
         if today_record:
-            record_data = dict(today_record[0])
-            # timedeltaオブジェクトを文字列に変換（テンプレートで使用するため）
-            from datetime import timedelta
-            
-            # start_time, end_time, break_timeをフォーマット
-            if record_data.get('start_time'):
-                if isinstance(record_data['start_time'], timedelta):
-                    total_seconds = int(record_data['start_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    record_data['start_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(record_data['start_time'], 'strftime'):
-                    record_data['start_time'] = record_data['start_time'].strftime('%H:%M')
-            
-            if record_data.get('end_time'):
-                if isinstance(record_data['end_time'], timedelta):
-                    total_seconds = int(record_data['end_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    record_data['end_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(record_data['end_time'], 'strftime'):
-                    record_data['end_time'] = record_data['end_time'].strftime('%H:%M')
-            
-            if record_data.get('break_time'):
-                if isinstance(record_data['break_time'], timedelta):
-                    total_seconds = int(record_data['break_time'].total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    record_data['break_time'] = f"{hours:02d}:{minutes:02d}"
-                elif hasattr(record_data['break_time'], 'strftime'):
-                    record_data['break_time'] = record_data['break_time'].strftime('%H:%M')
+            # 時刻はテンプレートで参照したときにHH:MM形式の文字列に変換される
+            record_data = AttendanceRecord.from_row(today_record[0])
             
             # プロジェクト作業時間を取得
             ph_data = db.execute_query("""
                 SELECT project_id, hours
                 FROM project_hours
                 WHERE attendance_record_id = %s
-            """, (record_data['id'],))
+            """, (record_data.id,))
             project_hours_list = [(ph['project_id'], ph['hours']) for ph in ph_data]
         else:
             record_data = None
@@ -367,61 +353,75 @@ def attendance_view(date_str):
     """
     db = DBAccess()
     try:
-        record = db.execute_query("""
+        # 表示する記録・社員名・プロジェクト作業時間が変わっていなければ、クエリと描画を行わずに304を返す
+        # （記録がない場合は行を返さず、アーカイブの確認を含めて通常どおり処理する）
+        validator = conditional.probe(db, ('attendance_view', session['user_id'], date_str), """
+            SELECT COUNT(DISTINCT ar.id) AS record_count,
+                   COUNT(ph.id) AS hours_count,
+                   UNIX_TIMESTAMP(MAX(ar.updated_at)) AS record_modified,
+                   UNIX_TIMESTAMP(MAX(e.updated_at)) AS employee_modified,
+                   UNIX_TIMESTAMP(MAX(ph.updated_at)) AS hours_modified,
+                   UNIX_TIMESTAMP(MAX(p.updated_at)) AS projects_modified,
+                   UNIX_TIMESTAMP() AS now
+            FROM (
+                SELECT id, employee_id, updated_at
+                FROM attendance_records
+                WHERE date = %s AND (employee_id = %s OR %s = 'manager')
+                ORDER BY employee_id
+                LIMIT 1
+            ) ar
+            JOIN employees e ON ar.employee_id = e.id
+            LEFT JOIN project_hours ph ON ph.attendance_record_id = ar.id
+            LEFT JOIN projects p ON ph.project_id = p.id
+            HAVING COUNT(ar.id) > 0
+        """, (date_str, session['user_id'], session['user_role']))
+        if validator is not None and validator.matches():
+            return validator.not_modified()
+        
+        # 課長は同じ日の他の社員の記録も対象になるため、プローブと同じ順で先頭の1件を読む
+        # ETagを付ける応答は、プロセス内のクエリ結果キャッシュ（TTLの間は古い場合がある）を使わずに読む
+        cache = validator is None
+        records_table, hours_table = 'attendance_records', 'project_hours'
+        record = db.execute_query(f"""
             SELECT ar.*, e.name as employee_name
-            FROM attendance_records ar
+            FROM {records_table} ar
             JOIN employees e ON ar.employee_id = e.id
             WHERE ar.date = %s AND (ar.employee_id = %s OR %s = 'manager')
+            ORDER BY ar.employee_id
             LIMIT 1
-        """, (date_str, session['user_id'], session['user_role']))
+        """, (date_str, session['user_id'], session['user_role']), compact=True, cache=cache)
+        
+        # 締め済み年度の記録はアーカイブテーブルに移動している場合がある
+        if not record and archive.may_be_archived(date_str):
+            records_table, hours_table = archive.ARCHIVE_RECORDS_TABLE, archive.ARCHIVE_HOURS_TABLE
+            record = db.execute_query(f"""
+                SELECT ar.*, e.name as employee_name
+                FROM {records_table} ar
+                JOIN employees e ON ar.employee_id = e.id
+                WHERE ar.date = %s AND (ar.employee_id = %s OR %s = 'manager')
+                ORDER BY ar.employee_id
+                LIMIT 1
+            """, (date_str, session['user_id'], session['user_role']), compact=True, cache=cache)
         
         if not record:
             flash('勤怠記録が見つかりません', 'error')
             return redirect(url_for('dashboard'))
         
-        # timedeltaオブジェクトを文字列に変換
-        from datetime import timedelta
-        formatted_record = dict(record[0])
-        
-        # start_time, end_time, break_timeをフォーマット
-        if formatted_record.get('start_time'):
-            if isinstance(formatted_record['start_time'], timedelta):
-                total_seconds = int(formatted_record['start_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                formatted_record['start_time'] = f"{hours:02d}:{minutes:02d}"
-            elif hasattr(formatted_record['start_time'], 'strftime'):
-                formatted_record['start_time'] = formatted_record['start_time'].strftime('%H:%M')
-        
-        if formatted_record.get('end_time'):
-            if isinstance(formatted_record['end_time'], timedelta):
-                total_seconds = int(formatted_record['end_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                formatted_record['end_time'] = f"{hours:02d}:{minutes:02d}"
-            elif hasattr(formatted_record['end_time'], 'strftime'):
-                formatted_record['end_time'] = formatted_record['end_time'].strftime('%H:%M')
-        
-        if formatted_record.get('break_time'):
-            if isinstance(formatted_record['break_time'], timedelta):
-                total_seconds = int(formatted_record['break_time'].total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                formatted_record['break_time'] = f"{hours:02d}:{minutes:02d}"
-            elif hasattr(formatted_record['break_time'], 'strftime'):
-                formatted_record['break_time'] = formatted_record['break_time'].strftime('%H:%M')
+        # 時刻はテンプレートで参照したときにHH:MM形式の文字列に変換される
+        record = AttendanceRecord.from_row(record[0])
         
         # プロジェクト作業時間を取得
-        project_hours = db.execute_query("""
+        project_hours = db.execute_query(f"""
             SELECT ph.*, p.name as project_name
-            FROM project_hours ph
+            FROM {hours_table} ph
             JOIN projects p ON ph.project_id = p.id
             WHERE ph.attendance_record_id = %s
-        """, (formatted_record['id'],))
+        """, (record.id,), cache=cache)
         
-        return render_template('attendance_view.html', 
-                             record=formatted_record, 
-                             project_hours=project_hours)
+        response = render_template('attendance_view.html', 
+                                   record=record, 
+                                   project_hours=project_hours)
+        return validator.apply(response) if validator is not None else response
     except Exception as e:
         flash(f'エラー: {str(e)}', 'error')
         return redirect(url_for('dashboard'))
@@ -429,6 +429,67 @@ def attendance_view(date_str):
         db.close_connection()
 
 
+@app.route('/api/attendance/history')
+@login_required
+def attendance_history_api():
+    """
+    勤怠記録の履歴API（JSON）
+    
+    ログイン中の社員（課長はemployee_idで指定した社員）の勤怠記録を、新しい日付から1ページずつ返します。
+    各記録にはプロジェクト作業時間を含めます。
+    
+    クエリパラメータ:
+        from, to: 期間（YYYY-MM-DD、省略可）
+        size: 1ページの件数
+        after, before: 次のページ・前のページのカーソル
+        employee_id: 社員ID（課長のみ）
+    
+    Returns:
+        Response: 勤怠記録のページのJSON
+    """
+    employee_id = session['user_id']
+    if request.args.get('employee_id'):
+        if session.get('user_role') != 'manager':
+            return jsonify({'error': 'この機能は課長のみアクセスできます'}), 403
+        employee_id = request.args.get('employee_id', type=int)
+    try:
+        date_from = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError:
+        return jsonify({'error': '日付はYYYY-MM-DD形式で指定してください'}), 400
+    if employee_id is None:
+        return jsonify({'error': '社員IDが不正です'}), 400
+    
+    db = DBAccess()
+    try:
+        page, hours = attendance_history.fetch_page(db, employee_id, date_from, date_to,
+                                                    pagination.page_size(request.args.get('size')),
+                                                    request.args.get('after'), request.args.get('before'))
+    except ValueError:
+        return jsonify({'error': 'カーソルが不正です'}), 400
+    finally:
+        db.close_connection()
+    
+    return jsonify({
+        'records': [{
+            'id': record.id,
+            'date': record.date.isoformat(),
+            'attendance_type': record.attendance_type,
+            'start_time': record.start_time,
+            'end_time': record.end_time,
+            'break_time': record.break_time,
+            'notes': record.notes,
+            'project_hours': [{
+                'project_id': row.project_id,
+                'project_name': row.project_name,
+                'hours': float(row.hours),
+            } for row in hours.get(record.id, [])],
+        } for record in page.rows],
+        'next': page.next_cursor,
+        'prev': page.prev_cursor,
+    })
+
+
 @app.route('/employees', methods=['GET'])
 @login_required
 @manager_required
@@ -436,20 +497,28 @@ def employees_list():
     """
     社員一覧ページ（課長のみ）
     
+    名前の順に1ページ分の社員だけを表示し、名前・メールアドレスの前方一致で検索できます。
+    前後のページへはカーソル（after・before）で移動します。
+    
     Returns:
         str: 社員一覧ページのHTML
     """
+    search = request.args.get('q', '').strip()
+    size = pagination.page_size(request.args.get('size'))
     db = DBAccess()
     try:
-        employees = db.execute_query("""
-            SELECT id, email, name, role, created_at
-            FROM employees
-            ORDER BY name
-        """)
-        return render_template('employees_list.html', employees=employees)
+        try:
+            page = employee_directory.fetch_page(db, search, size,
+                                                 after=request.args.get('after'),
+                                                 before=request.args.get('before'))
+        except ValueError:
+            # 不正なカーソルの場合は最初のページを表示する
+            page = employee_directory.fetch_page(db, search, size)
+        return render_template('employees_list.html', employees=page.rows, page=page,
+                               search=search, size=size)
     except Exception as e:
         flash(f'エラー: {str(e)}', 'error')
-        return render_template('employees_list.html', employees=[])
+        return render_template('employees_list.html', employees=[], page=None, search=search, size=size)
     finally:
         db.close_connection()
 
@@ -484,6 +553,7 @@ def employee_create():
                 INSERT INTO employees (email, password, name, role)
                 VALUES (%s, %s, %s, %s)
             """, (email, password_hash, name, role))
+            reference_cache.bump(db, 'employees')
             db.commit()
             flash('社員を作成しました', 'success')
             return redirect(url_for('employees_list'))
@@ -535,6 +605,7 @@ def employee_edit(employee_id):
                     WHERE id = %s
                 """, (email, name, role, employee_id))
             
+            reference_cache.bump(db, 'employees')
             db.commit()
             flash('社員情報を更新しました', 'success')
             return redirect(url_for('employees_list'))
@@ -572,7 +643,23 @@ def employee_delete(employee_id):
     """
     db = DBAccess()
     try:
+        # 勤怠記録はパーティション分割しており外部キーのCASCADEが効かないため、先に削除する
+        db.execute_query("""
+            DELETE ph
+            FROM project_hours ph
+            JOIN attendance_records ar ON ph.attendance_record_id = ar.id
+            WHERE ar.employee_id = %s
+        """, (employee_id,))
+        db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (employee_id,))
+        db.execute_query(f"""
+            DELETE ph
+            FROM {archive.ARCHIVE_HOURS_TABLE} ph
+            JOIN {archive.ARCHIVE_RECORDS_TABLE} ar ON ph.attendance_record_id = ar.id
+            WHERE ar.employee_id = %s
+        """, (employee_id,))
+        db.execute_query(f"DELETE FROM {archive.ARCHIVE_RECORDS_TABLE} WHERE employee_id = %s", (employee_id,))
         db.execute_query("DELETE FROM employees WHERE id = %s", (employee_id,))
+        reference_cache.bump(db, 'employees')
         db.commit()
         flash('社員を削除しました', 'success')
     except Exception as e:
@@ -607,31 +694,32 @@ def monthly_report():
             year = date.today().year
             month = date.today().month
         
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
+        # 年月の妥当性を確認
+        date(year, month, 1)
         
-        # 全社員の勤怠データを取得
-        report_data = db.execute_query("""
-            SELECT 
-                e.id as employee_id,
-                e.name as employee_name,
-                COUNT(ar.id) as attendance_days,
-                SUM(TIME_TO_SEC(TIMEDIFF(ar.end_time, ar.start_time)) / 3600) as total_hours,
-                SUM(TIME_TO_SEC(ar.break_time) / 3600) as total_break_hours
-            FROM employees e
-            LEFT JOIN attendance_records ar ON e.id = ar.employee_id 
-                AND ar.date >= %s AND ar.date <= %s
-            GROUP BY e.id, e.name
-            ORDER BY e.name
-        """, (first_day, last_day))
+        # 社員と当月の月次集計が変わっていなければ、クエリと描画を行わずに304を返す
+        validator = conditional.probe(db, ('monthly_report', year, month), """
+            SELECT (SELECT COUNT(*) FROM employees) AS employee_count,
+                   (SELECT UNIX_TIMESTAMP(MAX(updated_at)) FROM employees) AS employees_modified,
+                   COUNT(*) AS summary_count,
+                   UNIX_TIMESTAMP(MAX(updated_at)) AS summary_modified,
+                   UNIX_TIMESTAMP() AS now
+            FROM employee_monthly_summary
+            WHERE year = %s AND month = %s
+        """, (year, month))
+        if validator is not None and validator.matches():
+            return validator.not_modified()
         
-        return render_template('monthly_report.html', 
-                             report_data=report_data,
-                             year=year,
-                             month=month)
+        # 全社員の勤怠データを月次集計テーブルから取得
+        # （ETagを付ける応答は、プロセス内のクエリ結果キャッシュを使わずに読む）
+        report_data = db.execute_query(monthly_summary.REPORT_QUERY, (year, month), compact=True,
+                                       cache=validator is None)
+        
+        response = render_template('monthly_report.html', 
+                                   report_data=report_data,
+                                   year=year,
+                                   month=month)
+        return validator.apply(response) if validator is not None else response
     except Exception as e:
         flash(f'エラー: {str(e)}', 'error')
         return render_template('monthly_report.html', 
@@ -642,6 +730,199 @@ def monthly_report():
         db.close_connection()
 
 
+@app.route('/report/range')
+@login_required
+@manager_required
+def range_report_view():
+    """
+    期間レポートページ（課長のみ）
+    
+    指定した期間の社員×月の出勤日数・総労働時間・総休憩時間を、月次集計テーブルから1回のクエリで表示します。
+    期間の省略時は今年度の初めから今月までです。社員は名前の順にページ分割します。
+    
+    Returns:
+        str: 期間レポートページのHTML
+    """
+    today = date.today()
+    default_from = f"{archive.fiscal_year_range(archive.fiscal_year_of(today))[0]:%Y-%m}"
+    default_to = f"{today:%Y-%m}"
+    size = pagination.page_size(request.args.get('size'))
+    
+    try:
+        start = range_report.parse_month(request.args.get('from') or default_from)
+        end = range_report.parse_month(request.args.get('to') or default_to)
+        months = range_report.month_span(start, end)
+    except ValueError as e:
+        flash(str(e), 'error')
+        start, end = range_report.parse_month(default_from), range_report.parse_month(default_to)
+        months = range_report.month_span(start, end)
+    
+    db = DBAccess()
+    try:
+        try:
+            page = range_report.fetch_matrix(db, months, size,
+                                             after=request.args.get('after'),
+                                             before=request.args.get('before'))
+        except ValueError:
+            # 不正なカーソルの場合は最初のページを表示する
+            page = range_report.fetch_matrix(db, months, size)
+        return render_template('range_report.html', page=page, months=months,
+                               start='%04d-%02d' % start, end='%04d-%02d' % end, size=size)
+    except Exception as e:
+        flash(f'エラー: {str(e)}', 'error')
+        return render_template('range_report.html', page=None, months=months,
+                               start='%04d-%02d' % start, end='%04d-%02d' % end, size=size)
+    finally:
+        db.close_connection()
+
+
+@app.route('/report/monthly.csv')
+@login_required
+@manager_required
+def monthly_report_csv():
+    """
+    月次レポートのCSVダウンロード（課長のみ）
+    
+    画面と同じ集計を、サーバーサイドカーソルで読んだ分ずつCSVにして送ります。
+    
+    Returns:
+        Response: 月次レポートのCSV（ストリーミング）
+    """
+    try:
+        year = int(request.args.get('year', ''))
+        month = int(request.args.get('month', ''))
+        date(year, month, 1)
+    except ValueError:
+        flash('年月を正しく指定してください', 'error')
+        return redirect(url_for('monthly_report'))
+    
+    db = DBAccess()
+    batches = db.iter_query(monthly_summary.REPORT_QUERY, (year, month), compact=True)
+    # iter_queryは送信中にプールから別の接続を借りるため、この接続は送信を待たずに返す
+    db.close_connection()
+    return csv_export.csv_response(
+        csv_export.stream_csv(monthly_summary.REPORT_CSV_HEADER, batches, monthly_summary.report_csv_values),
+        f"monthly_report_{year:04d}{month:02d}.csv"
+    )
+
+
+@app.route('/report/attendance.xlsx')
+@login_required
+@manager_required
+def attendance_xlsx():
+    """
+    指定月の勤怠記録とプロジェクト作業時間のXLSXダウンロード（課長のみ）
+    
+    サーバーサイドカーソルで読んだ分ずつワークシートのXMLを書き、圧縮して送ります。
+    
+    Returns:
+        Response: XLSXファイル（ストリーミング）
+    """
+    try:
+        year = int(request.args.get('year', ''))
+        month = int(request.args.get('month', ''))
+        date_from, date_to = monthly_summary.month_range(year, month)
+    except ValueError:
+        flash('年月を正しく指定してください', 'error')
+        return redirect(url_for('monthly_report'))
+    
+    db = DBAccess()
+    sheets = attendance_export.workbook_sheets(db, date_from, date_to)
+    # 各シートはiter_queryでプールから別の接続を借りて読むため、この接続は送信を待たずに返す
+    db.close_connection()
+    return xlsx_export.xlsx_response(
+        xlsx_export.stream_workbook(sheets),
+        f"attendance_{year:04d}{month:02d}.xlsx"
+    )
+
+
+def _project_report_args():
+    """
+    プロジェクト別レポートの期間とプロジェクトをリクエストから取得する関数
+    
+    期間の省略時は今年度の初日から今日までです。
+    
+    Returns:
+        tuple: (期間の初日, 期間の最終日, プロジェクトID（全プロジェクトの場合はNone）)
+    
+    Raises:
+        ValueError: 日付・プロジェクトIDが不正な場合
+    """
+    today = date.today()
+    date_from = request.args.get('from')
+    date_to = request.args.get('to')
+    project_id = request.args.get('project_id')
+    return (
+        date.fromisoformat(date_from) if date_from else archive.fiscal_year_range(archive.fiscal_year_of(today))[0],
+        date.fromisoformat(date_to) if date_to else today,
+        int(project_id) if project_id else None,
+    )
+
+
+@app.route('/report/projects')
+@login_required
+@manager_required
+def project_report_view():
+    """
+    プロジェクト別レポートページ（課長のみ）
+    
+    期間内のプロジェクトごと・月ごと、プロジェクトごと・社員ごとの作業時間の合計を表示します。
+    
+    Returns:
+        str: プロジェクト別レポートページのHTML
+    """
+    db = DBAccess()
+    try:
+        projects = reference_cache.get(db, 'projects')
+        try:
+            date_from, date_to, project_id = _project_report_args()
+            months, project_rows, employee_hours = project_report.fetch_report(db, date_from, date_to, project_id)
+        except ValueError as e:
+            flash(f'期間を正しく指定してください: {str(e)}', 'error')
+            date_from, date_to, project_id = None, None, None
+            months, project_rows, employee_hours = [], [], {}
+        return render_template('project_report.html', projects=projects, project_id=project_id,
+                               date_from=date_from, date_to=date_to, months=months,
+                               project_rows=project_rows, employee_hours=employee_hours)
+    except Exception as e:
+        flash(f'エラー: {str(e)}', 'error')
+        return render_template('project_report.html', projects=[], project_id=None,
+                               date_from=None, date_to=None, months=[],
+                               project_rows=[], employee_hours={})
+    finally:
+        db.close_connection()
+
+
+@app.route('/report/projects.csv')
+@login_required
+@manager_required
+def project_report_csv():
+    """
+    プロジェクト別レポートのCSVダウンロード（課長のみ）
+    
+    プロジェクトごと・年月ごと・社員ごとの作業時間の合計を、サーバーサイドカーソルで読んだ分ずつ送ります。
+    
+    Returns:
+        Response: プロジェクト別レポートのCSV（ストリーミング）
+    """
+    try:
+        date_from, date_to, project_id = _project_report_args()
+        if date_to < date_from:
+            raise ValueError(date_to)
+    except ValueError:
+        flash('期間を正しく指定してください', 'error')
+        return redirect(url_for('project_report_view'))
+    
+    db = DBAccess()
+    batches = project_report.csv_batches(db, date_from, date_to, project_id)
+    # iter_queryは送信中にプールから別の接続を借りるため、この接続は送信を待たずに返す
+    db.close_connection()
+    return csv_export.csv_response(
+        csv_export.stream_csv(project_report.CSV_HEADER, batches, project_report.csv_values),
+        f"project_report_{date_from:%Y%m%d}_{date_to:%Y%m%d}.csv"
+    )
+
+
 @app.route('/db/status')
 def db_status():
     """
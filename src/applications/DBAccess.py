@@ -2,75 +2,516 @@
     DBAccess.pyは、MySQLデータベースへの接続を管理するクラスです。
 """
 
-import pymysql
 import os
+import threading
+import time
+from collections import deque, namedtuple
+
+import pymysql
+
+from applications.query_stats import record_query
+from applications.result_cache import result_cache
+
+# コネクションプールの設定値（環境変数で上書き可能）
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_MAX_AGE = 1800
+DEFAULT_POOL_TIMEOUT = 10
+DEFAULT_POOL_PING_INTERVAL = 30
+
+# iter_queryで一度に取得する行数
+DEFAULT_BATCH_SIZE = 1000
+
+# execute_manyで1文に詰め込むSQLの最大長（max_allowed_packetが大きくてもこの値で打ち切る）
+MAX_STMT_LENGTH = 16 * 1024 * 1024
+# max_allowed_packetに対して残しておく余白（パケットヘッダ等）
+STMT_LENGTH_MARGIN = 1024
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """
+    PoolTimeoutErrorは、コネクションプールから接続を取得できなかった場合の例外です。
+    """
+
+
+class _TimedCursorMixin:
+    """
+    _TimedCursorMixinクラスは、executeの実行時間をクエリ統計に記録するカーソルの共通処理です。
+    書き込みの文を実行した場合は、対象のテーブルを読んだクエリ結果のキャッシュを破棄します。
+    """
+
+    # executemanyの実行中はTrue（値を埋め込んだ個々の文は記録しない）
+    _in_executemany = False
+
+    def execute(self, query, args=None):
+        """
+        executeメソッドは、クエリを実行し、その実行時間をクエリ統計に記録するメソッドです。
+        """
+        if self._in_executemany:
+            return super().execute(query, args)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            record_query(query, (time.perf_counter() - start) * 1000)
+            result_cache.note_write(self.connection, query)
+
+    def executemany(self, query, args):
+        """
+        executemanyメソッドは、同じ文を複数のパラメータで実行し、全体の実行時間をクエリ統計に記録するメソッドです。
+        pymysqlは複数行INSERTを値を埋め込んだ大きな文にして実行するため、
+        個々の文ではなく、パラメータを埋め込む前の文で1回だけ記録します。
+        """
+        start = time.perf_counter()
+        self._in_executemany = True
+        try:
+            return super().executemany(query, args)
+        finally:
+            self._in_executemany = False
+            record_query(query, (time.perf_counter() - start) * 1000)
+            result_cache.note_write(self.connection, query)
+
+
+class TimedCursor(_TimedCursorMixin, pymysql.cursors.Cursor):
+    """
+    TimedCursorクラスは、実行時間を記録するタプル形式のカーソルです。
+    """
+
+
+class TimedDictCursor(_TimedCursorMixin, pymysql.cursors.DictCursor):
+    """
+    TimedDictCursorクラスは、実行時間を記録する辞書形式のカーソルです。
+    """
+
+
+class TimedSSCursor(_TimedCursorMixin, pymysql.cursors.SSCursor):
+    """
+    TimedSSCursorクラスは、実行時間を記録するタプル形式のサーバーサイドカーソルです。
+    """
+
+
+class TimedSSDictCursor(_TimedCursorMixin, pymysql.cursors.SSDictCursor):
+    """
+    TimedSSDictCursorクラスは、実行時間を記録する辞書形式のサーバーサイドカーソルです。
+    """
+
+
+def _connect():
+    """
+    _connect関数は、MySQLデータベースへの新しい接続を作成する関数です。
+    MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASEは、環境変数から取得します。
+    charsetは、UTF-8です。
+    cursorclassは、DictCursorです。
+    DictCursorは、MySQLデータベースの結果を辞書形式で取得します。
+    """
+    return pymysql.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        password=os.getenv('MYSQL_PASSWORD', ''),
+        database=os.getenv('MYSQL_DATABASE', 'flask_db'),
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor
+    )
+
+
+class ConnectionPool:
+    """
+    ConnectionPoolクラスは、認証済みのMySQL接続を再利用するためのスレッドセーフなプールです。
+    接続数はmax_sizeで上限を設け、上限に達した場合はtimeout秒まで返却を待ちます。
+    max_age秒を超えた接続は破棄して作り直し、ping_interval秒以上使われていない接続は
+    貸し出し前にpingで生存確認を行います。
+    """
+
+    def __init__(self, max_size=DEFAULT_POOL_SIZE, max_age=DEFAULT_POOL_MAX_AGE,
+                 timeout=DEFAULT_POOL_TIMEOUT, ping_interval=DEFAULT_POOL_PING_INTERVAL,
+                 connect=_connect):
+        """
+        __init__メソッドは、ConnectionPoolクラスのインスタンスを初期化するメソッドです。
+        接続はここでは作成せず、最初の貸し出し時に作成します。
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.pid = os.getpid()
+        self._connect = connect
+        self._cond = threading.Condition()
+        # 待機中の接続（接続, 作成時刻, 最終返却時刻）
+        self._idle = deque()
+        # 貸し出し中の接続の作成時刻（id(接続) -> 作成時刻）
+        self._created_at = {}
+        self._size = 0
+        # サーバーのmax_allowed_packet（最初のexecute_manyで取得してキャッシュ）
+        self.max_allowed_packet = None
+
+    def acquire(self):
+        """
+        acquireメソッドは、プールから接続を借りるメソッドです。
+        待機中の接続があれば検証して返し、なければ上限まで新しく接続を作成します。
+        timeout秒以内に接続を取得できない場合はPoolTimeoutErrorを送出します。
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f'コネクションプールから接続を取得できませんでした（{self.timeout}秒でタイムアウト）'
+                    )
+                self._cond.wait(remaining)
+            if not self._idle:
+                # 新しい接続用の枠を確保する
+                self._size += 1
+                entry = None
+            else:
+                entry = self._idle.pop()
+
+        if entry is None:
+            return self._open()
+
+        conn, created_at, released_at = entry
+        if self._validate(conn, created_at, released_at):
+            with self._cond:
+                self._created_at[id(conn)] = created_at
+            return conn
+
+        # 検証に失敗した接続は破棄して、同じ枠で作り直す
+        self._close_quietly(conn)
+        return self._open()
+
+    def release(self, conn):
+        """
+        releaseメソッドは、借りた接続をプールに返すメソッドです。
+        未コミットのトランザクションはロールバックしてから返却します。
+        ロールバックできない接続や寿命を過ぎた接続は破棄します。
+        """
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), None)
+        if created_at is None:
+            # このプールから貸し出した接続ではない
+            self._close_quietly(conn)
+            return
+
+        reusable = conn.open and time.monotonic() - created_at < self.max_age
+        if reusable:
+            try:
+                conn.rollback()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            if reusable:
+                self._idle.append((conn, created_at, time.monotonic()))
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if not reusable:
+            self._close_quietly(conn)
+
+    def discard(self, conn):
+        """
+        discardメソッドは、借りた接続を再利用せずに閉じて枠を解放するメソッドです。
+        読み残しの結果セットがあるなど、状態が不明な接続に使用します。
+        """
+        with self._cond:
+            if self._created_at.pop(id(conn), None) is not None:
+                self._size -= 1
+                self._cond.notify()
+        self._close_quietly(conn)
+
+    def close_all(self):
+        """
+        close_allメソッドは、待機中の接続をすべて閉じるメソッドです。
+        貸し出し中の接続は返却時に通常どおり処理されます。
+        """
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    def _open(self):
+        """
+        _openメソッドは、確保済みの枠で新しい接続を作成するメソッドです。
+        作成に失敗した場合は枠を解放して例外をそのまま送出します。
+        """
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _validate(self, conn, created_at, released_at):
+        """
+        _validateメソッドは、待機中だった接続が再利用できるかを確認するメソッドです。
+        寿命切れの接続は不可とし、一定時間使われていない接続はpingで確認します。
+        """
+        now = time.monotonic()
+        if now - created_at >= self.max_age:
+            return False
+        if now - released_at < self.ping_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close_quietly(conn):
+        """
+        _close_quietlyメソッドは、例外を無視して接続を閉じるメソッドです。
+        """
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    get_pool関数は、プロセス共通のコネクションプールを取得する関数です。
+    DB_POOL_SIZE, DB_POOL_MAX_AGE, DB_POOL_TIMEOUT, DB_POOL_PING_INTERVALは、環境変数から取得します。
+    fork後の子プロセス（gunicornのワーカー等）では親の接続を共有しないよう、プールを作り直します。
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool(
+                max_size=int(os.getenv('DB_POOL_SIZE', DEFAULT_POOL_SIZE)),
+                max_age=float(os.getenv('DB_POOL_MAX_AGE', DEFAULT_POOL_MAX_AGE)),
+                timeout=float(os.getenv('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)),
+                ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', DEFAULT_POOL_PING_INTERVAL)),
+            )
+        return _pool
+
+
+def reset_pool():
+    """
+    reset_pool関数は、プロセス共通のコネクションプールを破棄する関数です。
+    待機中の接続を閉じ、次回のget_pool呼び出しで新しいプールを作成します。
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+_row_classes = {}
+_row_classes_lock = threading.Lock()
+
+
+def row_class(columns):
+    """
+    row_class関数は、列名の組に対応するコンパクトな行クラスを取得する関数です。
+    行クラスは空の__slots__を持つタプルのサブクラス（namedtuple）でインスタンス辞書を持たず、
+    row.name のような属性アクセスと row['name'] のような列名アクセスの両方ができます。
+    識別子にできない列名（別名のない COUNT(*) など）は属性名が _0 のように置き換えられますが、
+    row['COUNT(*)'] のような列名アクセスは元の列名でできます。
+    同じ列名の組に対しては一度だけクラスを生成し、以降はキャッシュを返します。
+    """
+    columns = tuple(columns)
+    cls = _row_classes.get(columns)
+    if cls is None:
+        with _row_classes_lock:
+            cls = _row_classes.get(columns)
+            if cls is None:
+                base = namedtuple('Row', columns, rename=True)
+                cls = type('Row', (base,), {
+                    '__slots__': (),
+                    '_columns': columns,
+                    '_indexes': {column: index for index, column in enumerate(columns)},
+                    '__getitem__': _row_getitem,
+                    'get': _row_get,
+                    '__reduce__': _row_reduce,
+                })
+                _row_classes[columns] = cls
+    return cls
+
+
+def _row_getitem(self, key):
+    """
+    _row_getitem関数は、行クラスで列名または添字による値の取得を行う関数です。
+    """
+    if isinstance(key, str):
+        try:
+            return tuple.__getitem__(self, self._indexes[key])
+        except KeyError:
+            raise KeyError(key) from None
+    return tuple.__getitem__(self, key)
+
+
+def _row_get(self, key, default=None):
+    """
+    _row_get関数は、辞書のgetと同様に列名で値を取得する関数です。
+    """
+    index = self._indexes.get(key)
+    return default if index is None else tuple.__getitem__(self, index)
+
+
+def _row_reduce(self):
+    """
+    _row_reduce関数は、行クラスのインスタンスをpickleできるようにする関数です。
+    行クラスは動的に生成するため、列名の組と値から作り直す手順を返します。
+    """
+    return _make_row, (self._columns, tuple(self))
+
+
+def _make_row(columns, values):
+    """
+    _make_row関数は、列名の組と値から行を生成する関数です（pickleからの復元に使用）。
+    """
+    return row_class(columns)._make(values)
+
+
+def _compact_rows(description, rows):
+    """
+    _compact_rows関数は、タプルの行をcursor.descriptionから生成した行クラスに変換する関数です。
+    """
+    if description is None:
+        return list(rows)
+    make = row_class(column[0] for column in description)._make
+    return list(map(make, rows))
+
 
 class DBAccess:
     """
     DBAccessクラスは、MySQLデータベースへの接続を管理するクラスです。
+    接続はプロセス共通のコネクションプールから借り、close_connectionでプールに返します。
     """
 
     def __init__(self):
         """
         __init__メソッドは、DBAccessクラスのインスタンスを初期化するメソッドです。
-        MySQLデータベースへの接続を初期化します。
-        MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASEは、環境変数から取得します。
-        charsetは、UTF-8です。
-        cursorclassは、DictCursorです。
-        DictCursorは、MySQLデータベースの結果を辞書形式で取得します。
-        """
-        self.conn = pymysql.connect(
-            host=os.getenv('MYSQL_HOST', 'localhost'),
-            user=os.getenv('MYSQL_USER', 'root'),
-            password=os.getenv('MYSQL_PASSWORD', ''),
-            database=os.getenv('MYSQL_DATABASE', 'flask_db'),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
+        コネクションプールからMySQLデータベースへの接続を借ります。
+        """
+        self.pool = get_pool()
+        self.conn = self.pool.acquire()
+        self._released = False
 
     def get_connection(self):
         """
         get_connectionメソッドは、MySQLデータベースへの接続を取得するメソッドです。
         MySQLデータベースへの接続を取得します。
         """
-        return self.conn 
-       
+        return self.conn
+
     def close_connection(self):
         """
-        close_connectionメソッドは、MySQLデータベースへの接続を閉じるメソッドです。
-        MySQLデータベースへの接続を閉じます。
+        close_connectionメソッドは、MySQLデータベースへの接続をプールに返すメソッドです。
+        未コミットのトランザクションはロールバックされます。二重に呼び出しても安全です。
         """
-        self.conn.close()
+        if self._released:
+            return
+        self._released = True
+        result_cache.end_transaction(self.conn, committed=False)
+        self.pool.release(self.conn)
 
-    def execute_query(self, query, params=None):
+    def execute_query(self, query, params=None, compact=False, cache=False):
         """
         execute_queryメソッドは、MySQLデータベースにクエリを実行するメソッドです。
-        MySQLデータベースにクエリを実行します。
+        MySQLデータベースにクエリを実行します。実行時間はクエリ統計に記録されます。
+        compactがTrueの場合は、行ごとの辞書の代わりにrow_classで生成した
+        コンパクトな行（属性アクセス可能なタプル）のリストを返します。
+        cacheがTrueの場合は、同じSQL文とパラメータの結果をプロセス内のキャッシュ（result_cache）から返します。
+        NOW()のように実行のたびに結果が変わるSELECTには指定しないでください。
         """
-        with self.conn.cursor() as cursor:
+        if cache:
+            return result_cache.execute(self.conn, query, params, compact,
+                                        lambda: self.execute_query(query, params, compact))
+        if compact:
+            with self.conn.cursor(TimedCursor) as cursor:
+                cursor.execute(query, params)
+                return _compact_rows(cursor.description, cursor.fetchall())
+        with self.conn.cursor(TimedDictCursor) as cursor:
             cursor.execute(query, params)
             return cursor.fetchall()
         return None
-    
+
+    def iter_query(self, query, params=None, batch_size=DEFAULT_BATCH_SIZE, compact=False):
+        """
+        iter_queryメソッドは、大きな結果セットを一定件数ずつ取得するジェネレータです。
+        サーバーサイドカーソル（SSDictCursor）で結果をバッファせずに読み、
+        batch_size件ずつの辞書のリストをyieldします。
+        compactがTrueの場合は、execute_queryと同様にコンパクトな行のリストをyieldします。
+        結果を読み切るまで接続が占有されるため、この接続とは別にプールから接続を借ります。
+        途中でジェネレータが閉じられた場合は、読み残しを捨てるために接続を破棄します。
+        """
+        cursorclass = TimedSSCursor if compact else TimedSSDictCursor
+        conn = self.pool.acquire()
+        try:
+            cursor = conn.cursor(cursorclass)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield _compact_rows(cursor.description, rows) if compact else rows
+            cursor.close()
+        except BaseException:
+            # SSCursorのcloseは読み残しの行をすべてサーバーから読むため、カーソルは閉じずに接続ごと破棄する
+            self.pool.discard(conn)
+            raise
+        self.pool.release(conn)
+
+    def execute_many(self, query, params_list):
+        """
+        execute_manyメソッドは、同じ文を複数のパラメータでまとめて実行するメソッドです。
+        INSERT ... VALUES文は複数行INSERTに書き換えられ、max_allowed_packetを超えない長さに
+        分割して送信されます。影響を受けた行数の合計を返します。
+        """
+        params_list = list(params_list)
+        if not params_list:
+            return 0
+        with self.conn.cursor(TimedDictCursor) as cursor:
+            cursor.max_stmt_length = self._max_stmt_length()
+            return cursor.executemany(query, params_list)
+
+    def _max_stmt_length(self):
+        """
+        _max_stmt_lengthメソッドは、複数行INSERTの1文あたりの最大長を求めるメソッドです。
+        サーバーのmax_allowed_packetはプール単位で一度だけ問い合わせます。
+        """
+        if self.pool.max_allowed_packet is None:
+            with self.conn.cursor() as cursor:
+                cursor.execute("SELECT @@max_allowed_packet AS max_allowed_packet")
+                row = cursor.fetchone()
+            self.pool.max_allowed_packet = int(row['max_allowed_packet'])
+        return max(STMT_LENGTH_MARGIN, min(MAX_STMT_LENGTH, self.pool.max_allowed_packet - STMT_LENGTH_MARGIN))
+
     def commit(self):
         """
         commitメソッドは、MySQLデータベースのトランザクションをコミットするメソッドです。
         MySQLデータベースのトランザクションをコミットします。
         """
         self.conn.commit()
+        result_cache.end_transaction(self.conn, committed=True)
         return None
-    
+
     def get_cursor(self):
         """
         get_cursorメソッドは、MySQLデータベースのカーソルを取得するメソッドです。
         MySQLデータベースのカーソルを取得します。
+        カーソルで実行したクエリの実行時間はクエリ統計に記録されます。
         """
-        return self.conn.cursor()
-    
+        return self.conn.cursor(TimedDictCursor)
+
     def rollback(self):
         """
         rollbackメソッドは、MySQLデータベースのトランザクションをロールバックするメソッドです。
         MySQLデータベースのトランザクションをロールバックします。
         """
         self.conn.rollback()
-        return None
\ No newline at end of file
+        result_cache.end_transaction(self.conn, committed=False)
+        return None
@@ -0,0 +1,204 @@
+"""
+締め済み年度の勤怠記録のアーカイブ
+
+締め済みの年度（4月始まり）の勤怠記録とプロジェクト作業時間を、
+通常のテーブルから圧縮したアーカイブテーブルへ移動します。
+通常のテーブルを小さく保つことで、バッファプールを直近のデータに使えるようにします。
+
+アーカイブした日付の勤怠記録詳細はアーカイブテーブルから表示し、
+月次集計（employee_monthly_summary）と再計算は両方のテーブルを対象にします。
+
+年度末の締め後に実行します:
+    python -m applications.archive --fiscal-year 2023   # 2023年度（2023/4〜2024/3）を移動
+    python -m applications.archive --list               # アーカイブ済みの年度を表示
+"""
+
+from applications.DBAccess import DBAccess
+import argparse
+import sys
+from datetime import date
+
+ARCHIVE_RECORDS_TABLE = 'attendance_records_archive'
+ARCHIVE_HOURS_TABLE = 'project_hours_archive'
+
+# 年度の開始月
+FISCAL_YEAR_START_MONTH = 4
+
+# 1トランザクションで移動する勤怠記録の件数
+DEFAULT_ARCHIVE_BATCH_SIZE = 1000
+
+# アーカイブテーブルへコピーする列（生成列work_minutesも値としてコピーする）
+RECORD_COLUMNS = (
+    'id', 'employee_id', 'date', 'attendance_type', 'start_time', 'end_time', 'break_time',
+    'start_minute', 'end_minute', 'break_minutes', 'work_minutes', 'notes', 'created_at', 'updated_at',
+)
+HOURS_COLUMNS = ('id', 'attendance_record_id', 'project_id', 'hours', 'created_at', 'updated_at')
+
+
+def fiscal_year_of(day):
+    """
+    日付が属する年度を返す関数
+
+    Args:
+        day: 日付
+
+    Returns:
+        int: 年度（2024年3月は2023年度）
+    """
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def fiscal_year_range(fiscal_year):
+    """
+    年度の初日と翌年度の初日を返す関数
+
+    Args:
+        fiscal_year: 年度
+
+    Returns:
+        tuple: (初日, 翌年度の初日)
+    """
+    return date(fiscal_year, FISCAL_YEAR_START_MONTH, 1), date(fiscal_year + 1, FISCAL_YEAR_START_MONTH, 1)
+
+
+def may_be_archived(date_str, today=None):
+    """
+    日付の勤怠記録がアーカイブされている可能性があるかを判定する関数
+
+    締め済みの年度（今日が属する年度より前）の日付だけがアーカイブの対象です。
+
+    Args:
+        date_str: 日付文字列 (YYYY-MM-DD)
+        today: 基準日（省略時は今日）
+
+    Returns:
+        bool: 締め済みの年度の日付であればTrue
+    """
+    try:
+        day = date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return False
+    return fiscal_year_of(day) < fiscal_year_of(today or date.today())
+
+
+def archive_fiscal_year(db, fiscal_year, batch_size=DEFAULT_ARCHIVE_BATCH_SIZE, today=None):
+    """
+    締め済みの年度の勤怠記録とプロジェクト作業時間をアーカイブテーブルへ移動する関数
+
+    batch_size件ごとにコピーと削除を1トランザクションで行うため、
+    途中で失敗しても再実行すれば残りから移動を続けます。
+
+    Args:
+        db: DBAccessのインスタンス
+        fiscal_year: 年度
+        batch_size: 1トランザクションで移動する勤怠記録の件数
+        today: 基準日（省略時は今日）
+
+    Returns:
+        int: 移動した勤怠記録の件数
+
+    Raises:
+        ValueError: 締め済みでない年度を指定した場合
+    """
+    if fiscal_year >= fiscal_year_of(today or date.today()):
+        raise ValueError(f'{fiscal_year}年度はまだ締められていません')
+
+    first_day, next_year = fiscal_year_range(fiscal_year)
+    record_columns = ', '.join(RECORD_COLUMNS)
+    hours_columns = ', '.join(HOURS_COLUMNS)
+    moved = 0
+    while True:
+        rows = db.execute_query("""
+            SELECT id
+            FROM attendance_records
+            WHERE date >= %s AND date < %s
+            ORDER BY id
+            LIMIT %s
+        """, (first_day, next_year, batch_size))
+        if not rows:
+            break
+        ids = tuple(row['id'] for row in rows)
+        placeholders = ', '.join(['%s'] * len(ids))
+
+        db.execute_query(f"""
+            INSERT IGNORE INTO {ARCHIVE_HOURS_TABLE} ({hours_columns})
+            SELECT {hours_columns} FROM project_hours WHERE attendance_record_id IN ({placeholders})
+        """, ids)
+        db.execute_query(f"""
+            INSERT IGNORE INTO {ARCHIVE_RECORDS_TABLE} ({record_columns})
+            SELECT {record_columns} FROM attendance_records
+            WHERE date >= %s AND date < %s AND id IN ({placeholders})
+        """, (first_day, next_year) + ids)
+        db.execute_query(f"DELETE FROM project_hours WHERE attendance_record_id IN ({placeholders})", ids)
+        db.execute_query(f"""
+            DELETE FROM attendance_records
+            WHERE date >= %s AND date < %s AND id IN ({placeholders})
+        """, (first_day, next_year) + ids)
+        db.commit()
+        moved += len(ids)
+
+    db.execute_query("""
+        INSERT INTO archived_fiscal_years (fiscal_year, record_count)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)
+    """, (fiscal_year, moved))
+    db.commit()
+    return moved
+
+
+def list_archived_fiscal_years(db):
+    """
+    アーカイブ済みの年度の一覧を取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+
+    Returns:
+        list: 年度・件数・アーカイブ日時の行のリスト
+    """
+    return db.execute_query("""
+        SELECT fiscal_year, record_count, archived_at
+        FROM archived_fiscal_years
+        ORDER BY fiscal_year
+    """)
+
+
+def main(argv=None):
+    """
+    コマンドラインから締め済み年度をアーカイブするメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='締め済み年度の勤怠記録をアーカイブテーブルへ移動します。')
+    parser.add_argument('--fiscal-year', type=int, help='アーカイブする年度')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_ARCHIVE_BATCH_SIZE,
+                        help='1トランザクションで移動する件数')
+    parser.add_argument('--list', action='store_true', help='アーカイブ済みの年度を表示する')
+    args = parser.parse_args(argv)
+
+    if args.fiscal_year is None and not args.list:
+        parser.error('--fiscal-year または --list を指定してください')
+
+    db = DBAccess()
+    try:
+        if args.fiscal_year is not None:
+            moved = archive_fiscal_year(db, args.fiscal_year, args.batch_size)
+            print(f"{args.fiscal_year}年度の勤怠記録を{moved}件アーカイブしました。")
+        if args.list:
+            for row in list_archived_fiscal_years(db):
+                print(f"{row['fiscal_year']}年度: {row['record_count']}件 ({row['archived_at']})")
+    except ValueError as e:
+        db.rollback()
+        print(f"エラー: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+静的ファイル（CSS・JavaScript）のビルドと配信
+
+static/css・static/jsのファイルを、内容のハッシュを含むファイル名でstatic/distに出力し、
+gzipとbrotli（brotliパッケージがある場合）で圧縮したファイルも作成します。
+出力したファイルの対応表（manifest.json）を使い、テンプレートはasset_url('css/app.css')で
+ハッシュ付きのURLを参照します。ハッシュ付きのファイルは内容が変わるとURLも変わるため、
+ブラウザに1年間・immutableでキャッシュさせます。
+
+実行方法:
+    python -m applications.assets          # static/distに出力
+    python -m applications.assets --check  # 最新かどうかを確認
+
+環境変数:
+    ASSETS_AUTO_BUILD: 起動時にビルドが古ければ出力する（デフォルト1）
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+# ビルドの対象（static配下のディレクトリ）
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR_NAME = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# ファイル名に含めるハッシュの長さ
+HASH_LENGTH = 12
+# ハッシュ付きのファイルのキャッシュ期間（秒）
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# 圧縮したファイルの拡張子と、Content-Encodingの値（優先する順）
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+MIMETYPES = {
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+
+assets = Blueprint('assets', __name__)
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def source_files(static_dir=STATIC_DIR):
+    """
+    ビルドの対象のファイルを返す関数
+
+    Args:
+        static_dir: staticディレクトリのパス
+
+    Returns:
+        list: staticからの相対パス（/区切り）のリスト
+    """
+    names = []
+    for source_dir in SOURCE_DIRS:
+        root = os.path.join(static_dir, source_dir)
+        for directory, _, files in os.walk(root):
+            for name in files:
+                if os.path.splitext(name)[1] in MIMETYPES:
+                    path = os.path.join(directory, name)
+                    names.append(os.path.relpath(path, static_dir).replace(os.sep, '/'))
+    return sorted(names)
+
+
+def hashed_name(name, content):
+    """
+    内容のハッシュを含むファイル名を返す関数
+
+    Args:
+        name: 元のファイル名（css/app.css など）
+        content: ファイルの内容
+
+    Returns:
+        str: ハッシュを含むファイル名（css/app.0123456789ab.css など）
+    """
+    base, ext = os.path.splitext(name)
+    return f"{base}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _write(path, content):
+    """
+    ファイルを一時ファイル経由で置き換える関数（書き込み途中のファイルを配信しないため）
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(content)
+    os.replace(temporary, path)
+
+
+def build(static_dir=STATIC_DIR):
+    """
+    静的ファイルをハッシュ付きのファイル名で出力し、圧縮したファイルとmanifest.jsonを作成する関数
+    内容が同じファイルは出力し直しません。
+
+    Args:
+        static_dir: staticディレクトリのパス
+
+    Returns:
+        dict: 元のファイル名とハッシュ付きのファイル名の対応表
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR_NAME)
+    manifest = {}
+    for name in source_files(static_dir):
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            content = f.read()
+        target = hashed_name(name, content)
+        manifest[name] = target
+        path = os.path.join(dist_dir, target)
+        if os.path.exists(path):
+            continue
+        _write(path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(content, quality=11))
+        _write(path, content)
+    _write(os.path.join(dist_dir, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+def read_manifest(static_dir=STATIC_DIR):
+    """
+    manifest.jsonを読み込む関数
+
+    Args:
+        static_dir: staticディレクトリのパス
+
+    Returns:
+        dict: 元のファイル名とハッシュ付きのファイル名の対応表（ビルドしていない場合は空）
+    """
+    try:
+        with open(os.path.join(static_dir, DIST_DIR_NAME, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def is_up_to_date(static_dir=STATIC_DIR):
+    """
+    ビルドが最新（すべての元のファイルの現在の内容が出力済み）かどうかを返す関数
+
+    Args:
+        static_dir: staticディレクトリのパス
+
+    Returns:
+        bool: 最新であればTrue
+    """
+    manifest = read_manifest(static_dir)
+    for name in source_files(static_dir):
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            target = hashed_name(name, f.read())
+        if manifest.get(name) != target or not os.path.exists(os.path.join(static_dir, DIST_DIR_NAME, target)):
+            return False
+    return True
+
+
+def ensure_built(static_dir=STATIC_DIR):
+    """
+    起動時にビルドが最新かどうかを確認し、古ければ出力する関数
+    ASSETS_AUTO_BUILD=0の場合は確認だけを行い、デプロイ時の python -m applications.assets に任せます。
+    """
+    if is_up_to_date(static_dir):
+        return
+    if os.getenv('ASSETS_AUTO_BUILD', '1') == '1':
+        build(static_dir)
+    else:
+        print("静的ファイルのビルドが最新ではありません。python -m applications.assets を実行してください。")
+
+
+def asset_url(name):
+    """
+    テンプレートから静的ファイルのURLを求める関数
+
+    ビルド済みであればハッシュ付きのファイルのURLを、そうでなければ元のファイルのURLを返します。
+    対応表はプロセスごとに1回だけ読み込みます。
+
+    Args:
+        name: 元のファイル名（css/app.css など）
+
+    Returns:
+        str: URL
+    """
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = read_manifest(current_app.static_folder)
+    target = _manifest.get(name)
+    if target is None:
+        return url_for('static', filename=name)
+    return url_for('assets.dist', filename=target)
+
+
+def reset_manifest():
+    """
+    読み込んだ対応表を破棄する関数（ビルドし直した後やテストで使用）
+    """
+    global _manifest
+    with _manifest_lock:
+        _manifest = None
+
+
+@assets.route('/assets/<path:filename>')
+def dist(filename):
+    """
+    ハッシュ付きの静的ファイルを配信するエンドポイント
+
+    Accept-Encodingに応じて、brotli・gzipで圧縮済みのファイルがあればそれを返します。
+
+    Args:
+        filename: ハッシュ付きのファイル名
+
+    Returns:
+        Response: ファイルの内容
+    """
+    mimetype = MIMETYPES.get(os.path.splitext(filename)[1])
+    if mimetype is None:
+        abort(404)
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR_NAME)
+    accepted = request.accept_encodings
+    for encoding, suffix in ENCODINGS:
+        if accepted[encoding] and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+            response = send_from_directory(dist_dir, filename + suffix, mimetype=mimetype,
+                                           max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def main(argv=None):
+    """
+    コマンドラインから静的ファイルをビルドするメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード（--checkで最新でない場合は1）
+    """
+    parser = argparse.ArgumentParser(description='静的ファイルをハッシュ付きのファイル名で出力し、圧縮します。')
+    parser.add_argument('--check', action='store_true', help='最新かどうかを確認する（出力しない）')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        up_to_date = is_up_to_date()
+        print('最新です' if up_to_date else '最新ではありません')
+        return 0 if up_to_date else 1
+
+    manifest = build()
+    for name, target in sorted(manifest.items()):
+        print(f"{name} -> {DIST_DIR_NAME}/{target}")
+    if brotli is None:
+        print("brotliパッケージがないため、gzipだけで圧縮しました。", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
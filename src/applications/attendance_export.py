@@ -0,0 +1,208 @@
+"""
+勤怠記録とプロジェクト作業時間のXLSX出力
+
+期間内の勤怠記録（1日1行）とプロジェクト作業時間（1件1行）を、2つのワークシートのXLSXに出力します。
+どちらもサーバーサイドカーソルで一定件数ずつ読み、xlsx_exportで逐次書き出すため、
+社員数・日数にかかわらずメモリ使用量は一定です。
+Excelの最大行数を超える行は、「勤怠記録 (2)」のような続きのシートに出力します。
+締め済みの年度を含む期間は、通常のテーブルに続けてアーカイブテーブルも読みます。
+
+画面からは1か月分をダウンロードできます。長い期間は、バッチ処理としてファイルに出力します:
+    python -m applications.attendance_export --year 2025 --month 10 --output attendance_202510.xlsx
+    python -m applications.attendance_export --from 2024-04-01 --to 2025-04-01 --output fy2024.xlsx
+"""
+
+from applications.DBAccess import DBAccess
+from applications import archive, xlsx_export
+from applications.monthly_summary import month_range
+import argparse
+import sys
+from datetime import date
+
+RECORDS_TABLE = 'attendance_records'
+HOURS_TABLE = 'project_hours'
+
+# 期間内の勤怠記録を読むSQL。idx_date_employeeの順に読むため、ソートは行わない
+RECORDS_QUERY = """
+    SELECT ar.employee_id, e.name AS employee_name, ar.date, ar.attendance_type,
+           ar.start_minute, ar.end_minute, ar.break_minutes, ar.work_minutes, ar.notes
+    FROM {records} ar
+    JOIN employees e ON e.id = ar.employee_id
+    WHERE ar.date >= %s AND ar.date < %s
+    ORDER BY ar.date, ar.employee_id
+"""
+
+# 期間内のプロジェクト作業時間を読むSQL
+HOURS_QUERY = """
+    SELECT ar.employee_id, e.name AS employee_name, ar.date,
+           ph.project_id, p.name AS project_name, ph.hours
+    FROM {records} ar
+    JOIN {hours} ph ON ph.attendance_record_id = ar.id
+    JOIN employees e ON e.id = ar.employee_id
+    JOIN projects p ON p.id = ph.project_id
+    WHERE ar.date >= %s AND ar.date < %s
+    ORDER BY ar.date, ar.employee_id
+"""
+
+RECORD_SHEET_COLUMNS = (
+    ('社員ID', 'number'),
+    ('社員名', 'string'),
+    ('日付', 'date'),
+    ('出勤区分', 'string'),
+    ('出勤時刻', 'time'),
+    ('退勤時刻', 'time'),
+    ('休憩時間', 'time'),
+    ('総労働時間（時間）', 'hours'),
+    ('実労働時間（時間）', 'hours'),
+    ('特記事項', 'string'),
+)
+
+HOURS_SHEET_COLUMNS = (
+    ('社員ID', 'number'),
+    ('社員名', 'string'),
+    ('日付', 'date'),
+    ('プロジェクトID', 'number'),
+    ('プロジェクト名', 'string'),
+    ('作業時間（時間）', 'hours'),
+)
+
+
+def record_values(row):
+    """
+    勤怠記録の行をワークシートのセルの値に変換する関数
+
+    Args:
+        row: RECORDS_QUERYの行
+
+    Returns:
+        tuple: RECORD_SHEET_COLUMNSの順のセルの値
+    """
+    work_minutes = row['work_minutes']
+    break_minutes = row['break_minutes'] or 0
+    return (
+        row['employee_id'],
+        row['employee_name'],
+        row['date'],
+        row['attendance_type'],
+        row['start_minute'],
+        row['end_minute'],
+        row['break_minutes'],
+        None if work_minutes is None else work_minutes / 60,
+        None if work_minutes is None else (work_minutes - break_minutes) / 60,
+        row['notes'],
+    )
+
+
+def hours_values(row):
+    """
+    プロジェクト作業時間の行をワークシートのセルの値に変換する関数
+
+    Args:
+        row: HOURS_QUERYの行
+
+    Returns:
+        tuple: HOURS_SHEET_COLUMNSの順のセルの値
+    """
+    return (
+        row['employee_id'],
+        row['employee_name'],
+        row['date'],
+        row['project_id'],
+        row['project_name'],
+        row['hours'],
+    )
+
+
+def _batches(db, query, date_from, date_to, today=None):
+    """
+    通常のテーブルと、必要であればアーカイブテーブルから行のバッチを順に読むジェネレータ
+
+    ジェネレータが閉じられると、読み途中のサーバーサイドカーソルも閉じられます。
+    """
+    tables = [(RECORDS_TABLE, HOURS_TABLE)]
+    if archive.may_be_archived(date_from.isoformat(), today):
+        tables.append((archive.ARCHIVE_RECORDS_TABLE, archive.ARCHIVE_HOURS_TABLE))
+    for records, hours in tables:
+        yield from db.iter_query(query.format(records=records, hours=hours), (date_from, date_to), compact=True)
+
+
+def workbook_sheets(db, date_from, date_to, today=None):
+    """
+    期間内の勤怠記録とプロジェクト作業時間のワークシートの定義を作成する関数
+
+    クエリは、ワークシートを書き出すときに1つずつ実行されます。
+
+    Args:
+        db: DBAccessのインスタンス
+        date_from: 期間の初日
+        date_to: 期間の翌日（この日を含まない）
+        today: 基準日（省略時は今日、アーカイブテーブルを読むかの判定に使う）
+
+    Returns:
+        list: xlsx_export.Sheetのリスト
+    """
+    return [
+        xlsx_export.Sheet('勤怠記録', RECORD_SHEET_COLUMNS,
+                          _batches(db, RECORDS_QUERY, date_from, date_to, today), record_values),
+        xlsx_export.Sheet('プロジェクト作業時間', HOURS_SHEET_COLUMNS,
+                          _batches(db, HOURS_QUERY, date_from, date_to, today), hours_values),
+    ]
+
+
+def export_to_file(db, date_from, date_to, path):
+    """
+    期間内の勤怠記録とプロジェクト作業時間をXLSXファイルに書き出す関数
+
+    Args:
+        db: DBAccessのインスタンス
+        date_from: 期間の初日
+        date_to: 期間の翌日（この日を含まない）
+        path: 出力するファイルのパス
+
+    Returns:
+        int: 書き出したバイト数
+    """
+    size = 0
+    with open(path, 'wb') as output:
+        for chunk in xlsx_export.stream_workbook(workbook_sheets(db, date_from, date_to)):
+            output.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def main(argv=None):
+    """
+    コマンドラインから勤怠記録をXLSXファイルに出力するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='勤怠記録とプロジェクト作業時間をXLSXファイルに出力します。')
+    parser.add_argument('--year', type=int, help='出力する年')
+    parser.add_argument('--month', type=int, help='出力する月')
+    parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help='期間の初日 (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help='期間の翌日 (YYYY-MM-DD、この日を含まない)')
+    parser.add_argument('--output', required=True, help='出力するファイルのパス')
+    args = parser.parse_args(argv)
+
+    if args.year is not None and args.month is not None:
+        date_from, date_to = month_range(args.year, args.month)
+    elif args.date_from is not None and args.date_to is not None:
+        date_from, date_to = args.date_from, args.date_to
+    else:
+        parser.error('--year と --month、または --from と --to を指定してください')
+
+    db = DBAccess()
+    try:
+        size = export_to_file(db, date_from, date_to, args.output)
+        print(f"{args.output} に出力しました（{size} バイト）。")
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
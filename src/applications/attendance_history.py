@@ -0,0 +1,150 @@
+"""
+勤怠記録の履歴のページ分割
+
+1人の社員の勤怠記録を新しい日付から順に、キーセット方式でページ分割して取得します。
+employee_idの等値と date のシークで unique_employee_date (employee_id, date) を1回シークするため、
+何ページ目でも1ページ分の行だけを読みます（OFFSETのように読み飛ばす行を読みません）。
+ページに含まれる勤怠記録のプロジェクト作業時間は、ページごとに1回のクエリでまとめて取得します。
+
+締め済みの年度の記録はアーカイブテーブルに移動している場合があるため、
+ページの範囲が今年度より前に及ぶ場合だけアーカイブテーブルも同じ条件で読み、日付の順に合わせます。
+"""
+
+from datetime import date
+
+from applications import archive, pagination
+from applications.models import AttendanceRecord
+from applications.pagination import Page
+
+# ソートキー（employee_idは等値で絞り込むため、カーソルには日付だけを含める）
+SORT_COLUMNS = ('date',)
+
+RECORD_COLUMNS = "id, date, attendance_type, start_minute, end_minute, break_minutes, work_minutes, notes"
+
+
+def fetch_page(db, employee_id, date_from=None, date_to=None, size=None, after=None, before=None, today=None):
+    """
+    社員の勤怠記録の1ページを新しい日付の順に取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        employee_id: 社員ID
+        date_from: 期間の初日（省略可）
+        date_to: 期間の最終日（省略可）
+        size: ページサイズ（省略時はpagination.DEFAULT_PAGE_SIZE）
+        after: 次のページ（より古い日付）のカーソル
+        before: 前のページ（より新しい日付）のカーソル（afterより優先）
+        today: 基準日（アーカイブの判定に使用、省略時は今日）
+
+    Returns:
+        tuple: (Page, プロジェクト作業時間の辞書)
+            Pageの行はAttendanceRecord、辞書は勤怠記録IDごとのプロジェクト作業時間の行のリスト
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    size = pagination.DEFAULT_PAGE_SIZE if size is None else size
+    cursor = before or after
+    backward = bool(before)
+    values = _decode_cursor(cursor) if cursor else None
+
+    # 新しい日付から表示するため、次のページへは降順、前のページへは昇順に読む
+    descending = not backward
+    conditions = ['employee_id = %s']
+    params = [employee_id]
+    if date_from is not None:
+        conditions.append('date >= %s')
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append('date <= %s')
+        params.append(date_to)
+    if values is not None:
+        seek, seek_params = pagination.seek_condition(SORT_COLUMNS, values, descending=descending)
+        conditions.append(f"({seek})")
+        params += seek_params
+    where = ' AND '.join(conditions)
+    order = pagination.order_by(SORT_COLUMNS, descending=descending)
+
+    def read(table):
+        return db.execute_query(f"""
+            SELECT {RECORD_COLUMNS}
+            FROM {table}
+            WHERE {where}
+            ORDER BY {order}
+            LIMIT %s
+        """, (*params, size + 1), compact=True)
+
+    rows = read('attendance_records')
+    archived_ids = set()
+    if _may_reach_archive(rows, size, descending, date_from, values, today):
+        archived = read(archive.ARCHIVE_RECORDS_TABLE)
+        if archived:
+            archived_ids = {row.id for row in archived}
+            rows = sorted(list(rows) + list(archived), key=lambda row: row.date, reverse=descending)[:size + 1]
+
+    page = Page.from_rows(rows, size, SORT_COLUMNS, backward=backward, has_cursor=values is not None)
+    hours = project_hours_by_record(db, [row.id for row in page.rows if row.id not in archived_ids])
+    archived_page_ids = [row.id for row in page.rows if row.id in archived_ids]
+    if archived_page_ids:
+        hours.update(project_hours_by_record(db, archived_page_ids, archive.ARCHIVE_HOURS_TABLE))
+    page.rows = AttendanceRecord.from_rows(page.rows)
+    return page, hours
+
+
+def _decode_cursor(cursor):
+    """
+    カーソルをソートキーの値（YYYY-MM-DD形式の日付文字列）に戻す関数
+
+    Raises:
+        ValueError: カーソルが不正な場合（日付でない値を含む）
+    """
+    values = pagination.decode_cursor(cursor, len(SORT_COLUMNS), (str,))
+    try:
+        date.fromisoformat(values[0])
+    except ValueError:
+        raise ValueError(f"不正なカーソルです: {cursor}") from None
+    return values
+
+
+def _may_reach_archive(rows, size, descending, date_from, values, today):
+    """
+    ページの範囲がアーカイブテーブルの記録（今年度より前の日付）に及ぶ可能性があるかを判定する関数
+    """
+    first_day, _ = archive.fiscal_year_range(archive.fiscal_year_of(today or date.today()))
+    lower = date_from
+    if values is not None and not descending:
+        # 前のページへ戻る場合は、カーソルの日付より新しい記録だけを読む
+        cursor_date = date.fromisoformat(values[0])
+        lower = cursor_date if lower is None else max(lower, cursor_date)
+    if lower is not None and lower >= first_day:
+        return False
+    # 降順に読んで1ページ分が今年度の記録で埋まった場合、それより古いアーカイブの記録は含まれない
+    return not (descending and len(rows) > size and rows[size].date >= first_day)
+
+
+def project_hours_by_record(db, record_ids, table='project_hours'):
+    """
+    勤怠記録のプロジェクト作業時間を1回のクエリでまとめて取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        record_ids: 勤怠記録IDのリスト
+        table: プロジェクト作業時間のテーブル名
+
+    Returns:
+        dict: 勤怠記録IDごとのプロジェクト作業時間の行（project_id・project_name・hours）のリスト
+    """
+    hours = {record_id: [] for record_id in record_ids}
+    if not record_ids:
+        return hours
+    placeholders = ', '.join(['%s'] * len(record_ids))
+    rows = db.execute_query(f"""
+        SELECT ph.attendance_record_id, ph.project_id, p.name AS project_name, ph.hours
+        FROM {table} ph
+        JOIN projects p ON ph.project_id = p.id
+        WHERE ph.attendance_record_id IN ({placeholders})
+        ORDER BY ph.attendance_record_id, p.name
+    """, tuple(record_ids), compact=True)
+    for row in rows:
+        hours[row.attendance_record_id].append(row)
+    return hours
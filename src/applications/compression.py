@@ -0,0 +1,407 @@
+"""
+応答の圧縮（WSGIミドルウェア）
+
+HTML・JSON・CSVなどのテキストの応答を、リクエストのAccept-Encodingに応じて
+brotli（brotliパッケージがある場合）またはgzipで圧縮します。
+Content-Lengthのある応答はまとめて圧縮し、ストリーミングの応答（Content-Lengthなし）は
+アプリケーションが返すチャンクごとに逐次圧縮して送るため、全体をバッファしません。
+圧縮済みの応答（Content-Encodingあり）、小さい応答、画像などの圧縮済みの形式は圧縮しません。
+圧縮の対象の形式の応答には、圧縮したかどうかにかかわらずVary: Accept-Encodingを付け、
+共有キャッシュが圧縮した応答と圧縮していない応答を取り違えないようにします。
+
+ルートごとに圧縮前後のサイズと圧縮にかかったCPU時間を集計し、get_compression_statsで取得できます。
+
+環境変数:
+    COMPRESS_MIN_SIZE: 圧縮する最小サイズ（バイト、デフォルト1024）
+    COMPRESS_LEVEL: gzipの圧縮レベル（1〜9、デフォルト6、0で圧縮しない）
+    COMPRESS_BROTLI_QUALITY: brotliの品質（0〜11、デフォルト4）
+"""
+
+import os
+import threading
+import time
+import zlib
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 4
+
+# 圧縮する形式（Content-Typeのパラメータを除いた値）
+COMPRESSIBLE_TYPES = frozenset((
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+))
+
+
+# リクエストのURLルールを記録するenvironのキー
+ROUTE_ENVIRON_KEY = 'applications.compression.route'
+
+
+class CompressionStats:
+    """
+    CompressionStatsクラスは、ルートごとの圧縮前後のサイズとCPU時間を集計するクラスです。
+    複数スレッドから同時に記録できます。
+    """
+
+    def __init__(self):
+        """
+        __init__メソッドは、CompressionStatsクラスのインスタンスを初期化するメソッドです。
+        """
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, route, encoding, bytes_in, bytes_out, cpu_seconds):
+        """
+        recordメソッドは、1つの応答の圧縮の結果を記録するメソッドです。
+        """
+        with self._lock:
+            entry = self._stats.get((route, encoding))
+            if entry is None:
+                # [応答数, 圧縮前のバイト数, 圧縮後のバイト数, CPU時間（秒）]
+                entry = self._stats[(route, encoding)] = [0, 0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += bytes_in
+            entry[2] += bytes_out
+            entry[3] += cpu_seconds
+
+    def snapshot(self):
+        """
+        snapshotメソッドは、集計結果を圧縮前のバイト数の降順のリストで返すメソッドです。
+        ratioは圧縮後のサイズ÷圧縮前のサイズです。
+        """
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._stats.items()]
+        results = [{
+            'route': route,
+            'encoding': encoding,
+            'responses': responses,
+            'bytes_in': bytes_in,
+            'bytes_out': bytes_out,
+            'ratio': bytes_out / bytes_in if bytes_in else 1.0,
+            'cpu_ms': cpu_seconds * 1000,
+            'cpu_ms_per_response': cpu_seconds * 1000 / responses,
+        } for (route, encoding), (responses, bytes_in, bytes_out, cpu_seconds) in items]
+        results.sort(key=lambda result: result['bytes_in'], reverse=True)
+        return results
+
+    def reset(self):
+        """
+        resetメソッドは、集計結果をすべて破棄するメソッドです。
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+compression_stats = CompressionStats()
+
+
+def get_compression_stats():
+    """
+    応答の圧縮の集計結果を返す関数
+
+    Returns:
+        list: ルート・方式ごとの集計結果（CompressionStats.snapshotの戻り値）
+    """
+    return compression_stats.snapshot()
+
+
+def reset_compression_stats():
+    """
+    応答の圧縮の集計結果を破棄する関数
+    """
+    compression_stats.reset()
+
+
+class _Compressor:
+    """
+    _Compressorクラスは、gzip・brotliの逐次圧縮を共通の手順で扱うクラスです。
+    """
+
+    def __init__(self, encoding, level, brotli_quality):
+        """
+        __init__メソッドは、指定した方式の圧縮器を作成するメソッドです。
+        """
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._compress = self._compressor.process
+        else:
+            # wbits=31でgzip形式（ヘッダーとCRCを含む）にする
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._compress = self._compressor.compress
+        self.cpu_seconds = 0.0
+
+    def compress(self, data, flush=False):
+        """
+        compressメソッドは、データを圧縮するメソッドです。
+        flushがTrueの場合は、ここまでのデータをすべて出力します（ストリーミングで送るため）。
+        """
+        start = time.thread_time()
+        output = self._compress(data)
+        if flush:
+            output += self._flush()
+        self.cpu_seconds += time.thread_time() - start
+        return output
+
+    def finish(self):
+        """
+        finishメソッドは、圧縮を終了して残りのデータを出力するメソッドです。
+        """
+        start = time.thread_time()
+        output = self._finish()
+        self.cpu_seconds += time.thread_time() - start
+        return output
+
+
+class CompressionMiddleware:
+    """
+    CompressionMiddlewareクラスは、応答をAccept-Encodingに応じて圧縮するWSGIミドルウェアです。
+    """
+
+    def __init__(self, app, min_size=None, level=None, brotli_quality=None, stats=None):
+        """
+        __init__メソッドは、CompressionMiddlewareクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            app: WSGIアプリケーション
+            min_size: 圧縮する最小サイズ（バイト）
+            level: gzipの圧縮レベル（0で圧縮しない）
+            brotli_quality: brotliの品質
+            stats: 集計先のCompressionStats（省略時はcompression_stats）
+        """
+        self.app = app
+        self.min_size = int(os.getenv('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)) if min_size is None else min_size
+        self.level = int(os.getenv('COMPRESS_LEVEL', DEFAULT_LEVEL)) if level is None else level
+        self.brotli_quality = (int(os.getenv('COMPRESS_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY))
+                               if brotli_quality is None else brotli_quality)
+        self.stats = compression_stats if stats is None else stats
+
+    def __call__(self, environ, start_response):
+        """
+        __call__メソッドは、アプリケーションを呼び出し、必要に応じて応答を圧縮するメソッドです。
+        """
+        encoding = self.choose_encoding(environ)
+        if encoding is None:
+            if self.level <= 0:
+                return self.app(environ, start_response)
+
+            def vary_start_response(status, headers, exc_info=None):
+                # 圧縮しない場合も、Accept-Encodingによって応答が変わることを示す
+                if self.negotiable(status, headers):
+                    headers = _add_vary(list(headers))
+                return start_response(status, headers, exc_info)
+
+            return self.app(environ, vary_start_response)
+
+        captured = []
+
+        def capture_start_response(status, headers, exc_info=None):
+            # 本文を見るまで圧縮するかを決められないため、ヘッダーの送信を遅らせる
+            captured[:] = [status, headers, exc_info]
+            return lambda data: captured.append(data)
+
+        app_iter = self.app(environ, capture_start_response)
+        return _CompressedResponse(self, environ, start_response, encoding, captured, app_iter)
+
+    def choose_encoding(self, environ):
+        """
+        choose_encodingメソッドは、Accept-Encodingから圧縮の方式を選ぶメソッドです。
+        品質値が同じ場合はbrotliを優先します。
+
+        Returns:
+            str: 'br'・'gzip'、圧縮しない場合はNone
+        """
+        if self.level <= 0 or environ.get('REQUEST_METHOD') == 'HEAD':
+            return None
+        accepted = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING'))
+        candidates = [('br', accepted['br'])] if brotli is not None else []
+        candidates.append(('gzip', accepted['gzip']))
+        encoding, quality = max(candidates, key=lambda candidate: candidate[1])
+        return encoding if quality > 0 else None
+
+    def negotiable(self, status, headers):
+        """
+        negotiableメソッドは、Accept-Encodingによって圧縮される可能性のある応答かを判定するメソッドです。
+        このような応答には、圧縮したかどうかにかかわらずVary: Accept-Encodingを付けます。
+        304は同じ表現の200と同じVaryを返すため対象に含めます。本文のサイズは判定しません。
+        """
+        if not status.startswith(('200', '304')):
+            return False
+        values = {name.lower(): value for name, value in headers}
+        if 'content-encoding' in values or 'content-range' in values:
+            return False
+        if 'no-transform' in values.get('cache-control', ''):
+            return False
+        content_type = values.get('content-type', '').split(';')[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    def should_compress(self, status, headers):
+        """
+        should_compressメソッドは、ステータスとヘッダーから圧縮するかを判定するメソッドです。
+        本文のサイズはContent-Lengthがある場合だけここで判定します。
+        """
+        if not status.startswith('200') or not self.negotiable(status, headers):
+            return False
+        length = {name.lower(): value for name, value in headers}.get('content-length')
+        return length is None or int(length) >= self.min_size
+
+
+def init_app(app, **kwargs):
+    """
+    Flaskアプリケーションに圧縮のミドルウェアを組み込む関数
+
+    ミドルウェアはリクエストの処理が終わった後に本文を圧縮するため、
+    処理中にURLルールをenvironに記録しておき、集計に使います。
+
+    Args:
+        app: Flaskアプリケーション
+        **kwargs: CompressionMiddlewareの引数（min_size・level・brotli_quality）
+
+    Returns:
+        CompressionMiddleware: 組み込んだミドルウェア
+    """
+    @app.before_request
+    def _note_route():
+        if request.url_rule is not None:
+            request.environ[ROUTE_ENVIRON_KEY] = request.url_rule.rule
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, **kwargs)
+    return app.wsgi_app
+
+
+class _CompressedResponse:
+    """
+    _CompressedResponseクラスは、アプリケーションの応答を圧縮しながら返すWSGIの反復可能オブジェクトです。
+    """
+
+    def __init__(self, middleware, environ, start_response, encoding, captured, app_iter):
+        """
+        __init__メソッドは、圧縮前の応答を受け取るメソッドです。
+        """
+        self.middleware = middleware
+        self.environ = environ
+        self.start_response = start_response
+        self.encoding = encoding
+        self.captured = captured
+        self.app_iter = app_iter
+
+    def __iter__(self):
+        """
+        __iter__メソッドは、圧縮した本文をチャンクごとに返すジェネレータです。
+        """
+        chunks = iter(self.app_iter)
+        # start_responseの前に返された本文（write呼び出し）と、最初のチャンクを読んでからヘッダーを判定する
+        first = next(chunks, b'')
+        status, headers, exc_info = self.captured[:3]
+        pending = [data for data in self.captured[3:] if data] + ([first] if first else [])
+        middleware = self.middleware
+
+        if not middleware.should_compress(status, headers):
+            if middleware.negotiable(status, headers):
+                headers = _add_vary(list(headers))
+            self.start_response(status, headers, exc_info)
+            yield from pending
+            yield from chunks
+            return
+
+        headers = [(name, value) for name, value in headers if name.lower() != 'content-length']
+        known_length = len(headers) != len(self.captured[1])
+        headers = _add_vary(headers)
+        if known_length:
+            # 本文はすでにメモリ上にあるため、まとめて圧縮してContent-Lengthを付け直す
+            body = b''.join(pending) + b''.join(chunks)
+            compressor = _Compressor(self.encoding, middleware.level, middleware.brotli_quality)
+            output = compressor.compress(body) + compressor.finish()
+            self.start_response(status, _compressed_headers(headers, self.encoding, len(output)), exc_info)
+            self._record(len(body), len(output), compressor.cpu_seconds)
+            yield output
+            return
+
+        # ストリーミング: 最小サイズに達するまで読み、達しなければ圧縮せずに送る
+        size = sum(len(data) for data in pending)
+        while size < middleware.min_size:
+            data = next(chunks, None)
+            if data is None:
+                break
+            if data:
+                pending.append(data)
+                size += len(data)
+        if size < middleware.min_size:
+            self.start_response(status, headers, exc_info)
+            yield from pending
+            return
+
+        compressor = _Compressor(self.encoding, middleware.level, middleware.brotli_quality)
+        self.start_response(status, _compressed_headers(headers, self.encoding, None), exc_info)
+        bytes_in = size
+        bytes_out = 0
+        output = compressor.compress(b''.join(pending), flush=True)
+        bytes_out += len(output)
+        yield output
+        for data in chunks:
+            if not data:
+                continue
+            bytes_in += len(data)
+            output = compressor.compress(data, flush=True)
+            bytes_out += len(output)
+            yield output
+        output = compressor.finish()
+        bytes_out += len(output)
+        self._record(bytes_in, bytes_out, compressor.cpu_seconds)
+        yield output
+
+    def close(self):
+        """
+        closeメソッドは、アプリケーションの応答を閉じるメソッドです（WSGIの規約）。
+        """
+        close = getattr(self.app_iter, 'close', None)
+        if close is not None:
+            close()
+
+    def _record(self, bytes_in, bytes_out, cpu_seconds):
+        """
+        _recordメソッドは、圧縮の結果をルートごとに記録するメソッドです。
+        ルートはinit_appで記録したFlaskのURLルール（/attendance/view/<date_str> など）で集計します。
+        """
+        route = self.environ.get(ROUTE_ENVIRON_KEY) or '-'
+        self.middleware.stats.record(route, self.encoding, bytes_in, bytes_out, cpu_seconds)
+
+
+def _add_vary(headers):
+    """
+    Varyヘッダーに Accept-Encoding を追加する関数
+    """
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == 'vary':
+            if 'accept-encoding' not in value.lower():
+                headers[index] = (name, f"{value}, Accept-Encoding")
+            return headers
+    return headers + [('Vary', 'Accept-Encoding')]
+
+
+def _compressed_headers(headers, encoding, length):
+    """
+    圧縮した応答のヘッダーを作成する関数
+
+    Content-Encodingを設定し、表現が変わるため強いETagを弱いETagにします。
+    """
+    result = []
+    for name, value in headers:
+        if name.lower() == 'etag' and not value.startswith('W/'):
+            value = f"W/{value}"
+        result.append((name, value))
+    result.append(('Content-Encoding', encoding))
+    if length is not None:
+        result.append(('Content-Length', str(length)))
+    return result
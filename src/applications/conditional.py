@@ -0,0 +1,162 @@
+"""
+条件付きGET（ETag・Last-Modified）
+
+画面が表示するデータの範囲（社員と月、日付、年月）ごとに、件数と MAX(updated_at) だけを
+読み込む軽いクエリ（プローブ）で検証用のトークンを求め、ETag・Last-Modifiedとして返します。
+ブラウザの If-None-Match（なければ If-Modified-Since）が一致した場合は、
+本来のクエリの実行とテンプレートの描画を行わずに 304 Not Modified を返します。
+
+プローブの列の規約:
+    *_modified: UNIX_TIMESTAMP(MAX(updated_at)) の値（Last-Modifiedに使用）
+    now: UNIX_TIMESTAMP() の値（データベースの現在時刻）
+    その他の列: 件数など、トークンに含める値
+
+updated_atは秒単位のため、最終更新が現在の1秒の中にある場合は、同じ秒のうちに更新されても
+トークンが変わらない可能性があります。その場合は検証用のヘッダーを付けずに通常どおり応答します。
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+
+from flask import current_app, make_response, request, session
+
+from applications import assets
+
+logger = logging.getLogger(__name__)
+
+_template_version = None
+
+
+def template_version():
+    """
+    テンプレートの版（テンプレートファイルと静的ファイルの対応表の最終更新時刻の最大値）を返す関数
+
+    デプロイでテンプレートや静的ファイル（ハッシュ付きのURL）が変わった場合に、
+    古いETagが一致しないようにトークンに含めます。プロセスごとに1回だけ求めます。
+
+    Returns:
+        int: 最終更新時刻（ナノ秒）
+    """
+    global _template_version
+    if _template_version is None:
+        folder = os.path.join(current_app.root_path, current_app.template_folder or 'templates')
+        latest = 0
+        for directory, _, files in os.walk(folder):
+            for name in files:
+                latest = max(latest, os.stat(os.path.join(directory, name)).st_mtime_ns)
+        manifest = os.path.join(current_app.static_folder, assets.DIST_DIR_NAME, assets.MANIFEST_NAME)
+        if os.path.exists(manifest):
+            latest = max(latest, os.stat(manifest).st_mtime_ns)
+        _template_version = latest
+    return _template_version
+
+
+class Validator:
+    """
+    Validatorクラスは、1つの画面の応答のETagとLast-Modifiedを保持するクラスです。
+    """
+
+    def __init__(self, etag, last_modified):
+        """
+        __init__メソッドは、Validatorクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            etag: ETagの値（引用符なし）
+            last_modified: 最終更新日時（UTCのdatetime、データがない場合はNone）
+        """
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def matches(self):
+        """
+        matchesメソッドは、リクエストの条件付きヘッダーが現在の版と一致するかを返すメソッドです。
+        If-None-Matchがある場合はそれだけで判定し、なければIf-Modified-Sinceで判定します。
+        If-None-Matchは弱い比較で判定します（圧縮した応答のETagは弱いETagになるため）。
+
+        Returns:
+            bool: ブラウザのキャッシュが最新の場合はTrue
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        since = request.if_modified_since
+        if since is None or self.last_modified is None:
+            return False
+        return self.last_modified <= since
+
+    def not_modified(self):
+        """
+        not_modifiedメソッドは、304 Not Modifiedの応答を返すメソッドです。
+
+        Returns:
+            Response: 本文のない304の応答
+        """
+        return self.apply(make_response('', 304))
+
+    def apply(self, response):
+        """
+        applyメソッドは、応答にETag・Last-Modified・Cache-Controlを設定するメソッドです。
+        内容はログインしている社員ごとに異なるため、共有キャッシュには保存させず、
+        ブラウザには毎回検証させます。
+
+        Args:
+            response: 応答（render_templateの戻り値などmake_responseで変換できる値）
+
+        Returns:
+            Response: ヘッダーを設定した応答
+        """
+        response = make_response(response)
+        response.set_etag(self.etag)
+        if self.last_modified is not None:
+            response.last_modified = self.last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+
+def probe(db, scope, query, params):
+    """
+    プローブのクエリを実行し、画面の版を表すValidatorを返す関数
+
+    フラッシュメッセージが残っている場合（画面に表示するため内容が変わる）、プローブが行を返さない場合、
+    最終更新が現在の1秒の中にある場合はNoneを返します。
+    検証は応答を速くするためのものなので、プローブに失敗した場合もNoneを返して通常どおり応答させます。
+
+    Args:
+        db: DBAccessのインスタンス
+        scope: 画面とデータの範囲を表す値のタプル（トークンに含める）
+        query: プローブのクエリ
+        params: プローブのクエリのパラメータ
+
+    Returns:
+        Validator: 検証用の値（検証しない場合はNone）
+    """
+    if session.get('_flashes'):
+        return None
+    try:
+        # 画面のクエリとは別に実行するため、execute_queryではなくカーソルを使う
+        cursor = db.get_cursor()
+        try:
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if row is None:
+            return None
+        now = row['now']
+        modified = [row[column] for column in row if column.endswith('_modified') and row[column] is not None]
+        last_modified = max(modified) if modified else None
+        if last_modified is not None and int(last_modified) >= int(now):
+            return None
+        values = sorted((column, str(value)) for column, value in row.items() if column != 'now')
+    except Exception:
+        logger.warning('validator probe failed: %s', scope[0], exc_info=True)
+        return None
+
+    # 画面の共通部分（base.html）はセッションのユーザー名・権限を表示する
+    token = repr((scope, session.get('user_name'), session.get('user_role'), template_version(), values))
+    etag = hashlib.sha256(token.encode()).hexdigest()[:32]
+    if last_modified is not None:
+        last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+    return Validator(etag, last_modified)
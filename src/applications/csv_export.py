@@ -0,0 +1,67 @@
+"""
+CSVのストリーミング出力
+
+サーバーサイドカーソル（DBAccess.iter_query）で一定件数ずつ読んだ行を、
+読んだ分だけCSVに変換して送るジェネレータの応答を作成します。
+結果セット全体をメモリに保持しないため、件数にかかわらずメモリ使用量は一定で、
+見出しの行はクエリの実行前に送られます（Content-Lengthを付けないため、chunkedで送られます）。
+
+ExcelでUTF-8として開けるよう、先頭にBOMを付けます。
+"""
+
+import csv
+import io
+
+from flask import Response
+
+BOM = '\ufeff'
+
+
+def _encode_rows(rows):
+    """
+    行のリストをCSVの文字列に変換し、UTF-8のバイト列で返す関数
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\r\n').writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def stream_csv(header, batches, values):
+    """
+    見出しと行のバッチからCSVのチャンクを生成するジェネレータ
+
+    Args:
+        header: 見出しの値のタプル
+        batches: 行のリストをyieldする反復可能オブジェクト（DBAccess.iter_queryの戻り値など）
+        values: 1行をCSVの値のタプルに変換する関数
+
+    Yields:
+        bytes: 見出し（BOM付き）と、バッチごとのCSVのチャンク
+    """
+    try:
+        yield BOM.encode('utf-8') + _encode_rows([header])
+        for batch in batches:
+            yield _encode_rows(map(values, batch))
+    finally:
+        # 途中で応答が閉じられた場合も、サーバーサイドカーソルの接続を解放する
+        close = getattr(batches, 'close', None)
+        if close is not None:
+            close()
+
+
+def csv_response(chunks, filename):
+    """
+    CSVのチャンクをダウンロードさせる応答を作成する関数
+
+    Args:
+        chunks: CSVのチャンクをyieldする反復可能オブジェクト
+        filename: ダウンロードするファイル名（ASCII）
+
+    Returns:
+        Response: text/csvのストリーミングの応答
+    """
+    response = Response(chunks, mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    return response
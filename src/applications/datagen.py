@@ -0,0 +1,404 @@
+"""
+ベンチマーク用の勤怠データ生成
+
+本番規模を想定した社員・プロジェクト・勤怠記録・プロジェクト作業時間を生成し、
+複数行INSERTでまとめて投入します。同じシードと同じ初期状態からは同じデータが生成されるため、
+各ベンチマーク・負荷試験で同じデータセットを共有できます。
+
+実行方法:
+    python -m applications.datagen --employees 5000 --projects 200 --years 5 --seed 42
+    python -m applications.datagen --employees 100 --type-mix 出勤=80,遅刻=5,一日休=15
+    python -m applications.datagen --replace ...   # 以前に生成したデータを削除してから生成
+
+生成した社員のメールアドレスは「<prefix>NNNNNNN@example.com」、
+パスワードはすべて「password123」です。
+"""
+
+from applications.DBAccess import DBAccess
+from applications import monthly_summary, partitions
+from applications.reference_cache import reference_cache
+import argparse
+import hashlib
+import itertools
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+DEFAULT_PREFIX = 'datagen'
+DEFAULT_PASSWORD = 'password123'
+
+# 1回のINSERTで投入する勤怠記録の件数
+DEFAULT_LOAD_BATCH_SIZE = 5000
+
+# 出勤区分ごとの出現比率（平日1日あたり）
+DEFAULT_TYPE_WEIGHTS = {
+    '出勤': 85,
+    '遅刻': 3,
+    '早退': 2,
+    '午前休': 3,
+    '午後休': 3,
+    '一日休': 4,
+}
+
+# 出勤・退勤時刻の基準（0時からの経過分）とばらつき（15分単位の刻み数）
+BASE_START_MINUTE = 9 * 60
+BASE_END_MINUTE = 18 * 60
+TIME_JITTER_STEPS = 2
+LUNCH_BREAK_MINUTES = 60
+
+RECORD_COLUMNS = (
+    'id', 'employee_id', 'date', 'attendance_type', 'start_time', 'end_time', 'break_time',
+    'start_minute', 'end_minute', 'break_minutes', 'notes',
+)
+
+
+def parse_type_mix(value):
+    """
+    「出勤=85,遅刻=3」形式の出勤区分の比率を解析する関数
+
+    Args:
+        value: 出勤区分の比率の文字列
+
+    Returns:
+        dict: 出勤区分と比率
+
+    Raises:
+        ValueError: 未知の出勤区分や不正な比率を指定した場合
+    """
+    weights = {}
+    for item in value.split(','):
+        attendance_type, _, weight = item.partition('=')
+        attendance_type = attendance_type.strip()
+        if attendance_type not in DEFAULT_TYPE_WEIGHTS:
+            raise ValueError(f'未知の出勤区分です: {attendance_type}')
+        weights[attendance_type] = float(weight)
+        if weights[attendance_type] < 0:
+            raise ValueError(f'比率は0以上で指定してください: {item}')
+    if not any(weights.values()):
+        raise ValueError('比率の合計が0です')
+    return weights
+
+
+def _jitter(rng):
+    """
+    時刻のばらつき（15分単位）を返す関数
+
+    Args:
+        rng: random.Randomのインスタンス
+
+    Returns:
+        int: ばらつきの分数
+    """
+    return rng.randint(-TIME_JITTER_STEPS, TIME_JITTER_STEPS) * 15
+
+
+def _format_time(minutes):
+    """
+    経過分をHH:MM:SS形式の文字列に変換する関数
+
+    Args:
+        minutes: 経過分（Noneも可）
+
+    Returns:
+        str: HH:MM:SS形式の文字列（値がない場合はNone）
+    """
+    if minutes is None:
+        return None
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+def generate_times(rng, attendance_type):
+    """
+    出勤区分に応じた出勤時刻・退勤時刻・休憩時間を生成する関数
+
+    Args:
+        rng: random.Randomのインスタンス
+        attendance_type: 出勤区分
+
+    Returns:
+        tuple: (出勤時刻, 退勤時刻, 休憩時間) の経過分（一日休はすべてNone）
+    """
+    if attendance_type == '一日休':
+        return None, None, None
+
+    start = BASE_START_MINUTE + _jitter(rng)
+    end = BASE_END_MINUTE + _jitter(rng)
+    break_minutes = LUNCH_BREAK_MINUTES
+    if attendance_type == '遅刻':
+        start = BASE_START_MINUTE + rng.randint(1, 8) * 15
+    elif attendance_type == '早退':
+        end = BASE_END_MINUTE - rng.randint(4, 16) * 15
+    elif attendance_type == '午前休':
+        start, break_minutes = 13 * 60, 0
+    elif attendance_type == '午後休':
+        end, break_minutes = 12 * 60, 0
+    return start, end, break_minutes
+
+
+def generate_project_hours(rng, project_ids, work_minutes):
+    """
+    勤務時間を1〜3件のプロジェクトに15分単位で配分する関数
+
+    Args:
+        rng: random.Randomのインスタンス
+        project_ids: プロジェクトIDのリスト
+        work_minutes: 配分する勤務時間（分）
+
+    Returns:
+        list: (プロジェクトID, 作業時間) のリスト
+    """
+    if not project_ids or work_minutes <= 0:
+        return []
+    count = min(len(project_ids), rng.randint(1, 3))
+    chosen = rng.sample(project_ids, count)
+    steps = work_minutes // 15
+    cuts = sorted(rng.randint(0, steps) for _ in range(count - 1))
+    bounds = [0] + cuts + [steps]
+    return [
+        (project_id, (bounds[i + 1] - bounds[i]) * 15 / 60)
+        for i, project_id in enumerate(chosen)
+        if bounds[i + 1] > bounds[i]
+    ]
+
+
+def generate_attendance(rng, employee_ids, project_ids, first_day, last_day, type_weights, next_id):
+    """
+    期間内の平日の勤怠記録とプロジェクト作業時間を生成するジェネレータ
+
+    Args:
+        rng: random.Randomのインスタンス
+        employee_ids: 社員IDのリスト
+        project_ids: プロジェクトIDのリスト
+        first_day: 期間の初日
+        last_day: 期間の最終日
+        type_weights: 出勤区分と比率
+        next_id: 最初の勤怠記録に割り当てるID
+
+    Yields:
+        tuple: (勤怠記録の行, プロジェクト作業時間の行のリスト)
+    """
+    types = list(type_weights)
+    cum_weights = list(itertools.accumulate(type_weights[attendance_type] for attendance_type in types))
+    record_id = next_id
+    day = first_day
+    while day <= last_day:
+        if day.weekday() < 5:
+            for employee_id in employee_ids:
+                attendance_type = rng.choices(types, cum_weights=cum_weights)[0]
+                start, end, break_minutes = generate_times(rng, attendance_type)
+                record = (
+                    record_id, employee_id, day, attendance_type,
+                    _format_time(start), _format_time(end), _format_time(break_minutes),
+                    start, end, break_minutes, '',
+                )
+                work_minutes = end - start - break_minutes if start is not None else 0
+                hours = [
+                    (record_id, project_id, project_hours)
+                    for project_id, project_hours in generate_project_hours(rng, project_ids, work_minutes)
+                ]
+                yield record, hours
+                record_id += 1
+        day += timedelta(days=1)
+
+
+def delete_generated(db, prefix):
+    """
+    以前に生成した社員とその勤怠記録・プロジェクト作業時間・プロジェクトを削除する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        prefix: 生成した社員のメールアドレス・プロジェクト名の接頭辞
+    """
+    pattern = f"{prefix}%"
+    db.execute_query("""
+        DELETE ph
+        FROM project_hours ph
+        JOIN attendance_records ar ON ph.attendance_record_id = ar.id
+        JOIN employees e ON ar.employee_id = e.id
+        WHERE e.email LIKE %s
+    """, (pattern,))
+    db.execute_query("""
+        DELETE ar
+        FROM attendance_records ar
+        JOIN employees e ON ar.employee_id = e.id
+        WHERE e.email LIKE %s
+    """, (pattern,))
+    db.execute_query("DELETE FROM employees WHERE email LIKE %s", (pattern,))
+    db.execute_query("DELETE FROM projects WHERE name LIKE %s", (pattern,))
+    reference_cache.bump(db, 'employees')
+    reference_cache.bump(db, 'projects')
+    db.commit()
+
+
+def create_employees(db, rng, count, prefix):
+    """
+    社員を作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        rng: random.Randomのインスタンス
+        count: 作成する社員数
+        prefix: メールアドレスの接頭辞
+
+    Returns:
+        list: 作成した社員IDのリスト
+    """
+    password_hash = hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()
+    rows = [
+        (f"{prefix}{i:07d}@example.com", password_hash, f"{prefix} 社員{i:07d}",
+         'manager' if rng.random() < 0.05 else 'employee')
+        for i in range(1, count + 1)
+    ]
+    db.execute_many("INSERT INTO employees (email, password, name, role) VALUES (%s, %s, %s, %s)", rows)
+    return [row['id'] for row in db.execute_query(
+        "SELECT id FROM employees WHERE email LIKE %s ORDER BY id", (f"{prefix}%",)
+    )]
+
+
+def create_projects(db, count, prefix):
+    """
+    プロジェクトを作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        count: 作成するプロジェクト数
+        prefix: プロジェクト名の接頭辞
+
+    Returns:
+        list: 作成したプロジェクトIDのリスト
+    """
+    db.execute_many(
+        "INSERT INTO projects (name) VALUES (%s)",
+        [(f"{prefix} プロジェクト{i:05d}",) for i in range(1, count + 1)]
+    )
+    return [row['id'] for row in db.execute_query(
+        "SELECT id FROM projects WHERE name LIKE %s ORDER BY id", (f"{prefix}%",)
+    )]
+
+
+def load_attendance(db, rows, batch_size=DEFAULT_LOAD_BATCH_SIZE):
+    """
+    生成した勤怠記録とプロジェクト作業時間をbatch_size件ごとに投入する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        rows: generate_attendanceが返すイテレータ
+        batch_size: 1回のINSERTで投入する勤怠記録の件数
+
+    Returns:
+        tuple: (勤怠記録の件数, プロジェクト作業時間の件数)
+    """
+    record_query = (
+        f"INSERT INTO attendance_records ({', '.join(RECORD_COLUMNS)}) "
+        f"VALUES ({', '.join(['%s'] * len(RECORD_COLUMNS))})"
+    )
+    hours_query = "INSERT INTO project_hours (attendance_record_id, project_id, hours) VALUES (%s, %s, %s)"
+
+    record_count = hours_count = 0
+    records, hours = [], []
+    for record, record_hours in rows:
+        records.append(record)
+        hours.extend(record_hours)
+        if len(records) >= batch_size:
+            record_count += db.execute_many(record_query, records)
+            hours_count += db.execute_many(hours_query, hours)
+            db.commit()
+            records, hours = [], []
+    if records:
+        record_count += db.execute_many(record_query, records)
+        hours_count += db.execute_many(hours_query, hours)
+        db.commit()
+    return record_count, hours_count
+
+
+def generate(db, employees, projects, years, seed, type_weights=None, prefix=DEFAULT_PREFIX,
+             batch_size=DEFAULT_LOAD_BATCH_SIZE, today=None):
+    """
+    社員・プロジェクト・勤怠記録・プロジェクト作業時間を生成して投入する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        employees: 社員数
+        projects: プロジェクト数
+        years: 今日から遡る年数
+        seed: 乱数のシード
+        type_weights: 出勤区分と比率（省略時はDEFAULT_TYPE_WEIGHTS）
+        prefix: メールアドレス・プロジェクト名の接頭辞
+        batch_size: 1回のINSERTで投入する勤怠記録の件数
+        today: 期間の最終日（省略時は今日）
+
+    Returns:
+        dict: 生成した件数
+    """
+    rng = random.Random(seed)
+    last_day = today or date.today()
+    first_day = date(last_day.year - years, last_day.month, 1)
+
+    employee_ids = create_employees(db, rng, employees, prefix)
+    project_ids = create_projects(db, projects, prefix)
+    reference_cache.bump(db, 'employees')
+    reference_cache.bump(db, 'projects')
+    db.commit()
+
+    partitions.ensure_past_partitions(db, first_day)
+    next_id = db.execute_query("SELECT COALESCE(MAX(id), 0) + 1 AS next_id FROM attendance_records")[0]['next_id']
+    rows = generate_attendance(rng, employee_ids, project_ids, first_day, last_day,
+                               type_weights or DEFAULT_TYPE_WEIGHTS, next_id)
+    record_count, hours_count = load_attendance(db, rows, batch_size)
+
+    monthly_summary.rebuild_all(db)
+    db.commit()
+    return {
+        'employees': len(employee_ids),
+        'projects': len(project_ids),
+        'attendance_records': record_count,
+        'project_hours': hours_count,
+    }
+
+
+def main(argv=None):
+    """
+    コマンドラインからベンチマーク用のデータを生成するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='ベンチマーク用の勤怠データを生成します。')
+    parser.add_argument('--employees', type=int, default=100, help='社員数')
+    parser.add_argument('--projects', type=int, default=20, help='プロジェクト数')
+    parser.add_argument('--years', type=int, default=1, help='今日から遡る年数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード')
+    parser.add_argument('--type-mix', type=parse_type_mix, help='出勤区分の比率（例: 出勤=85,遅刻=3,一日休=12）')
+    parser.add_argument('--prefix', default=DEFAULT_PREFIX, help='メールアドレス・プロジェクト名の接頭辞')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_LOAD_BATCH_SIZE,
+                        help='1回のINSERTで投入する勤怠記録の件数')
+    parser.add_argument('--replace', action='store_true', help='以前に生成したデータを削除してから生成する')
+    args = parser.parse_args(argv)
+
+    db = DBAccess()
+    try:
+        if args.replace:
+            delete_generated(db, args.prefix)
+        elif db.execute_query("SELECT 1 AS found FROM employees WHERE email LIKE %s LIMIT 1", (f"{args.prefix}%",)):
+            print(f"エラー: 接頭辞「{args.prefix}」のデータは生成済みです（--replace で再生成できます）", file=sys.stderr)
+            return 1
+
+        started = time.perf_counter()
+        counts = generate(db, args.employees, args.projects, args.years, args.seed,
+                          args.type_mix, args.prefix, args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(", ".join(f"{name}: {count}件" for name, count in counts.items()) + f" ({elapsed:.1f}秒)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,131 +1,231 @@
 """
 データベース初期化スクリプト
 
-データベースのテーブルを作成し、初期データを投入します。
+applications/migrations配下の番号付きマイグレーションを適用し、
+データベースのテーブル作成と初期データの投入を行います。
+適用済みのバージョンはschema_versionテーブルに記録します。
+
+デプロイ時に1回だけ実行します:
+    python -m applications.db_init            # 最新まで適用
+    python -m applications.db_init --check    # 最新かどうかを確認（最新でなければ終了コード1）
+    python -m applications.db_init --target 1 # 指定バージョンまで適用
 """
 
 from applications.DBAccess import DBAccess
-import hashlib
-from datetime import datetime
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+import sys
 
+import pymysql
 
-def init_database():
+from applications import migrations
+
+# マイグレーションのファイル名（0001_initial_schema.py など）
+MIGRATION_NAME_PATTERN = re.compile(r'^(\d{4})_(\w+)$')
+
+# 複数のプロセスが同時にマイグレーションしないためのロック名とタイムアウト（秒）
+MIGRATION_LOCK_NAME = 'work_report_schema_migration'
+MIGRATION_LOCK_TIMEOUT = 60
+
+# MySQLのエラーコード: テーブルが存在しない
+ER_NO_SUCH_TABLE = 1146
+
+_migrations = None
+
+
+def get_migrations():
     """
-    データベースを初期化するメソッド
-    
-    必要なテーブルを作成し、初期データを投入します。
+    マイグレーションの一覧を取得するメソッド
+
+    Returns:
+        list: (バージョン, 名前, モジュール名) のバージョン昇順のリスト
+    """
+    global _migrations
+    if _migrations is None:
+        found = []
+        for module_info in pkgutil.iter_modules(migrations.__path__):
+            match = MIGRATION_NAME_PATTERN.match(module_info.name)
+            if match:
+                found.append((int(match.group(1)), match.group(2),
+                              f'{migrations.__name__}.{module_info.name}'))
+        found.sort()
+        _migrations = found
+    return _migrations
+
+
+def head_version():
+    """
+    最新のマイグレーションのバージョンを取得するメソッド
+
+    Returns:
+        int: 最新のバージョン（マイグレーションがなければ0）
     """
+    all_migrations = get_migrations()
+    return all_migrations[-1][0] if all_migrations else 0
+
+
+def current_version(db):
+    """
+    データベースに適用済みのバージョンを取得するメソッド
+
+    schema_versionテーブルへの1回のクエリで確認します。
+
+    Args:
+        db: DBAccessのインスタンス
+
+    Returns:
+        int: 適用済みのバージョン（未適用なら0）
+    """
+    try:
+        rows = db.execute_query("SELECT MAX(version) AS version FROM schema_version")
+    except pymysql.err.ProgrammingError as e:
+        if e.args[0] == ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    return (rows[0]['version'] or 0) if rows else 0
+
+
+def is_up_to_date(db=None):
+    """
+    データベースが最新のバージョンかどうかを確認するメソッド
+
+    Args:
+        db: DBAccessのインスタンス（省略時は新たに接続を借りる）
+
+    Returns:
+        bool: 最新であればTrue
+    """
+    if db is not None:
+        return current_version(db) >= head_version()
     db = DBAccess()
-    
     try:
-        # 社員テーブルの作成
-        db.execute_query("""
-            CREATE TABLE IF NOT EXISTS employees (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                password VARCHAR(255) NOT NULL,
-                name VARCHAR(100) NOT NULL,
-                role ENUM('employee', 'manager') DEFAULT 'employee',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # プロジェクトテーブルの作成
-        db.execute_query("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # 勤怠記録テーブルの作成
-        db.execute_query("""
-            CREATE TABLE IF NOT EXISTS attendance_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                employee_id INT NOT NULL,
-                date DATE NOT NULL,
-                attendance_type ENUM('出勤', '遅刻', '早退', '午前休', '午後休', '一日休') DEFAULT '出勤',
-                start_time TIME,
-                end_time TIME,
-                break_time TIME DEFAULT '01:00:00',
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE,
-                UNIQUE KEY unique_employee_date (employee_id, date)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        # プロジェクト作業時間テーブルの作成
-        db.execute_query("""
-            CREATE TABLE IF NOT EXISTS project_hours (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                attendance_record_id INT NOT NULL,
-                project_id INT NOT NULL,
-                hours DECIMAL(4,2) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (attendance_record_id) REFERENCES attendance_records(id) ON DELETE CASCADE,
-                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-        """)
-        
-        db.commit()
-        
-        # 初期データの投入（既に存在する場合はスキップ）
-        # テスト用の課長アカウント
-        existing_manager = db.execute_query(
-            "SELECT id FROM employees WHERE email = %s",
-            ('manager@example.com',)
-        )
-        
-        if not existing_manager:
-            # パスワードをハッシュ化（簡易的な実装）
-            password_hash = hashlib.sha256('password123'.encode()).hexdigest()
-            db.execute_query("""
-                INSERT INTO employees (email, password, name, role)
-                VALUES (%s, %s, %s, %s)
-            """, ('manager@example.com', password_hash, '課長 太郎', 'manager'))
-        
-        # テスト用の社員アカウント
-        existing_employee = db.execute_query(
-            "SELECT id FROM employees WHERE email = %s",
-            ('employee@example.com',)
-        )
-        
-        if not existing_employee:
-            password_hash = hashlib.sha256('password123'.encode()).hexdigest()
-            db.execute_query("""
-                INSERT INTO employees (email, password, name, role)
-                VALUES (%s, %s, %s, %s)
-            """, ('employee@example.com', password_hash, '社員 花子', 'employee'))
-        
-        # テスト用のプロジェクト
-        existing_project = db.execute_query(
-            "SELECT id FROM projects WHERE name = %s",
-            ('プロジェクトA',)
+        return current_version(db) >= head_version()
+    finally:
+        db.close_connection()
+
+
+def migrate(target=None):
+    """
+    マイグレーションを適用するメソッド
+
+    schema_versionテーブルを確認し、未適用のマイグレーションをバージョン順に適用します。
+    既に最新の場合はschema_versionへの1回のクエリだけで終了します。
+
+    Args:
+        target: 適用する最大のバージョン（省略時は最新）
+
+    Returns:
+        list: 適用したバージョンのリスト
+    """
+    target = head_version() if target is None else target
+    db = DBAccess()
+    try:
+        if current_version(db) >= target:
+            return []
+
+        locked = db.execute_query(
+            "SELECT GET_LOCK(%s, %s) AS locked", (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT)
         )
-        
-        if not existing_project:
+        if not locked or locked[0]['locked'] != 1:
+            raise RuntimeError('マイグレーションのロックを取得できませんでした')
+        try:
             db.execute_query("""
-                INSERT INTO projects (name)
-                VALUES (%s)
-            """, ('プロジェクトA',))
-        
-        db.commit()
-        print("データベースの初期化が完了しました。")
-        
-    except Exception as e:
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INT PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
+            db.commit()
+
+            # ロック待ちの間に他のプロセスが適用した分は飛ばす
+            version = current_version(db)
+            applied = []
+            for migration_version, name, module_name in get_migrations():
+                if migration_version <= version or migration_version > target:
+                    continue
+                module = importlib.import_module(module_name)
+                module.upgrade(db)
+                db.execute_query(
+                    "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                    (migration_version, name)
+                )
+                db.commit()
+                print(f"マイグレーションを適用しました: {migration_version:04d}_{name}")
+                applied.append(migration_version)
+            return applied
+        finally:
+            db.execute_query("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+    except Exception:
         db.rollback()
-        print(f"データベース初期化エラー: {str(e)}")
         raise
     finally:
         db.close_connection()
 
 
-if __name__ == "__main__":
-    init_database()
+def init_database():
+    """
+    データベースを初期化するメソッド
 
+    必要なテーブルを作成し、初期データを投入します。
+    """
+    try:
+        migrate()
+        print("データベースの初期化が完了しました。")
+    except Exception as e:
+        print(f"データベース初期化エラー: {str(e)}")
+        raise
+
+
+def ensure_database():
+    """
+    起動時にデータベースのバージョンを確認するメソッド
+
+    最新であればschema_versionへの1回のクエリだけで終了します。
+    最新でない場合、環境変数AUTO_MIGRATEが有効（既定）であればマイグレーションを適用し、
+    無効であれば警告を表示します。本番環境ではAUTO_MIGRATE=0とし、
+    デプロイ時に python -m applications.db_init を1回だけ実行します。
+    """
+    if is_up_to_date():
+        return
+    if os.getenv('AUTO_MIGRATE', '1') == '1':
+        init_database()
+    else:
+        print("データベースが最新のバージョンではありません。python -m applications.db_init を実行してください。")
+
+
+def main(argv=None):
+    """
+    コマンドラインからマイグレーションを実行するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='データベースのマイグレーションを実行します。')
+    parser.add_argument('--check', action='store_true', help='最新のバージョンかどうかだけを確認する')
+    parser.add_argument('--target', type=int, help='適用する最大のバージョン')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        db = DBAccess()
+        try:
+            version = current_version(db)
+        finally:
+            db.close_connection()
+        print(f"現在のバージョン: {version} / 最新のバージョン: {head_version()}")
+        return 0 if version >= head_version() else 1
+
+    applied = migrate(args.target)
+    if not applied:
+        print("データベースは最新のバージョンです。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
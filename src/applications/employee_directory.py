@@ -0,0 +1,90 @@
+"""
+社員一覧のページ分割と検索
+
+社員一覧を (name, id) の順にキーセット方式でページ分割し、名前・メールアドレスの前方一致で検索します。
+名前の順のシークには idx_name（InnoDBのセカンダリインデックスは主キーのidを含むため (name, id) の順）を使い、
+メールアドレスの検索にはUNIQUEインデックスを使います。
+検索とカーソルを指定しない最初のページは、参照データのキャッシュ（reference_cache）から返します。
+"""
+
+from applications import pagination
+from applications.pagination import Page
+from applications.reference_cache import reference_cache
+
+# ソートキー（名前が同じ社員はidの順）
+SORT_COLUMNS = ('name', 'id')
+# カーソルのソートキーの値の型
+SORT_TYPES = (str, int)
+
+SELECT_COLUMNS = "SELECT id, email, name, role, created_at FROM employees"
+
+
+def escape_like(value):
+    """
+    LIKEの前方一致の検索語をエスケープする関数
+
+    Args:
+        value: 検索語
+
+    Returns:
+        str: %・_・\\ をエスケープし、末尾に%を付けたパターン
+    """
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}%"
+
+
+def fetch_page(db, search='', size=None, after=None, before=None):
+    """
+    社員一覧の1ページを取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        search: 名前・メールアドレスの前方一致の検索語（空の場合は全員）
+        size: ページサイズ（省略時はpagination.DEFAULT_PAGE_SIZE）
+        after: 次のページのカーソル
+        before: 前のページのカーソル（afterより優先）
+
+    Returns:
+        Page: 社員の行のページ
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    size = pagination.DEFAULT_PAGE_SIZE if size is None else size
+    cursor = before or after
+    backward = bool(before)
+    values = pagination.decode_cursor(cursor, len(SORT_COLUMNS), SORT_TYPES) if cursor else None
+
+    if not search and values is None and size == pagination.DEFAULT_PAGE_SIZE:
+        rows = reference_cache.get(db, 'employees')
+    else:
+        query, params = _page_query(search, size, values, backward)
+        rows = db.execute_query(query, params, compact=True)
+    return Page.from_rows(rows, size, SORT_COLUMNS, backward=backward, has_cursor=values is not None)
+
+
+def _page_query(search, size, values, backward):
+    """
+    1ページ分（size+1件）を読むクエリを作成する関数
+
+    名前とメールアドレスのORでは片方のインデックスしか使えないため、
+    検索する場合はそれぞれのインデックスで読んだ結果をUNIONで合わせます。
+    """
+    order = pagination.order_by(SORT_COLUMNS, descending=backward)
+    seek, seek_params = ('', [])
+    if values is not None:
+        seek, seek_params = pagination.seek_condition(SORT_COLUMNS, values, descending=backward)
+
+    if not search:
+        where = f" WHERE {seek}" if seek else ''
+        return f"{SELECT_COLUMNS}{where} ORDER BY {order} LIMIT %s", (*seek_params, size + 1)
+
+    pattern = escape_like(search)
+    branches = []
+    params = []
+    for column in ('name', 'email'):
+        condition = f"{column} LIKE %s" + (f" AND {seek}" if seek else '')
+        branches.append(f"({SELECT_COLUMNS} WHERE {condition} ORDER BY {order} LIMIT %s)")
+        params += [pattern, *seek_params, size + 1]
+    query = f"{' UNION '.join(branches)} ORDER BY {order} LIMIT %s"
+    return query, (*params, size + 1)
@@ -0,0 +1,69 @@
+"""
+初期スキーマ
+
+社員・プロジェクト・勤怠記録・プロジェクト作業時間の各テーブルを作成します。
+既存環境に適用しても安全なよう、テーブルが存在する場合は何もしません。
+"""
+
+
+def upgrade(db):
+    """
+    初期スキーマを作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # 社員テーブルの作成
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS employees (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            role ENUM('employee', 'manager') DEFAULT 'employee',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # プロジェクトテーブルの作成
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # 勤怠記録テーブルの作成
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS attendance_records (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            employee_id INT NOT NULL,
+            date DATE NOT NULL,
+            attendance_type ENUM('出勤', '遅刻', '早退', '午前休', '午後休', '一日休') DEFAULT '出勤',
+            start_time TIME,
+            end_time TIME,
+            break_time TIME DEFAULT '01:00:00',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_employee_date (employee_id, date)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # プロジェクト作業時間テーブルの作成
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS project_hours (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            attendance_record_id INT NOT NULL,
+            project_id INT NOT NULL,
+            hours DECIMAL(4,2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (attendance_record_id) REFERENCES attendance_records(id) ON DELETE CASCADE,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
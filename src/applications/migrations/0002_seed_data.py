@@ -0,0 +1,59 @@
+"""
+初期データ
+
+テスト用の課長アカウント・社員アカウントとプロジェクトを投入します。
+既に存在するデータは投入しません。
+"""
+
+import hashlib
+
+# 初期データ（メールアドレス, 名前, 権限）
+SEED_EMPLOYEES = [
+    ('manager@example.com', '課長 太郎', 'manager'),
+    ('employee@example.com', '社員 花子', 'employee'),
+]
+
+# 初期データ（プロジェクト名）
+SEED_PROJECTS = [
+    'プロジェクトA',
+]
+
+
+def upgrade(db):
+    """
+    初期データを投入する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # テスト用の課長アカウント・社員アカウント
+    placeholders = ', '.join(['%s'] * len(SEED_EMPLOYEES))
+    existing_emails = {
+        row['email'] for row in db.execute_query(
+            f"SELECT email FROM employees WHERE email IN ({placeholders})",
+            tuple(employee[0] for employee in SEED_EMPLOYEES)
+        )
+    }
+    # パスワードをハッシュ化（簡易的な実装）
+    password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+    db.execute_many("""
+        INSERT INTO employees (email, password, name, role)
+        VALUES (%s, %s, %s, %s)
+    """, [
+        (email, password_hash, name, role)
+        for email, name, role in SEED_EMPLOYEES
+        if email not in existing_emails
+    ])
+
+    # テスト用のプロジェクト
+    placeholders = ', '.join(['%s'] * len(SEED_PROJECTS))
+    existing_projects = {
+        row['name'] for row in db.execute_query(
+            f"SELECT name FROM projects WHERE name IN ({placeholders})",
+            tuple(SEED_PROJECTS)
+        )
+    }
+    db.execute_many("""
+        INSERT INTO projects (name)
+        VALUES (%s)
+    """, [(name,) for name in SEED_PROJECTS if name not in existing_projects])
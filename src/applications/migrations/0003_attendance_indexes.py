@@ -0,0 +1,34 @@
+"""
+勤怠記録の検索用インデックス
+
+app.pyの頻出クエリのアクセスパスに合わせてインデックスを追加します。
+
+- dashboard: employee_id = ? AND date >= ? ORDER BY date DESC LIMIT 10
+- attendance_view: date = ? AND (employee_id = ? OR 課長)
+- monthly_report: 社員ごとの期間指定のLEFT JOINと勤務時間の集計
+- attendance_view / attendance_input: 勤怠記録ごとのプロジェクト作業時間
+"""
+
+from applications.migrations import create_index
+
+
+def upgrade(db):
+    """
+    インデックスを追加する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # dashboardと月次集計のカバリングインデックス（テーブル本体を読まずに済む）
+    create_index(db, 'attendance_records', 'idx_employee_date_times',
+                 ['employee_id', 'date', 'attendance_type', 'start_time', 'end_time', 'break_time'])
+
+    # 日付指定での勤怠記録の参照
+    create_index(db, 'attendance_records', 'idx_date_employee', ['date', 'employee_id'])
+
+    # 勤怠記録ごとのプロジェクト作業時間（外部キーのインデックスも兼ねる）
+    create_index(db, 'project_hours', 'idx_record_project_hours',
+                 ['attendance_record_id', 'project_id', 'hours'])
+
+    # 社員一覧・月次レポートの名前順の並び替え
+    create_index(db, 'employees', 'idx_name', ['name'])
@@ -0,0 +1,48 @@
+"""
+月次集計テーブル
+
+社員ごと・年月ごとの出勤日数、勤務秒数、休憩秒数を保持するテーブルを作成し、
+既存の勤怠記録から集計値を投入します。
+"""
+
+
+def upgrade(db):
+    """
+    月次集計テーブルを作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS employee_monthly_summary (
+            employee_id INT NOT NULL,
+            year SMALLINT NOT NULL,
+            month TINYINT NOT NULL,
+            attendance_days INT NOT NULL DEFAULT 0,
+            total_seconds INT NOT NULL DEFAULT 0,
+            break_seconds INT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            PRIMARY KEY (employee_id, year, month),
+            KEY idx_year_month (year, month, employee_id),
+            FOREIGN KEY (employee_id) REFERENCES employees(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # 既存の勤怠記録から集計値を投入
+    db.execute_query("""
+        INSERT INTO employee_monthly_summary
+            (employee_id, year, month, attendance_days, total_seconds, break_seconds)
+        SELECT
+            employee_id,
+            YEAR(date),
+            MONTH(date),
+            COUNT(*),
+            COALESCE(SUM(TIME_TO_SEC(TIMEDIFF(end_time, start_time))), 0),
+            COALESCE(SUM(TIME_TO_SEC(break_time)), 0)
+        FROM attendance_records
+        GROUP BY employee_id, YEAR(date), MONTH(date)
+        ON DUPLICATE KEY UPDATE
+            attendance_days = VALUES(attendance_days),
+            total_seconds = VALUES(total_seconds),
+            break_seconds = VALUES(break_seconds)
+    """)
@@ -0,0 +1,62 @@
+"""
+勤怠記録の時刻を整数（分）で保持する列
+
+0時からの経過分を保持するstart_minute, end_minute, break_minutesと、
+勤務時間（退勤 - 出勤）を保持する生成列work_minutes（STORED）を追加します。
+既存の行は主キーの範囲ごとに小さなトランザクションで埋めるため、
+埋めている間もテーブルへの書き込みを長時間止めません。
+"""
+
+from applications.migrations import column_exists, create_index, drop_index
+
+# 既存行を埋める際の1トランザクションあたりの主キーの範囲
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade(db):
+    """
+    整数（分）の列を追加し、既存の行を埋める関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    if not column_exists(db, 'attendance_records', 'start_minute'):
+        db.execute_query("""
+            ALTER TABLE attendance_records
+                ADD COLUMN start_minute SMALLINT NULL AFTER break_time,
+                ADD COLUMN end_minute SMALLINT NULL AFTER start_minute,
+                ADD COLUMN break_minutes SMALLINT NULL AFTER end_minute,
+                ADD COLUMN work_minutes SMALLINT AS (end_minute - start_minute) STORED AFTER break_minutes
+        """)
+
+    backfill(db)
+
+    # dashboardと月次集計のカバリングインデックスを整数（分）の列に置き換える
+    create_index(db, 'attendance_records', 'idx_employee_date_minutes',
+                 ['employee_id', 'date', 'attendance_type',
+                  'start_minute', 'end_minute', 'break_minutes', 'work_minutes'])
+    drop_index(db, 'attendance_records', 'idx_employee_date_times')
+
+
+def backfill(db):
+    """
+    既存の行の整数（分）の列を、主キーの範囲ごとに埋める関数
+
+    更新日時（updated_at）は変更しません。
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    rows = db.execute_query("SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM attendance_records")
+    if not rows or rows[0]['min_id'] is None:
+        return
+    for start_id in range(rows[0]['min_id'], rows[0]['max_id'] + 1, BACKFILL_BATCH_SIZE):
+        db.execute_query("""
+            UPDATE attendance_records
+            SET start_minute = TIME_TO_SEC(start_time) DIV 60,
+                end_minute = TIME_TO_SEC(end_time) DIV 60,
+                break_minutes = TIME_TO_SEC(break_time) DIV 60,
+                updated_at = updated_at
+            WHERE id >= %s AND id < %s AND start_minute IS NULL AND end_minute IS NULL AND break_minutes IS NULL
+        """, (start_id, start_id + BACKFILL_BATCH_SIZE))
+        db.commit()
@@ -0,0 +1,80 @@
+"""
+勤怠記録テーブルの月単位のパーティション分割
+
+attendance_recordsを日付（date）でRANGE COLUMNSパーティションに分割し、
+月で絞り込むクエリ（ダッシュボード・勤怠記録詳細・月次集計の再計算）が
+該当する月のパーティションだけを読むようにします。
+
+MySQLではパーティション分割したテーブルに外部キーを張れず、
+一意キーにはパーティションキーを含める必要があるため、
+attendance_records・project_hoursの勤怠記録に関する外部キーを削除し、主キーを (id, date) に変更します。
+社員削除時の勤怠記録・プロジェクト作業時間の削除はアプリケーション側で行います。
+以後のパーティションの追加・削除は applications.partitions で行います。
+"""
+
+from datetime import date
+
+# 分割時に作成しておく先の月数
+MONTHS_AHEAD = 3
+
+
+def upgrade(db):
+    """
+    勤怠記録テーブルを月単位のパーティションに分割する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    rows = db.execute_query("""
+        SELECT 1 AS found
+        FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = 'attendance_records' AND partition_name IS NOT NULL
+        LIMIT 1
+    """)
+    if rows:
+        return
+
+    foreign_keys = db.execute_query("""
+        SELECT table_name AS table_name, constraint_name AS constraint_name
+        FROM information_schema.referential_constraints
+        WHERE constraint_schema = DATABASE()
+          AND (table_name = 'attendance_records' OR referenced_table_name = 'attendance_records')
+    """)
+    for foreign_key in foreign_keys:
+        db.execute_query(
+            f"ALTER TABLE {foreign_key['table_name']} DROP FOREIGN KEY {foreign_key['constraint_name']}"
+        )
+
+    db.execute_query("ALTER TABLE attendance_records DROP PRIMARY KEY, ADD PRIMARY KEY (id, date)")
+
+    rows = db.execute_query("SELECT MIN(date) AS min_date FROM attendance_records")
+    today = date.today()
+    first_month = rows[0]['min_date'] if rows and rows[0]['min_date'] else today
+    month = date(first_month.year, first_month.month, 1)
+    last_month = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+
+    clauses = []
+    while month <= last_month:
+        upper = _add_months(month, 1)
+        clauses.append(f"PARTITION p{month.year:04d}{month.month:02d} VALUES LESS THAN ('{upper.isoformat()}')")
+        month = upper
+    clauses.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+
+    db.execute_query(
+        "ALTER TABLE attendance_records PARTITION BY RANGE COLUMNS(date) (" + ", ".join(clauses) + ")"
+    )
+
+
+def _add_months(day, months):
+    """
+    月初の日付に月数を加算する関数
+
+    Args:
+        day: 月初の日付
+        months: 加算する月数
+
+    Returns:
+        date: 加算後の月の初日
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
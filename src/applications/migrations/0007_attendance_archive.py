@@ -0,0 +1,61 @@
+"""
+締め済み年度の勤怠記録のアーカイブテーブル
+
+勤怠記録・プロジェクト作業時間を締め済みの年度ごとに移動するアーカイブテーブルと、
+アーカイブ済みの年度を記録するテーブルを作成します。
+アーカイブテーブルは参照専用のため、圧縮行形式（ROW_FORMAT=COMPRESSED）で作成します。
+"""
+
+
+def upgrade(db):
+    """
+    アーカイブテーブルを作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # 勤怠記録のアーカイブテーブル（生成列・自動更新の日時は移動元の値をそのまま保持する）
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS attendance_records_archive (
+            id INT NOT NULL PRIMARY KEY,
+            employee_id INT NOT NULL,
+            date DATE NOT NULL,
+            attendance_type ENUM('出勤', '遅刻', '早退', '午前休', '午後休', '一日休') DEFAULT '出勤',
+            start_time TIME,
+            end_time TIME,
+            break_time TIME,
+            start_minute SMALLINT NULL,
+            end_minute SMALLINT NULL,
+            break_minutes SMALLINT NULL,
+            work_minutes SMALLINT NULL,
+            notes TEXT,
+            created_at TIMESTAMP NULL,
+            updated_at TIMESTAMP NULL,
+            UNIQUE KEY unique_employee_date (employee_id, date),
+            KEY idx_date_employee (date, employee_id)
+        ) ENGINE=InnoDB ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+          DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # プロジェクト作業時間のアーカイブテーブル
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS project_hours_archive (
+            id INT NOT NULL PRIMARY KEY,
+            attendance_record_id INT NOT NULL,
+            project_id INT NOT NULL,
+            hours DECIMAL(4,2) NOT NULL,
+            created_at TIMESTAMP NULL,
+            updated_at TIMESTAMP NULL,
+            KEY idx_record_project_hours (attendance_record_id, project_id, hours)
+        ) ENGINE=InnoDB ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+          DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+    # アーカイブ済みの年度
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS archived_fiscal_years (
+            fiscal_year SMALLINT NOT NULL PRIMARY KEY,
+            record_count INT NOT NULL DEFAULT 0,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
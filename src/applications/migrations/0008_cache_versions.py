@@ -0,0 +1,26 @@
+"""
+参照データのキャッシュのバージョン
+
+プロセス内にキャッシュした参照データ（プロジェクト一覧・社員一覧）を、
+複数のワーカープロセスで無効化するためのバージョンを保持するテーブルを作成します。
+"""
+
+
+def upgrade(db):
+    """
+    キャッシュのバージョンのテーブルを作成する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            name VARCHAR(64) NOT NULL PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    db.execute_many(
+        "INSERT IGNORE INTO cache_versions (name, version) VALUES (%s, %s)",
+        [('projects', 0), ('employees', 0)]
+    )
@@ -0,0 +1,24 @@
+"""
+条件付きGETの検証用インデックス
+
+ETag・Last-Modifiedの計算で使う MAX(updated_at) を、テーブルを読まずに
+インデックスの端の1件だけで求められるようにします。
+
+- monthly_report: 社員全体の更新日時、年月ごとの月次集計の更新日時
+"""
+
+from applications.migrations import create_index
+
+
+def upgrade(db):
+    """
+    インデックスを追加する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # 社員の最終更新日時
+    create_index(db, 'employees', 'idx_updated_at', ['updated_at'])
+
+    # 年月ごとの月次集計の最終更新日時
+    create_index(db, 'employee_monthly_summary', 'idx_year_month_updated', ['year', 'month', 'updated_at'])
@@ -0,0 +1,24 @@
+"""
+プロジェクト作業時間の集計用インデックス
+
+プロジェクト別レポートの集計（プロジェクトごと・月ごと、プロジェクトごと・社員ごとの作業時間の合計）で、
+プロジェクト作業時間をプロジェクトの順に読み、勤怠記録の主キー (id, date) で日付を絞り込めるようにします。
+hoursまで含めたカバリングインデックスのため、プロジェクト作業時間のテーブル本体は読みません。
+
+- project_report: project_id = ? (省略可) の作業時間を勤怠記録の日付の期間で集計
+"""
+
+from applications.migrations import create_index
+
+
+def upgrade(db):
+    """
+    インデックスを追加する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    # プロジェクトごとの作業時間（通常のテーブルとアーカイブテーブル）
+    create_index(db, 'project_hours', 'idx_project_record_hours', ['project_id', 'attendance_record_id', 'hours'])
+    create_index(db, 'project_hours_archive', 'idx_project_record_hours',
+                 ['project_id', 'attendance_record_id', 'hours'])
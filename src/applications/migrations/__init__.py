@@ -0,0 +1,82 @@
+"""
+データベースマイグレーション
+
+ファイル名の先頭4桁の番号（0001_xxx.py）の順に適用されます。
+各モジュールはupgrade(db)関数を持ち、引数のDBAccessを使ってスキーマを変更します。
+"""
+
+
+def index_exists(db, table, index_name):
+    """
+    インデックスが存在するかを確認する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        table: テーブル名
+        index_name: インデックス名
+
+    Returns:
+        bool: 存在すればTrue
+    """
+    rows = db.execute_query("""
+        SELECT 1 AS found
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index_name))
+    return bool(rows)
+
+
+def create_index(db, table, index_name, columns):
+    """
+    インデックスが存在しない場合だけ作成する関数
+
+    MySQL 8.0にはCREATE INDEX IF NOT EXISTSがないため、information_schemaで確認します。
+    オンラインDDL（ALGORITHM=INPLACE, LOCK=NONE）で作成し、作成中も読み書きを止めません。
+
+    Args:
+        db: DBAccessのインスタンス
+        table: テーブル名
+        index_name: インデックス名
+        columns: 列名のリスト
+    """
+    if index_exists(db, table, index_name):
+        return
+    db.execute_query(
+        f"ALTER TABLE {table} ADD INDEX {index_name} ({', '.join(columns)}), ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+
+def drop_index(db, table, index_name):
+    """
+    インデックスが存在する場合だけ削除する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        table: テーブル名
+        index_name: インデックス名
+    """
+    if not index_exists(db, table, index_name):
+        return
+    db.execute_query(f"ALTER TABLE {table} DROP INDEX {index_name}, ALGORITHM=INPLACE, LOCK=NONE")
+
+
+def column_exists(db, table, column_name):
+    """
+    列が存在するかを確認する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        table: テーブル名
+        column_name: 列名
+
+    Returns:
+        bool: 存在すればTrue
+    """
+    rows = db.execute_query("""
+        SELECT 1 AS found
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+    """, (table, column_name))
+    return bool(rows)
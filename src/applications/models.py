@@ -0,0 +1,154 @@
+"""
+勤怠記録のモデル
+
+クエリ結果の行から、画面表示用の勤怠記録オブジェクトを生成します。
+"""
+
+from applications.time_format import format_minutes, format_time
+from operator import itemgetter
+
+# AttendanceRecordが保持するクエリ結果の列（__init__の引数の順）
+FIELDS = (
+    'id', 'employee_id', 'date', 'attendance_type', 'notes', 'employee_name',
+    'start_minute', 'end_minute', 'break_minutes', 'work_minutes',
+    'start_time', 'end_time', 'break_time',
+)
+
+# 表示用の時刻をまだ計算していないことを表す値
+_UNSET = object()
+
+# 行にない列の値として末尾に補う値
+_PADDING = (None,)
+
+# 0時からの経過分ごとのHH:MM形式の文字列（1日分を事前に作成しておく）
+_HHMM = tuple(format_minutes(minutes) for minutes in range(24 * 60))
+
+
+def _format(minutes, raw):
+    """
+    時刻をHH:MM形式の文字列に変換する関数
+
+    整数（分）の列があればそれを使い、なければTIME型の列を変換します。
+
+    Args:
+        minutes: 整数（分）の列の値
+        raw: TIME型の列の値
+
+    Returns:
+        str: HH:MM形式の文字列（値がない場合はNone）
+    """
+    if minutes is not None:
+        return _HHMM[minutes] if 0 <= minutes < len(_HHMM) else format_minutes(minutes)
+    return None if raw is None else format_time(raw)
+
+
+class AttendanceRecord:
+    """
+    AttendanceRecordクラスは、画面表示用の勤怠記録を表すクラスです。
+    __slots__によりインスタンス辞書を持たず、行のコピーを作りません。
+    start_time・end_time・break_timeはテンプレートで参照されたときに初めてHH:MM形式に変換します。
+    """
+
+    __slots__ = (
+        'id', 'employee_id', 'date', 'attendance_type', 'notes', 'employee_name',
+        'start_minute', 'end_minute', 'break_minutes', 'work_minutes',
+        '_start_time', '_end_time', '_break_time',
+        '_start_time_text', '_end_time_text', '_break_time_text',
+    )
+
+    def __init__(self, id=None, employee_id=None, date=None, attendance_type=None, notes=None,
+                 employee_name=None, start_minute=None, end_minute=None, break_minutes=None,
+                 work_minutes=None, start_time=None, end_time=None, break_time=None):
+        """
+        __init__メソッドは、クエリ結果の列の値で勤怠記録を初期化するメソッドです。
+        start_time・end_time・break_timeにはTIME型の列の値（timedeltaなど）を渡します。
+        """
+        self.id = id
+        self.employee_id = employee_id
+        self.date = date
+        self.attendance_type = attendance_type
+        self.notes = notes
+        self.employee_name = employee_name
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.break_minutes = break_minutes
+        self.work_minutes = work_minutes
+        self._start_time = start_time
+        self._end_time = end_time
+        self._break_time = break_time
+        self._start_time_text = self._end_time_text = self._break_time_text = _UNSET
+
+    @property
+    def start_time(self):
+        """
+        出勤時刻（HH:MM形式）。最初に参照されたときに一度だけ変換します。
+        """
+        if self._start_time_text is _UNSET:
+            self._start_time_text = _format(self.start_minute, self._start_time)
+        return self._start_time_text
+
+    @property
+    def end_time(self):
+        """
+        退勤時刻（HH:MM形式）。最初に参照されたときに一度だけ変換します。
+        """
+        if self._end_time_text is _UNSET:
+            self._end_time_text = _format(self.end_minute, self._end_time)
+        return self._end_time_text
+
+    @property
+    def break_time(self):
+        """
+        休憩時間（HH:MM形式）。最初に参照されたときに一度だけ変換します。
+        """
+        if self._break_time_text is _UNSET:
+            self._break_time_text = _format(self.break_minutes, self._break_time)
+        return self._break_time_text
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        from_rowメソッドは、クエリ結果の1行から勤怠記録を生成するメソッドです。
+        コンパクトな行（タプル）と辞書の行の両方に対応し、対応しない列は無視します。
+        """
+        if hasattr(row, '_fields'):
+            return cls.from_rows([row])[0]
+        return cls(**{column: row[column] for column in FIELDS if column in row})
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        from_rowsメソッドは、クエリ結果の行のリストから勤怠記録のリストを生成するメソッドです。
+        コンパクトな行の場合は、列の位置と引数の対応を最初の行で一度だけ求め、
+        タプルから直接生成します。
+        """
+        if not rows:
+            return []
+        if not hasattr(rows[0], '_fields'):
+            return [cls.from_row(row) for row in rows]
+
+        columns = rows[0]._fields
+        missing = len(columns)
+        arguments = itemgetter(*[columns.index(field) if field in columns else missing for field in FIELDS])
+        return [cls(*arguments(row + _PADDING)) for row in rows]
+
+    def __getitem__(self, key):
+        """
+        __getitem__メソッドは、record['id'] のような列名による値の取得を行うメソッドです。
+        """
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        """
+        getメソッドは、辞書のgetと同様に列名で値を取得するメソッドです。
+        """
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        """
+        __repr__メソッドは、勤怠記録の文字列表現を返すメソッドです。
+        """
+        return f"AttendanceRecord(id={self.id!r}, employee_id={self.employee_id!r}, date={self.date!r})"
@@ -0,0 +1,221 @@
+"""
+月次集計テーブルの管理
+
+社員ごと・年月ごとの出勤日数、勤務秒数、休憩秒数をemployee_monthly_summaryテーブルに保持します。
+勤怠記録の書き込み時に差分を反映し、月次レポートは集計テーブルの範囲読み込みだけで表示します。
+
+集計値がずれた場合は、勤怠記録から再計算できます:
+    python -m applications.monthly_summary --year 2024 --month 1   # 指定月を再計算
+    python -m applications.monthly_summary --all                   # 全期間を再計算
+"""
+
+from applications.DBAccess import DBAccess
+import argparse
+import sys
+from datetime import date
+
+# 勤怠記録1件分の集計値をsign倍して集計テーブルに加算するSQL
+APPLY_RECORD_QUERY = """
+    INSERT INTO employee_monthly_summary
+        (employee_id, year, month, attendance_days, total_seconds, break_seconds)
+    SELECT
+        employee_id,
+        YEAR(date),
+        MONTH(date),
+        %s,
+        %s * COALESCE(work_minutes, 0) * 60,
+        %s * COALESCE(break_minutes, 0) * 60
+    FROM attendance_records
+    WHERE id = %s
+    ON DUPLICATE KEY UPDATE
+        attendance_days = attendance_days + VALUES(attendance_days),
+        total_seconds = total_seconds + VALUES(total_seconds),
+        break_seconds = break_seconds + VALUES(break_seconds)
+"""
+
+# 勤怠記録（アーカイブを含む）から集計テーブルを再計算するSQL（WHERE句は呼び出し側で指定）
+REBUILD_QUERY = """
+    INSERT INTO employee_monthly_summary
+        (employee_id, year, month, attendance_days, total_seconds, break_seconds)
+    SELECT
+        employee_id,
+        YEAR(date),
+        MONTH(date),
+        COUNT(*),
+        COALESCE(SUM(work_minutes), 0) * 60,
+        COALESCE(SUM(break_minutes), 0) * 60
+    FROM (
+        SELECT employee_id, date, work_minutes, break_minutes
+        FROM attendance_records
+        {where}
+        UNION ALL
+        SELECT employee_id, date, work_minutes, break_minutes
+        FROM attendance_records_archive
+        {where}
+    ) AS records
+    GROUP BY employee_id, YEAR(date), MONTH(date)
+    ON DUPLICATE KEY UPDATE
+        attendance_days = VALUES(attendance_days),
+        total_seconds = VALUES(total_seconds),
+        break_seconds = VALUES(break_seconds)
+"""
+
+# 月次レポート（全社員の指定年月の集計）を読むSQL。画面とCSVの出力で同じ集計を使う
+REPORT_QUERY = """
+    SELECT
+        e.id as employee_id,
+        e.name as employee_name,
+        COALESCE(s.attendance_days, 0) as attendance_days,
+        s.total_seconds / 3600 as total_hours,
+        s.break_seconds / 3600 as total_break_hours
+    FROM employees e
+    LEFT JOIN employee_monthly_summary s ON e.id = s.employee_id
+        AND s.year = %s AND s.month = %s
+    ORDER BY e.name
+"""
+
+# 月次レポートのCSVの見出し
+REPORT_CSV_HEADER = ('社員ID', '社員名', '出勤日数', '総労働時間（時間）', '総休憩時間（時間）', '実労働時間（時間）')
+
+# 時間の表示形式（月次レポートの画面と同じ）
+HOURS_FORMAT = '%.2f'
+
+
+def report_csv_values(row):
+    """
+    月次レポートの1行をCSVの値に変換する関数
+
+    時間は画面（monthly_report.html）と同じ計算と形式で出力します。
+
+    Args:
+        row: REPORT_QUERYの行
+
+    Returns:
+        tuple: CSVの1行の値
+    """
+    total_hours = row['total_hours'] or 0
+    break_hours = row['total_break_hours'] or 0
+    return (
+        row['employee_id'],
+        row['employee_name'],
+        row['attendance_days'] or 0,
+        HOURS_FORMAT % total_hours,
+        HOURS_FORMAT % break_hours,
+        HOURS_FORMAT % (total_hours - break_hours),
+    )
+
+
+def month_range(year, month):
+    """
+    年月の初日と翌月の初日を返す関数
+
+    Args:
+        year: 年
+        month: 月
+
+    Returns:
+        tuple: (初日, 翌月の初日)
+    """
+    first_day = date(year, month, 1)
+    if month == 12:
+        return first_day, date(year + 1, 1, 1)
+    return first_day, date(year, month + 1, 1)
+
+
+def remove_record(db, record_id):
+    """
+    勤怠記録を変更する前に、変更前の値を集計テーブルから差し引く関数
+
+    呼び出し側のトランザクション内で実行し、変更と同時にコミットします。
+
+    Args:
+        db: DBAccessのインスタンス
+        record_id: 勤怠記録ID
+    """
+    with db.get_cursor() as cursor:
+        cursor.execute(APPLY_RECORD_QUERY, (0, -1, -1, record_id))
+
+
+def add_record(db, record_id, new_record=False):
+    """
+    勤怠記録を変更した後に、変更後の値を集計テーブルに加算する関数
+
+    呼び出し側のトランザクション内で実行し、変更と同時にコミットします。
+
+    Args:
+        db: DBAccessのインスタンス
+        record_id: 勤怠記録ID
+        new_record: 新規作成した記録の場合はTrue（出勤日数を1加算する）
+    """
+    with db.get_cursor() as cursor:
+        cursor.execute(APPLY_RECORD_QUERY, (1 if new_record else 0, 1, 1, record_id))
+
+
+def rebuild_month(db, year, month):
+    """
+    指定した年月の集計を勤怠記録から再計算する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        year: 年
+        month: 月
+    """
+    first_day, next_month = month_range(year, month)
+    db.execute_query(
+        "DELETE FROM employee_monthly_summary WHERE year = %s AND month = %s",
+        (year, month)
+    )
+    db.execute_query(
+        REBUILD_QUERY.format(where="WHERE date >= %s AND date < %s"),
+        (first_day, next_month) * 2
+    )
+
+
+def rebuild_all(db):
+    """
+    全期間の集計を勤怠記録から再計算する関数
+
+    Args:
+        db: DBAccessのインスタンス
+    """
+    db.execute_query("DELETE FROM employee_monthly_summary")
+    db.execute_query(REBUILD_QUERY.format(where=""))
+
+
+def main(argv=None):
+    """
+    コマンドラインから集計を再計算するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='月次集計テーブルを勤怠記録から再計算します。')
+    parser.add_argument('--year', type=int, help='再計算する年')
+    parser.add_argument('--month', type=int, help='再計算する月')
+    parser.add_argument('--all', action='store_true', help='全期間を再計算する')
+    args = parser.parse_args(argv)
+
+    if not args.all and (args.year is None or args.month is None):
+        parser.error('--year と --month、または --all を指定してください')
+
+    db = DBAccess()
+    try:
+        if args.all:
+            rebuild_all(db)
+        else:
+            rebuild_month(db, args.year, args.month)
+        db.commit()
+        print("月次集計の再計算が完了しました。")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
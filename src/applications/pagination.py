@@ -0,0 +1,170 @@
+"""
+キーセット（シーク）方式のページ分割
+
+OFFSETは読み飛ばす行をすべて読むため、後ろのページほど遅くなります。
+キーセット方式では、前のページの最後の行のソートキーより後の行をインデックスのシークで読むため、
+何ページ目でも1ページ分の行だけを読みます。
+
+ソートキーの値はカーソル（URLに含める不透明な文字列）として受け渡します。
+クエリは進む方向の順にページサイズ+1件を読み、1件多く読めた場合に次のページがあると判定します。
+
+環境変数:
+    PAGE_SIZE: 1ページの件数のデフォルト（デフォルト50）
+"""
+
+import base64
+import binascii
+import json
+import os
+
+DEFAULT_PAGE_SIZE = int(os.getenv('PAGE_SIZE', 50))
+MAX_PAGE_SIZE = 200
+
+
+def page_size(value, default=None):
+    """
+    リクエストのページサイズを解釈する関数
+
+    Args:
+        value: リクエストの値（文字列またはNone）
+        default: 値がない・不正な場合のページサイズ（省略時はDEFAULT_PAGE_SIZE）
+
+    Returns:
+        int: 1〜MAX_PAGE_SIZEのページサイズ
+    """
+    default = DEFAULT_PAGE_SIZE if default is None else default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def encode_cursor(values):
+    """
+    ソートキーの値をカーソルに変換する関数
+
+    Args:
+        values: ソートキーの値のタプル（日付は文字列にする）
+
+    Returns:
+        str: URLに含められるカーソル
+    """
+    data = json.dumps(list(values), default=str, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor, count, types=None):
+    """
+    カーソルをソートキーの値に戻す関数
+
+    Args:
+        cursor: encode_cursorで作成したカーソル
+        count: ソートキーの列数
+        types: ソートキーの値の型のタプル（省略時は確認しない、日付はstr）
+
+    Returns:
+        list: ソートキーの値のリスト
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(data.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"不正なカーソルです: {cursor}") from None
+    if not isinstance(values, list) or len(values) != count:
+        raise ValueError(f"不正なカーソルです: {cursor}")
+    # JSONのtrue・falseはintとしても扱われるため、boolは型が合わないものとする
+    if types is not None and not all(isinstance(value, kind) and not isinstance(value, bool)
+                                     for value, kind in zip(values, types)):
+        raise ValueError(f"不正なカーソルです: {cursor}")
+    return values
+
+
+def seek_condition(columns, values, descending=False):
+    """
+    ソートキーが指定した値より後（降順の場合は前）の行を選ぶ条件を作成する関数
+
+    (a, b) > (x, y) を a >= x AND (a > x OR (a = x AND b > y)) に展開します。
+    先頭の a >= x により、先頭の列のインデックスの範囲のシークになります。
+
+    Args:
+        columns: ソートキーの列名のタプル
+        values: カーソルの値
+        descending: 降順に進む場合はTrue
+
+    Returns:
+        tuple: (WHERE句の条件, パラメータのリスト)
+    """
+    op = '<' if descending else '>'
+    condition, params = f"{columns[-1]} {op} %s", [values[-1]]
+    for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+        condition = f"{column} {op} %s OR ({column} = %s AND ({condition}))"
+        params = [value, value] + params
+    return f"{columns[0]} {op}= %s AND ({condition})", [values[0]] + params
+
+
+def order_by(columns, descending=False):
+    """
+    ソートキーのORDER BY句の列を作成する関数
+
+    Args:
+        columns: ソートキーの列名のタプル
+        descending: 降順の場合はTrue
+
+    Returns:
+        str: ORDER BY句の列（"name, id" など）
+    """
+    suffix = ' DESC' if descending else ''
+    return ', '.join(f"{column}{suffix}" for column in columns)
+
+
+class Page:
+    """
+    Pageクラスは、1ページ分の行と、前後のページのカーソルを保持するクラスです。
+    """
+
+    def __init__(self, rows, next_cursor=None, prev_cursor=None):
+        """
+        __init__メソッドは、Pageクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            rows: 表示する順の行のリスト
+            next_cursor: 次のページのカーソル（ない場合はNone）
+            prev_cursor: 前のページのカーソル（ない場合はNone）
+        """
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @classmethod
+    def from_rows(cls, rows, size, columns, backward=False, has_cursor=False):
+        """
+        from_rowsメソッドは、進む方向の順にsize+1件まで読んだ行からページを作成するメソッドです。
+
+        Args:
+            rows: クエリの結果（前のページへ戻る場合は表示と逆の順）
+            size: ページサイズ
+            columns: ソートキーの列名のタプル（行から値を取り出すため）
+            backward: 前のページへ戻るクエリの結果の場合はTrue
+            has_cursor: カーソルを指定したクエリの場合はTrue（反対方向にもページがある）
+
+        Returns:
+            Page: ページ
+        """
+        more = len(rows) > size
+        rows = list(rows[:size])
+        if backward:
+            rows.reverse()
+        if not rows:
+            return cls(rows)
+
+        def cursor(row):
+            return encode_cursor(tuple(row[column] for column in columns))
+
+        has_next, has_prev = (has_cursor, more) if backward else (more, has_cursor)
+        return cls(rows,
+                   next_cursor=cursor(rows[-1]) if has_next else None,
+                   prev_cursor=cursor(rows[0]) if has_prev else None)
@@ -0,0 +1,240 @@
+"""
+勤怠記録テーブルのパーティション管理
+
+attendance_recordsは日付（date）の月ごとにRANGE COLUMNSパーティション（p202401 など）で分割し、
+末尾に上限なしのpmaxを置きます。このモジュールは先の月のパーティションを事前に作成し、
+保持期間を過ぎたパーティションを削除（または退避テーブルと交換）します。
+
+毎月1回程度、cron等から実行します:
+    python -m applications.partitions                        # 3か月先までのパーティションを作成
+    python -m applications.partitions --retain 84            # 84か月より前のパーティションを削除
+    python -m applications.partitions --retain 84 --exchange # 削除せず退避テーブルと交換
+"""
+
+from applications.DBAccess import DBAccess
+import argparse
+import sys
+from datetime import date
+
+PARTITIONED_TABLE = 'attendance_records'
+
+# 事前に作成しておく先の月数
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def add_months(day, months):
+    """
+    月初の日付に月数を加算する関数
+
+    Args:
+        day: 日付（日は無視して月初として扱う）
+        months: 加算する月数（負数も可）
+
+    Returns:
+        date: 加算後の月の初日
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(day):
+    """
+    日付を含む月のパーティション名を返す関数
+
+    Args:
+        day: 日付
+
+    Returns:
+        str: パーティション名（p202401 形式）
+    """
+    return f"p{day.year:04d}{day.month:02d}"
+
+
+def partition_clauses(first_month, last_month):
+    """
+    指定した範囲の月ごとのパーティション定義を返す関数
+
+    Args:
+        first_month: 最初の月
+        last_month: 最後の月
+
+    Returns:
+        list: PARTITION ... VALUES LESS THAN (...) の文字列のリスト
+    """
+    clauses = []
+    month = add_months(first_month, 0)
+    while month <= last_month:
+        upper = add_months(month, 1)
+        clauses.append(f"PARTITION {partition_name(month)} VALUES LESS THAN ('{upper.isoformat()}')")
+        month = upper
+    return clauses
+
+
+def list_partitions(db):
+    """
+    attendance_recordsのパーティションの一覧を取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+
+    Returns:
+        list: (パーティション名, 上限の日付) のリスト（pmaxの上限はNone）
+    """
+    rows = db.execute_query("""
+        SELECT partition_name AS name, partition_description AS description
+        FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+    """, (PARTITIONED_TABLE,))
+    partitions = []
+    for row in rows:
+        description = row['description']
+        if description == 'MAXVALUE':
+            partitions.append((row['name'], None))
+        else:
+            partitions.append((row['name'], date.fromisoformat(description.strip("'"))))
+    return partitions
+
+
+def ensure_future_partitions(db, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """
+    months_ahead か月先までの月のパーティションを作成する関数
+
+    pmaxを分割して作成します。pmaxが空であればデータのコピーは発生しません。
+
+    Args:
+        db: DBAccessのインスタンス
+        months_ahead: 事前に作成する先の月数
+        today: 基準日（省略時は今日）
+
+    Returns:
+        list: 作成したパーティション名のリスト
+    """
+    today = today or date.today()
+    bounds = [upper for _, upper in list_partitions(db) if upper is not None]
+    if not bounds:
+        raise RuntimeError(f'{PARTITIONED_TABLE}はパーティション分割されていません')
+
+    first_month = bounds[-1]
+    last_month = add_months(today, months_ahead)
+    clauses = partition_clauses(first_month, last_month)
+    if not clauses:
+        return []
+    db.execute_query(
+        f"ALTER TABLE {PARTITIONED_TABLE} REORGANIZE PARTITION pmax INTO ("
+        + ", ".join(clauses + ["PARTITION pmax VALUES LESS THAN (MAXVALUE)"])
+        + ")"
+    )
+    return [clause.split()[1] for clause in clauses]
+
+
+def ensure_past_partitions(db, first_day):
+    """
+    first_day を含む月から、最初のパーティションの月までのパーティションを作成する関数
+
+    最初のパーティションにはそれより前の日付がすべて入るため、過去のデータを投入する前に
+    月ごとに分割しておきます。最初のパーティションの行はコピーされるため、空のうちに実行します。
+
+    Args:
+        db: DBAccessのインスタンス
+        first_day: 最も古いデータの日付
+
+    Returns:
+        list: 作成したパーティション名のリスト
+    """
+    partitions = [(name, upper) for name, upper in list_partitions(db) if upper is not None]
+    if not partitions:
+        raise RuntimeError(f'{PARTITIONED_TABLE}はパーティション分割されていません')
+
+    first_name, first_upper = partitions[0]
+    first_month = add_months(first_day, 0)
+    last_month = add_months(first_upper, -1)
+    if first_month >= last_month:
+        return []
+    clauses = partition_clauses(first_month, add_months(last_month, -1))
+    db.execute_query(
+        f"ALTER TABLE {PARTITIONED_TABLE} REORGANIZE PARTITION {first_name} INTO ("
+        + ", ".join(clauses + [f"PARTITION {first_name} VALUES LESS THAN ('{first_upper.isoformat()}')"])
+        + ")"
+    )
+    return [clause.split()[1] for clause in clauses]
+
+
+def expire_partitions(db, retain_months, today=None, exchange=False):
+    """
+    保持期間を過ぎた月のパーティションを削除する関数
+
+    パーティション分割したテーブルには外部キーを張れないため、
+    対象の勤怠記録に紐づくプロジェクト作業時間もここで削除します。
+    exchangeがTrueの場合は、削除する前に勤怠記録を退避テーブル
+    （attendance_records_p202401 など）と交換し、プロジェクト作業時間も
+    退避テーブル（project_hours_p202401 など）にコピーします。
+    月次集計（employee_monthly_summary）は削除しません。
+
+    Args:
+        db: DBAccessのインスタンス
+        retain_months: 保持する月数
+        today: 基準日（省略時は今日）
+        exchange: 退避テーブルと交換する場合はTrue
+
+    Returns:
+        list: 削除したパーティション名のリスト
+    """
+    cutoff = add_months(today or date.today(), -retain_months)
+    expired = [name for name, upper in list_partitions(db) if upper is not None and upper <= cutoff]
+
+    for name in expired:
+        if exchange:
+            db.execute_query(f"CREATE TABLE IF NOT EXISTS project_hours_{name} LIKE project_hours")
+            db.execute_query(f"""
+                INSERT INTO project_hours_{name}
+                SELECT ph.*
+                FROM project_hours ph
+                JOIN {PARTITIONED_TABLE} PARTITION ({name}) ar ON ph.attendance_record_id = ar.id
+            """)
+        db.execute_query(f"""
+            DELETE ph
+            FROM project_hours ph
+            JOIN {PARTITIONED_TABLE} PARTITION ({name}) ar ON ph.attendance_record_id = ar.id
+        """)
+        db.commit()
+
+        if exchange:
+            archive_table = f"{PARTITIONED_TABLE}_{name}"
+            db.execute_query(f"CREATE TABLE IF NOT EXISTS {archive_table} LIKE {PARTITIONED_TABLE}")
+            db.execute_query(f"ALTER TABLE {archive_table} REMOVE PARTITIONING")
+            db.execute_query(f"ALTER TABLE {PARTITIONED_TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive_table}")
+        db.execute_query(f"ALTER TABLE {PARTITIONED_TABLE} DROP PARTITION {name}")
+    return expired
+
+
+def main(argv=None):
+    """
+    コマンドラインからパーティションを管理するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='勤怠記録テーブルのパーティションを管理します。')
+    parser.add_argument('--ahead', type=int, default=DEFAULT_MONTHS_AHEAD, help='事前に作成する先の月数')
+    parser.add_argument('--retain', type=int, help='保持する月数（指定した場合のみ古いパーティションを削除）')
+    parser.add_argument('--exchange', action='store_true', help='削除する前に退避テーブルと交換する')
+    args = parser.parse_args(argv)
+
+    db = DBAccess()
+    try:
+        created = ensure_future_partitions(db, args.ahead)
+        print(f"作成したパーティション: {', '.join(created) or 'なし'}")
+        if args.retain is not None:
+            expired = expire_partitions(db, args.retain, exchange=args.exchange)
+            print(f"削除したパーティション: {', '.join(expired) or 'なし'}")
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
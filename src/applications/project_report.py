@@ -0,0 +1,190 @@
+"""
+プロジェクト別レポート
+
+期間内のプロジェクト作業時間を、プロジェクトごと・月ごと、プロジェクトごと・社員ごとに合計します。
+どちらもGROUP BYの1回のクエリで集計し、プロジェクト作業時間の行をアプリケーションへ読み出しません。
+
+プロジェクト作業時間は idx_project_record_hours (project_id, attendance_record_id, hours) で読み、
+勤怠記録の主キー (id, date) で期間の日付に絞り込みます（プロジェクトを指定した場合はproject_idの範囲だけを読みます）。
+締め済みの年度を含む期間は、アーカイブテーブルも同じクエリで集計して合計に加えます。
+
+CSVはプロジェクト・年月・社員ごとの合計を、サーバーサイドカーソルで読んだ分ずつ出力します。
+"""
+
+from applications import archive, range_report
+from applications.DBAccess import row_class
+from applications.monthly_summary import HOURS_FORMAT
+from datetime import timedelta
+from decimal import Decimal
+
+RECORDS_TABLE = 'attendance_records'
+HOURS_TABLE = 'project_hours'
+
+# プロジェクトごと・月ごとの作業時間の合計
+MONTH_QUERY = """
+    SELECT ph.project_id, p.name AS project_name,
+           YEAR(ar.date) AS year, MONTH(ar.date) AS month, SUM(ph.hours) AS hours
+    FROM {hours} ph
+    JOIN {records} ar ON ar.id = ph.attendance_record_id
+    JOIN projects p ON p.id = ph.project_id
+    WHERE ar.date >= %s AND ar.date < %s{project}
+    GROUP BY ph.project_id, p.name, YEAR(ar.date), MONTH(ar.date)
+"""
+
+# プロジェクトごと・社員ごとの作業時間の合計
+EMPLOYEE_QUERY = """
+    SELECT ph.project_id, ar.employee_id, e.name AS employee_name, SUM(ph.hours) AS hours
+    FROM {hours} ph
+    JOIN {records} ar ON ar.id = ph.attendance_record_id
+    JOIN employees e ON e.id = ar.employee_id
+    WHERE ar.date >= %s AND ar.date < %s{project}
+    GROUP BY ph.project_id, ar.employee_id, e.name
+"""
+
+# CSVのプロジェクトごと・年月ごと・社員ごとの作業時間の合計
+CSV_QUERY = """
+    SELECT ph.project_id, p.name AS project_name,
+           YEAR(ar.date) AS year, MONTH(ar.date) AS month,
+           ar.employee_id, e.name AS employee_name, SUM(ph.hours) AS hours
+    FROM {hours} ph
+    JOIN {records} ar ON ar.id = ph.attendance_record_id
+    JOIN projects p ON p.id = ph.project_id
+    JOIN employees e ON e.id = ar.employee_id
+    WHERE ar.date >= %s AND ar.date < %s{project}
+    GROUP BY ph.project_id, p.name, YEAR(ar.date), MONTH(ar.date), ar.employee_id, e.name
+    ORDER BY year, month, ph.project_id, ar.employee_id
+"""
+
+CSV_HEADER = ('年', '月', 'プロジェクトID', 'プロジェクト名', '社員ID', '社員名', '作業時間（時間）')
+
+# プロジェクトの月ごとの作業時間（cellsは期間の月の順の時間またはNone）
+ProjectRow = row_class(('project_id', 'project_name', 'cells', 'total'))
+
+# プロジェクトの社員ごとの作業時間
+EmployeeHours = row_class(('employee_id', 'employee_name', 'hours'))
+
+
+def _tables(date_from, today=None):
+    """
+    期間の集計で読む (勤怠記録のテーブル, プロジェクト作業時間のテーブル) のリストを返す関数
+
+    締め済みの年度を含む期間は、日付の古いアーカイブテーブルを先にします。
+    """
+    tables = [(RECORDS_TABLE, HOURS_TABLE)]
+    if archive.may_be_archived(date_from.isoformat(), today):
+        tables.insert(0, (archive.ARCHIVE_RECORDS_TABLE, archive.ARCHIVE_HOURS_TABLE))
+    return tables
+
+
+def _queries(template, date_from, date_to, project_id=None, today=None):
+    """
+    テーブルごとの集計のクエリとパラメータのリストを作成する関数
+
+    Args:
+        template: MONTH_QUERY・EMPLOYEE_QUERY・CSV_QUERYのいずれか
+        date_from: 期間の初日
+        date_to: 期間の最終日（この日を含む）
+        project_id: 集計するプロジェクトのID（省略時は全プロジェクト）
+        today: 基準日（省略時は今日、アーカイブテーブルを読むかの判定に使う）
+
+    Returns:
+        list: (SQL文, パラメータ) のリスト
+    """
+    params = (date_from, date_to + timedelta(days=1))
+    project = ''
+    if project_id is not None:
+        project = ' AND ph.project_id = %s'
+        params += (project_id,)
+    return [(template.format(records=records, hours=hours, project=project), params)
+            for records, hours in _tables(date_from, today)]
+
+
+def fetch_report(db, date_from, date_to, project_id=None, today=None):
+    """
+    期間内のプロジェクトごと・月ごと、プロジェクトごと・社員ごとの作業時間を取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        date_from: 期間の初日
+        date_to: 期間の最終日（この日を含む）
+        project_id: 集計するプロジェクトのID（省略時は全プロジェクト）
+        today: 基準日（省略時は今日）
+
+    Returns:
+        tuple: (期間の年月のリスト, ProjectRowのリスト（プロジェクト名の順）,
+                プロジェクトIDごとのEmployeeHoursのリスト（作業時間の多い順）の辞書)
+
+    Raises:
+        ValueError: 期間の最終日が初日より前、または期間がrange_report.MAX_MONTHSか月を超える場合
+    """
+    if date_to < date_from:
+        raise ValueError("期間の最終日は初日以降を指定してください")
+    months = range_report.month_span((date_from.year, date_from.month), (date_to.year, date_to.month))
+    columns = {month: index for index, month in enumerate(months)}
+
+    projects = {}
+    for query, params in _queries(MONTH_QUERY, date_from, date_to, project_id, today):
+        for row in db.execute_query(query, params, compact=True):
+            name, cells = projects.setdefault(row['project_id'], (row['project_name'], [None] * len(months)))
+            index = columns[(row['year'], row['month'])]
+            cells[index] = (cells[index] or Decimal(0)) + row['hours']
+
+    employees = {}
+    for query, params in _queries(EMPLOYEE_QUERY, date_from, date_to, project_id, today):
+        for row in db.execute_query(query, params, compact=True):
+            hours = employees.setdefault(row['project_id'], {})
+            name, total = hours.get(row['employee_id'], (row['employee_name'], Decimal(0)))
+            hours[row['employee_id']] = (name, total + row['hours'])
+
+    project_rows = sorted(
+        (ProjectRow(project_id, name, cells, sum(cell for cell in cells if cell is not None))
+         for project_id, (name, cells) in projects.items()),
+        key=lambda row: (row.project_name, row.project_id),
+    )
+    employee_rows = {
+        project_id: sorted((EmployeeHours(employee_id, name, total) for employee_id, (name, total) in hours.items()),
+                           key=lambda row: (-row.hours, row.employee_name, row.employee_id))
+        for project_id, hours in employees.items()
+    }
+    return months, project_rows, employee_rows
+
+
+def csv_batches(db, date_from, date_to, project_id=None, today=None):
+    """
+    CSVの行のバッチをサーバーサイドカーソルで順に読むジェネレータ
+
+    ジェネレータが閉じられると、読み途中のサーバーサイドカーソルも閉じられます。
+
+    Args:
+        db: DBAccessのインスタンス
+        date_from: 期間の初日
+        date_to: 期間の最終日（この日を含む）
+        project_id: 集計するプロジェクトのID（省略時は全プロジェクト）
+        today: 基準日（省略時は今日）
+
+    Yields:
+        list: CSV_QUERYの行のリスト
+    """
+    for query, params in _queries(CSV_QUERY, date_from, date_to, project_id, today):
+        yield from db.iter_query(query, params, compact=True)
+
+
+def csv_values(row):
+    """
+    CSV_QUERYの1行をCSVの値に変換する関数
+
+    Args:
+        row: CSV_QUERYの行
+
+    Returns:
+        tuple: CSV_HEADERの順の値
+    """
+    return (
+        row['year'],
+        row['month'],
+        row['project_id'],
+        row['project_name'],
+        row['employee_id'],
+        row['employee_name'],
+        HOURS_FORMAT % row['hours'],
+    )
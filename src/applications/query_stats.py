@@ -0,0 +1,214 @@
+"""
+クエリ統計モジュール
+
+SQL文の実行時間を、パラメータを除いた正規化済みの文（フィンガープリント）ごとに
+ヒストグラムとして集計し、閾値を超えたクエリをスロークエリログに出力します。
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+# ヒストグラムのバケット境界（ミリ秒）
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# スロークエリとみなす実行時間の閾値（ミリ秒）
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = 500
+# スロークエリログのローテーション設定
+DEFAULT_SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_SLOW_QUERY_LOG_BACKUP_COUNT = 5
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s")
+_IN_LIST_RE = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_LIST_RE = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+slow_query_logger = logging.getLogger('applications.slow_query')
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """
+    SQL文を正規化したフィンガープリントを返す関数
+
+    文字列・数値リテラルとプレースホルダを?に置き換え、IN句や複数行VALUESの
+    繰り返しを1つにまとめ、空白を詰めて小文字にします。
+
+    Args:
+        query: SQL文
+
+    Returns:
+        str: 正規化したSQL文
+    """
+    normalized = _STRING_RE.sub('?', query)
+    normalized = _PLACEHOLDER_RE.sub('?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip().lower()
+    normalized = _IN_LIST_RE.sub('in (?+)', normalized)
+    normalized = _VALUES_LIST_RE.sub(r'\1', normalized)
+    return normalized
+
+
+class QueryStats:
+    """
+    QueryStatsクラスは、フィンガープリントごとの実行時間ヒストグラムを保持するクラスです。
+    複数スレッドから同時に記録できます。
+    """
+
+    def __init__(self, buckets=BUCKETS_MS):
+        """
+        __init__メソッドは、QueryStatsクラスのインスタンスを初期化するメソッドです。
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, fingerprint, elapsed_ms):
+        """
+        recordメソッドは、1回分の実行時間を記録するメソッドです。
+        """
+        index = bisect.bisect_left(self.buckets, elapsed_ms)
+        with self._lock:
+            entry = self._stats.get(fingerprint)
+            if entry is None:
+                # [件数, 合計時間, 最大時間, バケットごとの件数]
+                entry = self._stats[fingerprint] = [0, 0.0, 0.0, [0] * (len(self.buckets) + 1)]
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            if elapsed_ms > entry[2]:
+                entry[2] = elapsed_ms
+            entry[3][index] += 1
+
+    def snapshot(self):
+        """
+        snapshotメソッドは、集計結果を合計時間の降順のリストで返すメソッドです。
+        bucketsは「le（ミリ秒、上限なしは'+Inf'）までの累積件数」の辞書です。
+        """
+        with self._lock:
+            items = [(key, entry[0], entry[1], entry[2], list(entry[3]))
+                     for key, entry in self._stats.items()]
+
+        results = []
+        for key, count, total_ms, max_ms, counts in items:
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                buckets[bound] = cumulative
+            results.append({
+                'fingerprint': key,
+                'count': count,
+                'total_ms': total_ms,
+                'avg_ms': total_ms / count,
+                'max_ms': max_ms,
+                'buckets': buckets,
+            })
+        results.sort(key=lambda result: result['total_ms'], reverse=True)
+        return results
+
+    def reset(self):
+        """
+        resetメソッドは、集計結果をすべて破棄するメソッドです。
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+query_stats = QueryStats()
+_slow_query_log_lock = threading.Lock()
+_slow_query_log_configured = False
+
+
+def _configure_slow_query_log():
+    """
+    スロークエリログの出力先を設定する関数
+
+    環境変数SLOW_QUERY_LOGにファイルパスが設定されている場合は、
+    SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_LOG_BACKUP_COUNTでローテーションするファイルに出力します。
+    設定されていない場合は、loggingの通常の出力先に出力します。
+    """
+    global _slow_query_log_configured
+    with _slow_query_log_lock:
+        if _slow_query_log_configured:
+            return
+        path = os.getenv('SLOW_QUERY_LOG')
+        if path:
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', DEFAULT_SLOW_QUERY_LOG_MAX_BYTES)),
+                backupCount=int(os.getenv('SLOW_QUERY_LOG_BACKUP_COUNT', DEFAULT_SLOW_QUERY_LOG_BACKUP_COUNT)),
+                encoding='utf-8',
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            slow_query_logger.addHandler(handler)
+            slow_query_logger.setLevel(logging.WARNING)
+        _slow_query_log_configured = True
+
+
+def slow_query_threshold_ms():
+    """
+    スロークエリの閾値（ミリ秒）を返す関数
+
+    環境変数SLOW_QUERY_THRESHOLD_MSから取得します。
+    """
+    return float(os.getenv('SLOW_QUERY_THRESHOLD_MS', DEFAULT_SLOW_QUERY_THRESHOLD_MS))
+
+
+def current_route():
+    """
+    実行中のFlaskリクエストのエンドポイント名を返す関数
+
+    リクエストの外（起動時の初期化やCLI）から呼ばれた場合は'-'を返します。
+    """
+    try:
+        from flask import has_request_context, request
+    except ImportError:
+        return '-'
+    if has_request_context():
+        return request.endpoint or request.path
+    return '-'
+
+
+def record_query(query, elapsed_ms):
+    """
+    クエリの実行時間を記録する関数
+
+    フィンガープリントごとのヒストグラムに記録し、閾値を超えた場合は
+    ルート名とともにスロークエリログに出力します。
+
+    Args:
+        query: 実行したSQL文
+        elapsed_ms: 実行時間（ミリ秒）
+    """
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    key = fingerprint(query)
+    query_stats.record(key, elapsed_ms)
+    if elapsed_ms >= slow_query_threshold_ms():
+        _configure_slow_query_log()
+        slow_query_logger.warning(
+            'slow query: %.1fms route=%s sql=%s', elapsed_ms, current_route(), key
+        )
+
+
+def get_query_stats():
+    """
+    クエリ統計の集計結果を返す関数
+
+    Returns:
+        list: フィンガープリントごとの集計結果（QueryStats.snapshotの戻り値）
+    """
+    return query_stats.snapshot()
+
+
+def reset_query_stats():
+    """
+    クエリ統計の集計結果を破棄する関数
+    """
+    query_stats.reset()
@@ -0,0 +1,177 @@
+"""
+期間レポート（社員×月の集計表）
+
+指定した期間（最大MAX_MONTHSか月）の社員ごと・月ごとの出勤日数、総労働時間、総休憩時間を、
+月次集計テーブル（employee_monthly_summary）から1回のクエリで読み、社員×月の表に組み替えます。
+月ごとに月次レポートを表示する場合と異なり、期間の月数にかかわらずクエリは1回です。
+
+社員は月次レポートと同じく名前の順に並べ、社員一覧と同じキーセット方式でページ分割します。
+1ページ分の社員をidx_nameで読み、各社員の集計は主キー (employee_id, year, month) の範囲で読みます。
+"""
+
+from applications import pagination
+from applications.DBAccess import row_class
+from applications.pagination import Page
+
+# 1回に表示できる最大の月数（5年）
+MAX_MONTHS = 60
+
+# 社員のソートキー（SQLの列名と、表の行の列名）
+SORT_COLUMNS = ('name', 'id')
+ROW_SORT_COLUMNS = ('employee_name', 'employee_id')
+# カーソルのソートキーの値の型
+SORT_TYPES = (str, int)
+
+# 1ページ分の社員と、期間内の月次集計を読むSQL（集計のない社員も1行返す）
+MATRIX_QUERY = """
+    SELECT
+        e.id AS employee_id,
+        e.name AS employee_name,
+        s.year,
+        s.month,
+        s.attendance_days,
+        s.total_seconds / 3600 AS total_hours,
+        s.break_seconds / 3600 AS total_break_hours
+    FROM (
+        SELECT id, name FROM employees
+        {where}
+        ORDER BY {order}
+        LIMIT %s
+    ) e
+    LEFT JOIN employee_monthly_summary s ON s.employee_id = e.id
+        AND s.year BETWEEN %s AND %s
+        AND (s.year > %s OR s.month >= %s)
+        AND (s.year < %s OR s.month <= %s)
+    ORDER BY {outer_order}, s.year, s.month
+"""
+
+# 社員×月の表の1行（cellsは期間の月の順のMonthCellまたはNone）
+MatrixRow = row_class(('employee_id', 'employee_name', 'cells', 'totals'))
+
+# 1か月分（または期間の合計）の集計
+MonthCell = row_class(('attendance_days', 'total_hours', 'total_break_hours'))
+
+
+def parse_month(value):
+    """
+    年月の文字列を解釈する関数
+
+    Args:
+        value: 年月の文字列 (YYYY-MM)
+
+    Returns:
+        tuple: (年, 月)
+
+    Raises:
+        ValueError: 年月が不正な場合
+    """
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"不正な年月です: {value}") from None
+    if not 1 <= month <= 12 or not 1 <= year <= 9999:
+        raise ValueError(f"不正な年月です: {value}")
+    return year, month
+
+
+def month_span(start, end):
+    """
+    期間の年月のリストを返す関数
+
+    Args:
+        start: 期間の最初の (年, 月)
+        end: 期間の最後の (年, 月)
+
+    Returns:
+        list: (年, 月) のリスト
+
+    Raises:
+        ValueError: 最後の月が最初の月より前、または期間がMAX_MONTHSか月を超える場合
+    """
+    first = start[0] * 12 + start[1] - 1
+    last = end[0] * 12 + end[1] - 1
+    if last < first:
+        raise ValueError("期間の最後の月は最初の月以降を指定してください")
+    if last - first + 1 > MAX_MONTHS:
+        raise ValueError(f"期間は{MAX_MONTHS}か月以内で指定してください")
+    return [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
+
+
+def fetch_matrix(db, months, size=None, after=None, before=None):
+    """
+    社員×月の表の1ページを取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        months: month_spanで作成した期間の年月のリスト
+        size: 1ページの社員数（省略時はpagination.DEFAULT_PAGE_SIZE）
+        after: 次のページのカーソル
+        before: 前のページのカーソル（afterより優先）
+
+    Returns:
+        Page: MatrixRowのページ
+
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    size = pagination.DEFAULT_PAGE_SIZE if size is None else size
+    cursor = before or after
+    backward = bool(before)
+    values = pagination.decode_cursor(cursor, len(SORT_COLUMNS), SORT_TYPES) if cursor else None
+
+    where, seek_params = '', []
+    if values is not None:
+        seek, seek_params = pagination.seek_condition(SORT_COLUMNS, values, descending=backward)
+        where = f"WHERE {seek}"
+    (first_year, first_month), (last_year, last_month) = months[0], months[-1]
+    query = MATRIX_QUERY.format(
+        where=where,
+        order=pagination.order_by(SORT_COLUMNS, descending=backward),
+        outer_order=pagination.order_by(('e.name', 'e.id'), descending=backward),
+    )
+    params = (*seek_params, size + 1, first_year, last_year, first_year, first_month, last_year, last_month)
+    rows = db.execute_query(query, params, compact=True, cache=True)
+
+    return Page.from_rows(pivot(rows, months), size, ROW_SORT_COLUMNS,
+                          backward=backward, has_cursor=values is not None)
+
+
+def pivot(rows, months):
+    """
+    社員・年月ごとの集計の行を、社員ごとの行に組み替える関数
+
+    Args:
+        rows: MATRIX_QUERYの結果（社員ごとにまとまった順）
+        months: 期間の年月のリスト
+
+    Returns:
+        list: MatrixRowのリスト（rowsの社員の順）
+    """
+    columns = {month: index for index, month in enumerate(months)}
+    matrix = []
+    current = current_name = cells = None
+    for row in rows:
+        if current != row['employee_id']:
+            if current is not None:
+                matrix.append(_matrix_row(current_name, current, cells))
+            current, current_name = row['employee_id'], row['employee_name']
+            cells = [None] * len(months)
+        index = columns.get((row['year'], row['month']))
+        if index is not None:
+            cells[index] = MonthCell(row['attendance_days'], row['total_hours'] or 0, row['total_break_hours'] or 0)
+    if current is not None:
+        matrix.append(_matrix_row(current_name, current, cells))
+    return matrix
+
+
+def _matrix_row(employee_name, employee_id, cells):
+    """
+    社員の月ごとの集計から、期間の合計を含む表の行を作成する関数
+    """
+    present = [cell for cell in cells if cell is not None]
+    totals = MonthCell(
+        sum(cell.attendance_days for cell in present),
+        sum(cell.total_hours for cell in present),
+        sum(cell.total_break_hours for cell in present),
+    )
+    return MatrixRow(employee_id, employee_name, cells, totals)
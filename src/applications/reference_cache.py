@@ -0,0 +1,158 @@
+"""
+参照データのプロセス内キャッシュ
+
+プロジェクト一覧・社員一覧のように、読み込みが多く更新が少ないデータをプロセス内に保持します。
+データを更新する処理は、同じトランザクション内でcache_versionsテーブルのバージョンを上げます。
+各プロセスはバージョンをリクエストごとに最大1回、かつREFERENCE_CACHE_TTL秒に最大1回だけ確認し、
+上がっていればデータを読み直すため、複数のワーカープロセスでも外部のキャッシュサーバーなしに
+更新が反映されます。
+SHARED_CACHE_PATHを設定した場合は、読み込んだデータをバージョンごとにプロセス間共有キャッシュ
+（shared_cache）に保存し、同じホストのワーカーは最初の1つが読み込んだデータを共有します。
+
+環境変数:
+    REFERENCE_CACHE_TTL: バージョンを確認する間隔（秒、デフォルト1、0でリクエストごと）
+"""
+
+import os
+import threading
+import time
+
+from applications.pagination import DEFAULT_PAGE_SIZE
+from applications.shared_cache import get_shared_cache
+
+DEFAULT_TTL = 1.0
+# プロセス間共有キャッシュに保存したデータの有効期限（秒）。バージョンが上がれば別のキーになる
+SHARED_TTL = 3600
+
+# キャッシュするデータの名前と、読み込むクエリ・コンパクトな行で取得するか
+REFERENCE_QUERIES = {
+    # 勤怠入力画面で作業時間を入力するプロジェクト（画面ごとに作業時間を書き込むため辞書で取得）
+    'projects': ("SELECT id, name FROM projects ORDER BY name", False),
+    # 社員一覧画面の最初のページ（次のページの有無を判定するため1件多く読む）
+    'employees': (f"""
+        SELECT id, email, name, role, created_at
+        FROM employees
+        ORDER BY name, id
+        LIMIT {DEFAULT_PAGE_SIZE + 1}
+    """, True),
+}
+
+
+def _request_state():
+    """
+    実行中のFlaskリクエストの状態（flask.g）を返す関数
+
+    リクエストの外（CLIなど）から呼ばれた場合はNoneを返します。
+    """
+    try:
+        from flask import g, has_request_context
+    except ImportError:
+        return None
+    return g if has_request_context() else None
+
+
+class ReferenceCache:
+    """
+    ReferenceCacheクラスは、参照データをバージョン付きでプロセス内に保持するクラスです。
+    """
+
+    def __init__(self, queries=None, ttl=None, backend=None):
+        """
+        __init__メソッドは、ReferenceCacheクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            queries: データの名前と (クエリ, コンパクトな行で取得するか) の辞書
+            ttl: バージョンを確認する間隔（秒）
+            backend: データを共有するプロセス間共有キャッシュ（SharedCache、省略時は共有しない）
+        """
+        self.backend = backend
+        self.queries = dict(REFERENCE_QUERIES if queries is None else queries)
+        self.ttl = float(os.getenv('REFERENCE_CACHE_TTL', DEFAULT_TTL)) if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._versions = {}
+        self._checked_at = None
+
+    def get(self, db, name):
+        """
+        getメソッドは、参照データを取得するメソッドです。
+        バージョンが上がっていれば、引数のDBAccessでデータを読み直します。
+        返した行は他のリクエストと共有するため、変更しないでください。
+
+        Args:
+            db: DBAccessのインスタンス
+            name: データの名前
+
+        Returns:
+            list: 行のリスト
+        """
+        self._check_versions(db)
+        with self._lock:
+            version = self._versions.get(name, 0)
+            entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        query, compact = self.queries[name]
+        if self.backend is not None:
+            rows = self.backend.get_or_compute(
+                f"reference:{name}:{version}", lambda: db.execute_query(query, compact=compact), SHARED_TTL
+            )
+        else:
+            rows = db.execute_query(query, compact=compact)
+        with self._lock:
+            self._entries[name] = (version, rows)
+        return rows
+
+    def bump(self, db, name):
+        """
+        bumpメソッドは、参照データのバージョンを上げるメソッドです。
+        データを更新するトランザクション内で呼び出し、更新と同時にコミットします。
+        このプロセスのデータはすぐに破棄します。
+
+        Args:
+            db: DBAccessのインスタンス
+            name: データの名前
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+                ON DUPLICATE KEY UPDATE version = version + 1
+            """, (name,))
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        """
+        clearメソッドは、保持しているデータとバージョンをすべて破棄するメソッドです。
+        """
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._checked_at = None
+
+    def _check_versions(self, db):
+        """
+        _check_versionsメソッドは、cache_versionsテーブルからバージョンを読み込むメソッドです。
+        同じリクエスト内で確認済みの場合と、前回の確認からttl秒経っていない場合は何もしません。
+        """
+        state = _request_state()
+        if state is not None and getattr(state, '_reference_versions_checked', False):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.ttl:
+                return
+
+        with db.get_cursor() as cursor:
+            cursor.execute("SELECT name, version FROM cache_versions")
+            versions = {row['name']: row['version'] for row in cursor.fetchall()}
+        with self._lock:
+            self._versions = versions
+            self._checked_at = now
+        if state is not None:
+            state._reference_versions_checked = True
+
+
+# プロセス全体で共有する参照データのキャッシュ
+reference_cache = ReferenceCache(backend=get_shared_cache())
@@ -0,0 +1,383 @@
+"""
+クエリ結果のプロセス内キャッシュ
+
+DBAccess.execute_queryにcache=Trueを指定したSELECTの結果を、SQL文とパラメータをキーにして保持します。
+各結果には読み込んだテーブル名をタグとして付け、DBAccessを通した書き込み（INSERT・UPDATE・DELETE・
+DDLなど）が同じテーブルに行われると、該当する結果を自動的に破棄します。
+書き込み中のトランザクションでは、コミットした時点で改めて破棄します。
+
+保持する結果はLRUで管理し、有効期限（QUERY_CACHE_TTL秒）を過ぎたものと、
+合計サイズが上限（QUERY_CACHE_MAX_BYTES）を超えた分の古いものから破棄します。
+他のプロセスでの書き込みは検知できないため、有効期限までは古い結果を返すことがあります。
+SHARED_CACHE_PATHを設定した場合は、結果をプロセス間共有キャッシュ（shared_cache）に保存し、
+テーブルごとのバージョンをキーに含めるため、同じホストの他のプロセスでの書き込みもすぐに反映されます。
+
+環境変数:
+    QUERY_CACHE_TTL: 結果の有効期限（秒、デフォルト5、0で無効）
+    QUERY_CACHE_MAX_BYTES: 保持する結果の合計サイズの上限（バイト、デフォルト16MiB）
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from applications.query_stats import fingerprint
+from applications.shared_cache import get_shared_cache
+
+DEFAULT_TTL = 5.0
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# 1件の結果に使える上限の割合（大きな結果1件でキャッシュ全体が入れ替わらないようにする）
+MAX_ENTRY_RATIO = 0.25
+
+logger = logging.getLogger(__name__)
+
+# 書き込みとみなす文の先頭のキーワード
+_WRITE_RE = re.compile(
+    r"\s*(?:insert|update|delete|replace|alter|create|drop|truncate|rename|load)\b",
+    re.IGNORECASE
+)
+# 文中のテーブル名（フィンガープリント化した小文字の文に対して使用）
+_TABLE_RE = re.compile(r"\b(?:from|join|into|update|table|exists)\s+`?([\w$.]+)`?")
+# FROM句のカンマ区切りのテーブル一覧
+_TABLE_LIST_RE = re.compile(
+    r"\bfrom\s+((?:`?[\w$.]+`?(?:\s+(?:as\s+)?[\w$]+)?\s*,\s*)+`?[\w$.]+`?)"
+)
+
+
+def tables_of(query):
+    """
+    SQL文が参照するテーブル名の集合を返す関数
+
+    FROM・JOIN・INTO・UPDATE・TABLEの直後の名前を取り出します。
+    文字列リテラルはフィンガープリント化で取り除くため、値の中の単語は対象になりません。
+
+    Args:
+        query: SQL文
+
+    Returns:
+        frozenset: テーブル名（小文字、スキーマ名を除く）の集合
+    """
+    normalized = fingerprint(query)
+    names = set(_TABLE_RE.findall(normalized))
+    for table_list in _TABLE_LIST_RE.findall(normalized):
+        names.update(item.split()[0] for item in table_list.split(','))
+    return frozenset(name.strip('`').rsplit('.', 1)[-1] for name in names)
+
+
+def is_write(query):
+    """
+    SQL文がデータやテーブル定義を変更する文かどうかを返す関数
+
+    Args:
+        query: SQL文（str・bytes）
+
+    Returns:
+        bool: 書き込みの文の場合はTrue
+    """
+    head = query[:32]
+    if isinstance(head, bytes):
+        head = head.decode('utf-8', 'replace')
+    return _WRITE_RE.match(head) is not None
+
+
+def estimate_size(rows):
+    """
+    クエリ結果のおおよそのメモリ使用量を返す関数
+
+    Args:
+        rows: 辞書またはコンパクトな行のリスト
+
+    Returns:
+        int: バイト数
+    """
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in (row.values() if isinstance(row, dict) else row):
+            size += sys.getsizeof(value)
+    return size
+
+
+def _copy_rows(rows):
+    """
+    呼び出し元が変更しても共有する結果に影響しないよう、行のリストを複製する関数
+
+    コンパクトな行は変更できないため、リストだけを複製します。
+    """
+    return [dict(row) if isinstance(row, dict) else row for row in rows]
+
+
+def _freeze(params):
+    """
+    パラメータをキャッシュのキーに使える形に変換する関数
+    """
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    if isinstance(params, list):
+        return tuple(params)
+    return params
+
+
+class ResultCache:
+    """
+    ResultCacheクラスは、クエリ結果をテーブル名のタグ付きでプロセス内に保持するクラスです。
+    複数スレッドから同時に使用できます。
+    """
+
+    def __init__(self, ttl=None, max_bytes=None, backend=None):
+        """
+        __init__メソッドは、ResultCacheクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            ttl: 結果の有効期限（秒）
+            max_bytes: 保持する結果の合計サイズの上限（バイト）
+            backend: 結果を保存するプロセス間共有キャッシュ（SharedCache、省略時はプロセス内に保存）
+        """
+        self.backend = backend
+        self.ttl = float(os.getenv('QUERY_CACHE_TTL', DEFAULT_TTL)) if ttl is None else ttl
+        self.max_bytes = int(os.getenv('QUERY_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)) if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        # キー -> (行のリスト, タグ, サイズ, 期限)
+        self._entries = OrderedDict()
+        # テーブル名 -> そのテーブルをタグに持つキーの集合
+        self._keys_by_table = {}
+        # テーブル名 -> 破棄した回数（読み込み中に書き込まれた結果を保存しないために使用）
+        self._generations = {}
+        # 接続 -> コミット前に書き込んだテーブル名の集合
+        self._pending = weakref.WeakKeyDictionary()
+        self._bytes = 0
+        self._counters = dict.fromkeys(('hits', 'misses', 'evictions', 'expirations', 'invalidations'), 0)
+
+    @property
+    def enabled(self):
+        """
+        キャッシュが有効かどうか
+        """
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def execute(self, conn, query, params, compact, run):
+        """
+        executeメソッドは、キャッシュした結果を返すか、クエリを実行して結果を保存するメソッドです。
+        同じ接続でコミット前に書き込んだテーブルを読む場合は、キャッシュを使わずに実行します。
+
+        Args:
+            conn: クエリを実行する接続
+            query: SQL文
+            params: パラメータ
+            compact: コンパクトな行で取得するか
+            run: クエリを実行して行のリストを返す関数
+
+        Returns:
+            list: 行のリスト（呼び出し元で変更してもキャッシュには影響しません）
+        """
+        tags = tables_of(query)
+        with self._lock:
+            pending = self._pending.get(conn)
+        if not self.enabled or (pending and ('*' in pending or not pending.isdisjoint(tags))):
+            return run()
+
+        if self.backend is not None:
+            return self._execute_shared(query, params, compact, tags, run)
+
+        key = (query, _freeze(params), compact)
+        try:
+            hash(key)
+        except TypeError:
+            return run()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] <= now:
+                self._remove(key)
+                self._counters['expirations'] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return _copy_rows(entry[0])
+            self._counters['misses'] += 1
+            generations = self._generation(tags)
+
+        rows = run()
+        size = estimate_size(rows)
+        if size > self.max_bytes * MAX_ENTRY_RATIO:
+            return rows
+        cached = _copy_rows(rows)
+        with self._lock:
+            # 実行中に同じテーブルへの書き込みがあった場合は、古いかもしれない結果を保存しない
+            if generations != self._generation(tags):
+                return rows
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (cached, tags, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            for table in tags:
+                self._keys_by_table.setdefault(table, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+        return rows
+
+    def note_write(self, conn, query):
+        """
+        note_writeメソッドは、接続で実行した文が書き込みであれば、対象のテーブルの結果を破棄するメソッドです。
+        コミットした時点でも改めて破棄するよう、テーブル名を接続ごとに記録します。
+
+        Args:
+            conn: 文を実行した接続
+            query: 実行した文（str・bytes）
+        """
+        if not is_write(query):
+            return
+        if isinstance(query, bytes):
+            query = query.decode('utf-8', 'replace')
+        tables = tables_of(query)
+        if conn is not None:
+            with self._lock:
+                pending = self._pending.get(conn)
+                if pending is None:
+                    pending = self._pending[conn] = set()
+                pending.update(tables or ('*',))
+        self.invalidate(tables)
+        self._bump_shared(tables or ('*',))
+
+    def end_transaction(self, conn, committed):
+        """
+        end_transactionメソッドは、接続のトランザクションの終了を記録するメソッドです。
+        コミットした場合は、トランザクション中に書き込んだテーブルの結果を改めて破棄します。
+
+        Args:
+            conn: 接続
+            committed: コミットした場合はTrue、ロールバックした場合はFalse
+        """
+        with self._lock:
+            pending = self._pending.pop(conn, None)
+        if committed and pending:
+            self.invalidate(() if '*' in pending else pending)
+            self._bump_shared(pending)
+
+    def invalidate(self, tables=()):
+        """
+        invalidateメソッドは、指定したテーブルをタグに持つ結果を破棄するメソッドです。
+        テーブルを指定しない場合は、すべての結果を破棄します。
+
+        Args:
+            tables: テーブル名のイテラブル
+        """
+        tables = set(tables)
+        with self._lock:
+            if not tables:
+                tables = {'*'}
+                keys = list(self._entries)
+            else:
+                keys = set()
+                for table in tables:
+                    keys.update(self._keys_by_table.get(table, ()))
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    self._counters['invalidations'] += 1
+
+    def stats(self):
+        """
+        statsメソッドは、ヒット・ミス・破棄の回数と、保持している件数・サイズを返すメソッドです。
+
+        Returns:
+            dict: 集計結果
+        """
+        with self._lock:
+            result = dict(self._counters)
+            result['entries'] = len(self._entries)
+            result['bytes'] = self._bytes
+        return result
+
+    def clear(self):
+        """
+        clearメソッドは、保持している結果と集計結果をすべて破棄するメソッドです。
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._pending.clear()
+            self._bytes = 0
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _execute_shared(self, query, params, compact, tags, run):
+        """
+        _execute_sharedメソッドは、プロセス間共有キャッシュの結果を返すか、クエリを実行して保存するメソッドです。
+        キーにはタグのテーブル（と'*'）のバージョンを含めるため、書き込み後は新しいキーで読み直します。
+        """
+        try:
+            versions = self.backend.tag_versions(tags | {'*'})
+        except sqlite3.Error:
+            logger.warning('shared cache unavailable: %s', self.backend.path, exc_info=True)
+            return run()
+        key = 'result:' + hashlib.sha256(
+            repr((query, _freeze(params), compact, sorted(versions.items()))).encode()
+        ).hexdigest()
+        computed = []
+
+        def compute():
+            computed.append(True)
+            return run()
+
+        rows = self.backend.get_or_compute(key, compute, self.ttl)
+        with self._lock:
+            self._counters['misses' if computed else 'hits'] += 1
+        return rows
+
+    def _bump_shared(self, tables):
+        """
+        _bump_sharedメソッドは、プロセス間共有キャッシュのテーブルのバージョンを上げるメソッドです。
+        """
+        if self.backend is None:
+            return
+        try:
+            self.backend.bump_tags(tables)
+        except sqlite3.Error:
+            logger.warning('shared cache unavailable: %s', self.backend.path, exc_info=True)
+
+    def _generation(self, tags):
+        """
+        _generationメソッドは、タグのテーブルとキャッシュ全体の破棄回数を返すメソッドです。
+        ロックを取得した状態で呼び出します。
+        """
+        return [self._generations.get(table, 0) for table in tags] + [self._generations.get('*', 0)]
+
+    def _remove(self, key):
+        """
+        _removeメソッドは、結果を1件破棄するメソッドです。ロックを取得した状態で呼び出します。
+        """
+        _, tags, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        for table in tags:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+
+# プロセス全体で共有するクエリ結果のキャッシュ
+result_cache = ResultCache(backend=get_shared_cache())
+
+
+def get_result_cache_stats():
+    """
+    クエリ結果のキャッシュの集計結果を返す関数
+
+    Returns:
+        dict: ResultCache.statsの戻り値
+    """
+    return result_cache.stats()
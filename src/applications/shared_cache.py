@@ -0,0 +1,441 @@
+"""
+プロセス間で共有するキャッシュ
+
+同じホストのワーカープロセス（gunicornのワーカー等）が、ローカルディスク上のSQLiteファイル
+（WALモード）を通して値を共有します。外部のキャッシュサーバーは不要です。
+参照データや集計結果を1つのワーカーが計算すれば、他のワーカーはそれを読むだけで済み、
+再起動後もファイルに残った値からすぐに応答できます。
+
+値はpickleで保存し、有効期限と合計サイズの上限（最終参照時刻の古いものから破棄）で管理します。
+get_or_computeは同じキーの計算を1つのプロセスだけが行い、他のプロセスは結果を待ちます。
+
+環境変数:
+    SHARED_CACHE_PATH: キャッシュファイルのパス（設定した場合だけ有効。/dev/shm等のローカルディスクを推奨）
+    SHARED_CACHE_MAX_BYTES: 保持する値の合計サイズの上限（バイト、デフォルト64MiB）
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 上限を超えたときに、この割合まで減らす
+EVICT_TARGET_RATIO = 0.9
+# 1件の値に使える上限の割合
+MAX_ENTRY_RATIO = 0.25
+# 計算中のロックの有効期限（秒）。計算したプロセスが異常終了しても、この時間で他のプロセスが引き継ぐ
+DEFAULT_LOCK_TIMEOUT = 30.0
+# 他のプロセスの計算を待つ間隔（秒）
+POLL_INTERVAL = 0.01
+# 最終参照時刻を更新する間隔（秒）。読み込みのたびに書き込まないようにする
+ACCESS_RESOLUTION = 30.0
+# SQLiteのロック待ちの上限（秒）
+BUSY_TIMEOUT = 5.0
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        expires_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_entries_accessed_at ON entries (accessed_at)",
+    """
+    CREATE TABLE IF NOT EXISTS locks (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tags (
+        tag TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('bytes', 0)",
+)
+
+
+class SharedCache:
+    """
+    SharedCacheクラスは、SQLiteファイルを通して複数のプロセスで値を共有するキャッシュです。
+    接続はプロセス・スレッドごとに作成するため、fork後の子プロセスや複数スレッドから安全に使用できます。
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, lock_timeout=DEFAULT_LOCK_TIMEOUT):
+        """
+        __init__メソッドは、SharedCacheクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            path: キャッシュファイルのパス
+            max_bytes: 保持する値の合計サイズの上限（バイト）
+            lock_timeout: 計算中のロックの有効期限（秒）
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+        self._local = threading.local()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def get(self, key):
+        """
+        getメソッドは、キーに対応する値を取得するメソッドです。
+
+        Args:
+            key: キー
+
+        Returns:
+            tuple: (見つかったか, 値)
+        """
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            return False, None
+        if now - row[2] >= ACCESS_RESOLUTION:
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """
+        setメソッドは、キーに値を保存するメソッドです。
+        合計サイズが上限を超えた場合は、最終参照時刻の古い値から破棄します。
+        上限に対して大きすぎる値は保存しません。
+
+        Args:
+            key: キー
+            value: 値（pickleできるオブジェクト）
+            ttl: 有効期限（秒）
+
+        Returns:
+            bool: 保存した場合はTrue
+        """
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        size = len(data) + len(key)
+        if size > self.max_bytes * MAX_ENTRY_RATIO:
+            return False
+        now = time.time()
+        conn = self._connection()
+        with _transaction(conn):
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, size, now + ttl, now)
+            )
+            total = self._add_bytes(conn, size - (old[0] if old else 0))
+            if total > self.max_bytes:
+                self._evict(conn, total, now)
+        return True
+
+    def delete(self, key):
+        """
+        deleteメソッドは、キーに対応する値を削除するメソッドです。
+
+        Args:
+            key: キー
+        """
+        conn = self._connection()
+        with _transaction(conn):
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._add_bytes(conn, -old[0])
+
+    def get_or_compute(self, key, compute, ttl):
+        """
+        get_or_computeメソッドは、値があれば返し、なければ計算して保存するメソッドです。
+        同じキーを複数のプロセスが同時に求めた場合は、ロックを取得した1つのプロセスだけが計算し、
+        他のプロセスは保存されるのを待って読み込みます。
+        キャッシュファイルが他のプロセスにロックされている間は、ロックを取得できるまで待ちます。
+        キャッシュファイルにアクセスできない場合は、計算した値をそのまま返します。
+
+        Args:
+            key: キー
+            compute: 値を計算する関数
+            ttl: 有効期限（秒）
+
+        Returns:
+            object: 値
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                found, value = self.get(key)
+                if found:
+                    return value
+                if self._acquire(key):
+                    break
+            except sqlite3.Error as e:
+                # ロック待ちは他のプロセスの書き込み中なので待ち直す。それ以外は計算した値を返す
+                if not _is_busy(e):
+                    logger.warning('shared cache unavailable: %s', self.path, exc_info=True)
+                    return compute()
+            if time.monotonic() >= deadline:
+                # 計算しているプロセスが応答しない場合は、自分で計算する（保存はしない）
+                return compute()
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            # ロックを待つ間に他のプロセスが保存した可能性がある
+            found, value = _retry_busy(self.get, key)
+            if found:
+                return value
+            value = compute()
+            try:
+                self.set(key, value, ttl)
+            except sqlite3.Error:
+                logger.warning('shared cache unavailable: %s', self.path, exc_info=True)
+            return value
+        finally:
+            self._release(key)
+
+    def tag_versions(self, tags):
+        """
+        tag_versionsメソッドは、タグごとのバージョンを取得するメソッドです。
+        値のキーにバージョンを含めておくと、bump_tagsで古い値を参照しなくなります。
+
+        Args:
+            tags: タグのイテラブル
+
+        Returns:
+            dict: タグとバージョン（未登録のタグは0）
+        """
+        tags = sorted(tags)
+        versions = dict.fromkeys(tags, 0)
+        if tags:
+            rows = self._connection().execute(
+                f"SELECT tag, version FROM tags WHERE tag IN ({', '.join('?' * len(tags))})", tags
+            ).fetchall()
+            versions.update(rows)
+        return versions
+
+    def bump_tags(self, tags):
+        """
+        bump_tagsメソッドは、タグのバージョンを上げるメソッドです。
+
+        Args:
+            tags: タグのイテラブル
+        """
+        conn = self._connection()
+        with _transaction(conn):
+            conn.executemany(
+                "INSERT INTO tags (tag, version) VALUES (?, 1) "
+                "ON CONFLICT (tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags]
+            )
+
+    def stats(self):
+        """
+        statsメソッドは、保持している件数と合計サイズを返すメソッドです。
+
+        Returns:
+            dict: 件数と合計サイズ
+        """
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        return {'entries': entries, 'bytes': total}
+
+    def clear(self):
+        """
+        clearメソッドは、保持している値とロック・タグをすべて削除するメソッドです。
+        """
+        conn = self._connection()
+        with _transaction(conn):
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM locks")
+            conn.execute("DELETE FROM tags")
+            conn.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+
+    def _connection(self):
+        """
+        _connectionメソッドは、このプロセス・スレッド用のSQLite接続を取得するメソッドです。
+        インスタンスで最初の接続の前に、キャッシュファイルを初期化します。
+        """
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            if not self._initialized:
+                with self._init_lock:
+                    if not self._initialized:
+                        _retry_busy(self._initialize)
+                        self._initialized = True
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def _initialize(self):
+        """
+        _initializeメソッドは、キャッシュファイルをWALモードに切り替えてテーブルを作成するメソッドです。
+        WALモードはファイルに保存されるため、接続ごとに切り替える必要はありません。
+        WALモードへの切り替えはSQLiteのロック待ちの対象外のため、呼び出し側で再試行します。
+        """
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with _transaction(conn):
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+        finally:
+            conn.close()
+
+    def _acquire(self, key):
+        """
+        _acquireメソッドは、キーの計算中のロックを取得するメソッドです。
+        期限切れのロックは取得し直します。
+
+        Returns:
+            bool: 取得できた場合はTrue
+        """
+        now = time.time()
+        conn = self._connection()
+        with _transaction(conn):
+            row = conn.execute("SELECT expires_at FROM locks WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, self._owner(), now + self.lock_timeout)
+            )
+        return True
+
+    def _release(self, key):
+        """
+        _releaseメソッドは、このプロセス・スレッドが取得したキーのロックを解放するメソッドです。
+        """
+        try:
+            _retry_busy(
+                self._connection().execute,
+                "DELETE FROM locks WHERE key = ? AND owner = ?", (key, self._owner())
+            )
+        except sqlite3.Error:
+            logger.warning('shared cache unavailable: %s', self.path, exc_info=True)
+
+    @staticmethod
+    def _owner():
+        """
+        _ownerメソッドは、ロックの所有者を表す文字列（プロセスID・スレッドID）を返すメソッドです。
+        """
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    @staticmethod
+    def _add_bytes(conn, delta):
+        """
+        _add_bytesメソッドは、合計サイズを増減して新しい合計を返すメソッドです。
+        トランザクション内で呼び出します。
+        """
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes'", (delta,))
+        return conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self, conn, total, now):
+        """
+        _evictメソッドは、期限切れの値と最終参照時刻の古い値を、上限の一定割合まで削除するメソッドです。
+        トランザクション内で呼び出します。
+        """
+        freed = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?", (now,)).fetchone()[0]
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total -= freed
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        if total > target:
+            victims = []
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+                freed += size
+            conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._add_bytes(conn, -freed)
+
+
+@contextmanager
+def _transaction(conn):
+    """
+    SQLiteの書き込みトランザクション（BEGIN IMMEDIATE）を実行するコンテキストマネージャ
+
+    Args:
+        conn: SQLiteの接続
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _is_busy(error):
+    """
+    SQLiteのエラーが、他の接続のロックによるもの（SQLITE_BUSY・SQLITE_LOCKED）かを判定する関数
+
+    Args:
+        error: SQLiteのエラー
+
+    Returns:
+        bool: ロックによるエラーの場合はTrue
+    """
+    message = str(error)
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in message or 'busy' in message)
+
+
+def _retry_busy(func, *args):
+    """
+    関数を呼び出し、ロックによるエラーの間はBUSY_TIMEOUTまで再試行する関数
+
+    Args:
+        func: 呼び出す関数
+        *args: 関数の引数
+
+    Returns:
+        object: 関数の戻り値
+    """
+    deadline = time.monotonic() + BUSY_TIMEOUT
+    while True:
+        try:
+            return func(*args)
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e) or time.monotonic() >= deadline:
+                raise
+        time.sleep(POLL_INTERVAL)
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    get_shared_cache関数は、環境変数で設定したプロセス間共有キャッシュを取得する関数です。
+    SHARED_CACHE_PATHが設定されていない場合はNoneを返します。
+    """
+    global _shared_cache
+    path = os.getenv('SHARED_CACHE_PATH')
+    if not path:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None or _shared_cache.path != path:
+            _shared_cache = SharedCache(
+                path, max_bytes=int(os.getenv('SHARED_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+            )
+        return _shared_cache
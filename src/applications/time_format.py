@@ -0,0 +1,60 @@
+"""
+時刻の変換・フォーマット
+
+勤怠記録の時刻を、0時からの経過分（整数）とHH:MM形式の文字列との間で変換します。
+"""
+
+from datetime import timedelta
+
+
+def to_minutes(value):
+    """
+    時刻を0時からの経過分に変換する関数
+
+    Args:
+        value: timedelta、time、'HH:MM'または'HH:MM:SS'形式の文字列、None
+
+    Returns:
+        int: 経過分（値がない場合はNone）
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, timedelta):
+        return int(value.total_seconds()) // 60
+    if hasattr(value, 'hour'):
+        return value.hour * 60 + value.minute
+    parts = str(value).split(':')
+    return int(parts[0]) * 60 + int(parts[1])
+
+
+def format_minutes(minutes):
+    """
+    経過分をHH:MM形式の文字列に変換する関数
+
+    Args:
+        minutes: 経過分
+
+    Returns:
+        str: HH:MM形式の文字列（値がない場合はNone）
+    """
+    if minutes is None:
+        return None
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_time(value):
+    """
+    TIME型の値をHH:MM形式の文字列に変換する関数
+
+    MySQLのTIME型はtimedeltaとして取得されるため、timedelta・timeの両方に対応します。
+    それ以外の値（文字列など）はそのまま返します。
+
+    Args:
+        value: timedelta、time、その他の値
+
+    Returns:
+        HH:MM形式の文字列、または元の値
+    """
+    if isinstance(value, timedelta) or hasattr(value, 'strftime'):
+        return format_minutes(to_minutes(value))
+    return value
@@ -0,0 +1,343 @@
+"""
+XLSXのストリーミング出力
+
+XLSX（Office Open XMLのブック）をZIPのストリームとして逐次書き出します。
+ワークシートのXMLは、サーバーサイドカーソル（DBAccess.iter_query）で読んだ行のバッチごとに書き込み、
+圧縮されたバイト列をその都度yieldするため、ブック全体をメモリにもディスクにも保持しません
+（書き込み専用の出力で、行数にかかわらずメモリ使用量は一定です）。
+
+文字列はインライン文字列で書き込みます（共有文字列テーブルは全文字列を保持する必要があるため使いません）。
+1つのシートがExcelの最大行数に達した場合は、続きを「シート名 (2)」、「シート名 (3)」…のシートに書き込みます。
+シートの数は書き終えるまで分からないため、ブックの定義はワークシートの後に書き込みます。
+列の型:
+    string: 文字列
+    number: 数値
+    date: 日付（Excelのシリアル値、yyyy/m/d形式）
+    time: 0時からの経過分（[h]:mm形式）
+    hours: 時間数（0.00形式）
+"""
+
+import re
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape, quoteattr
+
+from flask import Response
+
+MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Excelの日付のシリアル値の基準日
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# XMLに含められない制御文字
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# styles.xmlのcellXfsの番号（見出し・日付・時刻・時間数）
+STYLE_HEADER = 1
+STYLE_DATE = 2
+STYLE_TIME = 3
+STYLE_HOURS = 4
+
+# Excelの1シートの最大行数（見出しの1行を含む）
+MAX_SHEET_ROWS = 1048576
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_STYLES = (
+    _XML_HEADER
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="[h]:mm"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class Sheet:
+    """
+    Sheetクラスは、ストリーミングで書き出す1つのワークシートの定義を保持するクラスです。
+    """
+
+    def __init__(self, name, columns, batches, values):
+        """
+        __init__メソッドは、Sheetクラスのインスタンスを初期化するメソッドです。
+
+        Args:
+            name: シート名（31文字以内）
+            columns: (見出し, 列の型) のタプルのリスト
+            batches: 行のリストをyieldする反復可能オブジェクト（DBAccess.iter_queryの戻り値など）
+            values: 1行をセルの値のタプル（columnsと同じ順）に変換する関数
+        """
+        self.name = name
+        self.columns = columns
+        self.batches = batches
+        self.values = values
+
+
+class _ChunkBuffer:
+    """
+    _ChunkBufferクラスは、ZipFileの出力先として書き込まれたバイト列を溜め、取り出せるようにするクラスです。
+    seekを持たないため、ZipFileはデータ記述子を使う（書き込み後にヘッダーを書き換えない）形式で書き込みます。
+    """
+
+    def __init__(self):
+        """
+        __init__メソッドは、_ChunkBufferクラスのインスタンスを初期化するメソッドです。
+        """
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        """
+        writeメソッドは、書き込まれたバイト列を溜めるメソッドです。
+        """
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        """
+        tellメソッドは、これまでに書き込まれたバイト数を返すメソッドです。
+        """
+        return self._position
+
+    def flush(self):
+        """
+        flushメソッドは、何もしないメソッドです（ZipFileから呼ばれるため）。
+        """
+
+    def drain(self):
+        """
+        drainメソッドは、溜めたバイト列を取り出して空にするメソッドです。
+        """
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def column_name(index):
+    """
+    列番号（0始まり）をExcelの列名に変換する関数
+
+    Args:
+        index: 列番号
+
+    Returns:
+        str: 列名（A、B、…、Z、AA、…）
+    """
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(ord('A') + remainder) + name
+    return name
+
+
+def _cell(ref, kind, value):
+    """
+    1つのセルのXMLを作成する関数（値がNoneの場合は空文字列）
+    """
+    if value is None:
+        return ''
+    if kind == 'string':
+        text = escape(_INVALID_XML_CHARS.sub('', str(value)))
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+    if kind == 'date':
+        return f'<c r="{ref}" s="{STYLE_DATE}"><v>{(value - EXCEL_EPOCH).days}</v></c>'
+    if kind == 'time':
+        return f'<c r="{ref}" s="{STYLE_TIME}"><v>{value / 1440!r}</v></c>'
+    if kind == 'hours':
+        return f'<c r="{ref}" s="{STYLE_HOURS}"><v>{float(value)!r}</v></c>'
+    return f'<c r="{ref}"><v>{value}</v></c>'
+
+
+def _header_row(columns, refs):
+    """
+    見出しの行（1行目）のXMLを作成する関数
+    """
+    cells = ''.join(
+        f'<c r="{ref}1" t="inlineStr" s="{STYLE_HEADER}"><is><t>{escape(title)}</t></is></c>'
+        for ref, (title, _) in zip(refs, columns)
+    )
+    return f'<row r="1">{cells}</row>'
+
+
+def _rows(sheet, refs, batch, first_row):
+    """
+    行のバッチのXMLを作成する関数
+    """
+    kinds = [kind for _, kind in sheet.columns]
+    parts = []
+    for number, row in enumerate(batch, start=first_row):
+        cells = ''.join(_cell(f'{ref}{number}', kind, value)
+                        for ref, kind, value in zip(refs, kinds, sheet.values(row)))
+        parts.append(f'<row r="{number}">{cells}</row>')
+    return ''.join(parts)
+
+
+def _sheet_name(name, number):
+    """
+    ワークシートの名前（31文字以内）を作成する関数。2つ目以降の続きのシートには番号を付ける
+    """
+    if number == 1:
+        return name[:31]
+    suffix = f' ({number})'
+    return name[:31 - len(suffix)] + suffix
+
+
+def _open_worksheet(workbook, index, refs, columns):
+    """
+    ワークシートのパーツを開き、見出しの行までを書き込む関数
+    """
+    # 書き込み前にサイズが分からないため、4GiBを超えてもよいようにZIP64で書き込む
+    part = workbook.open(f'xl/worksheets/sheet{index}.xml', 'w', force_zip64=True)
+    part.write((
+        _XML_HEADER
+        + f'<worksheet xmlns="{_MAIN_NS}"><sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        '</sheetView></sheetViews><sheetData>'
+        + _header_row(columns, refs)
+    ).encode('utf-8'))
+    return part
+
+
+def _static_parts(names):
+    """
+    ワークシート以外のパーツ（パッケージの定義・ブック・スタイル）の (パス, XML) のリストを作成する関数
+
+    Args:
+        names: 書き込んだワークシートの名前のリスト
+    """
+    count = len(names)
+    worksheet_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+    content_types = (
+        _XML_HEADER
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        + ''.join(f'<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="{worksheet_type}"/>'
+                  for index in range(1, count + 1))
+        + '</Types>'
+    )
+    root_rels = (
+        _XML_HEADER
+        + f'<Relationships xmlns="{_PACKAGE_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    )
+    workbook = (
+        _XML_HEADER
+        + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+        + ''.join(f'<sheet name={quoteattr(name)} sheetId="{index}" r:id="rId{index}"/>'
+                  for index, name in enumerate(names, start=1))
+        + '</sheets></workbook>'
+    )
+    workbook_rels = (
+        _XML_HEADER
+        + f'<Relationships xmlns="{_PACKAGE_REL_NS}">'
+        + ''.join(f'<Relationship Id="rId{index}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{index}.xml"/>'
+                  for index in range(1, count + 1))
+        + f'<Relationship Id="rId{count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    return [
+        ('[Content_Types].xml', content_types),
+        ('_rels/.rels', root_rels),
+        ('xl/workbook.xml', workbook),
+        ('xl/_rels/workbook.xml.rels', workbook_rels),
+        ('xl/styles.xml', _STYLES),
+    ]
+
+
+def stream_workbook(sheets):
+    """
+    ワークシートの定義からXLSXのバイト列を逐次生成するジェネレータ
+
+    各ワークシートは行のバッチごとにXMLを書き込んで、ZIPで圧縮されたバイト列をyieldします。
+    シートがMAX_SHEET_ROWSに達した場合は、続きのシートに書き込みます。
+    パッケージの定義とブックは、シートの数が決まった最後に書き込みます。
+
+    Args:
+        sheets: Sheetのリスト
+
+    Yields:
+        bytes: XLSXファイルのチャンク
+    """
+    buffer = _ChunkBuffer()
+    names = []
+    try:
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+            for sheet in sheets:
+                refs = [column_name(column) for column in range(len(sheet.columns))]
+                names.append(_sheet_name(sheet.name, 1))
+                part = _open_worksheet(workbook, len(names), refs, sheet.columns)
+                try:
+                    yield buffer.drain()
+                    next_row, number = 2, 1
+                    for batch in sheet.batches:
+                        while batch:
+                            if next_row > MAX_SHEET_ROWS:
+                                # 最大行数に達したので、続きのシートに書き込む
+                                part.write(b'</sheetData></worksheet>')
+                                part.close()
+                                number += 1
+                                names.append(_sheet_name(sheet.name, number))
+                                part = _open_worksheet(workbook, len(names), refs, sheet.columns)
+                                next_row = 2
+                            rows = batch[:MAX_SHEET_ROWS - next_row + 1]
+                            batch = batch[len(rows):]
+                            part.write(_rows(sheet, refs, rows, next_row).encode('utf-8'))
+                            next_row += len(rows)
+                        data = buffer.drain()
+                        if data:
+                            yield data
+                    part.write(b'</sheetData></worksheet>')
+                finally:
+                    part.close()
+
+            for path, xml in _static_parts(names):
+                workbook.writestr(path, xml)
+        yield buffer.drain()
+    finally:
+        # 途中で応答が閉じられた場合も、サーバーサイドカーソルの接続を解放する
+        for sheet in sheets:
+            close = getattr(sheet.batches, 'close', None)
+            if close is not None:
+                close()
+
+
+def xlsx_response(chunks, filename):
+    """
+    XLSXのチャンクをダウンロードさせる応答を作成する関数
+
+    Args:
+        chunks: XLSXのチャンクをyieldする反復可能オブジェクト
+        filename: ダウンロードするファイル名（ASCII）
+
+    Returns:
+        Response: XLSXのストリーミングの応答
+    """
+    response = Response(chunks, mimetype=MIMETYPE)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    return response
@@ -0,0 +1,65 @@
+// 勤怠記録の履歴を1ページずつ読み込んで表に追加する
+(function() {
+    const section = document.getElementById('history');
+    const form = document.getElementById('history_form');
+    const body = document.getElementById('history_body');
+    const more = document.getElementById('history_more');
+    const message = document.getElementById('history_message');
+    let next = null;
+
+    function cell(text) {
+        const td = document.createElement('td');
+        td.textContent = text || '-';
+        return td;
+    }
+
+    function load(reset) {
+        const params = new URLSearchParams();
+        const from = form.elements['from'].value;
+        const to = form.elements['to'].value;
+        if (from) params.set('from', from);
+        if (to) params.set('to', to);
+        if (!reset && next) params.set('after', next);
+
+        more.disabled = true;
+        fetch(section.dataset.url + '?' + params.toString(), {credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then(function(page) {
+                if (reset) body.textContent = '';
+                page.records.forEach(function(record) {
+                    const tr = document.createElement('tr');
+                    tr.appendChild(cell(record.date));
+                    tr.appendChild(cell(record.attendance_type));
+                    tr.appendChild(cell(record.start_time));
+                    tr.appendChild(cell(record.end_time));
+                    tr.appendChild(cell(record.break_time));
+                    tr.appendChild(cell(record.project_hours.map(function(hours) {
+                        return hours.project_name + ' ' + hours.hours + 'h';
+                    }).join(', ')));
+                    body.appendChild(tr);
+                });
+                next = page.next;
+                more.hidden = !next;
+                message.hidden = body.children.length > 0;
+            })
+            .catch(function() {
+                message.textContent = '履歴を読み込めませんでした。';
+                message.hidden = false;
+            })
+            .finally(function() {
+                more.disabled = false;
+            });
+    }
+
+    form.addEventListener('submit', function(event) {
+        event.preventDefault();
+        load(true);
+    });
+    more.addEventListener('click', function() {
+        load(false);
+    });
+    load(true);
+})();
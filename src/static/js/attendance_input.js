@@ -0,0 +1,22 @@
+// 時間入力を15分単位に制限
+document.getElementById('start_time').addEventListener('change', function() {
+    limitToQuarterHours(this);
+});
+document.getElementById('end_time').addEventListener('change', function() {
+    limitToQuarterHours(this);
+});
+document.getElementById('break_time').addEventListener('change', function() {
+    limitToQuarterHours(this);
+});
+
+function limitToQuarterHours(input) {
+    const time = input.value;
+    if (time) {
+        const [hours, minutes] = time.split(':');
+        const roundedMinutes = Math.round(parseInt(minutes) / 15) * 15;
+        const adjustedHours = Math.floor(roundedMinutes / 60);
+        const finalMinutes = roundedMinutes % 60;
+        const finalHours = parseInt(hours) + adjustedHours;
+        input.value = String(finalHours).padStart(2, '0') + ':' + String(finalMinutes).padStart(2, '0');
+    }
+}
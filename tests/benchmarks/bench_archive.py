@@ -0,0 +1,155 @@
+"""
+締め済み年度のアーカイブのベンチマーク
+
+実際のデータベースで、勤怠記録テーブルのサイズと頻出クエリの実行時間を
+アーカイブの前後で計測します。指定した年度の勤怠記録は実際に移動されるため、
+検証用のデータベースで実行してください。
+
+実行方法:
+    docker compose exec web python tests/benchmarks/bench_archive.py --fiscal-year 2023
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/archive.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.DBAccess import DBAccess
+from applications.archive import archive_fiscal_year
+from applications.monthly_summary import REBUILD_QUERY, month_range
+
+
+def table_sizes(db):
+    """
+    勤怠記録系テーブルの行数とサイズを取得する関数
+
+    Args:
+        db: DBAccessのインスタンス
+
+    Returns:
+        list: テーブル名・行数（概算）・データサイズ・インデックスサイズの行のリスト
+    """
+    db.execute_query(
+        "ANALYZE TABLE attendance_records, project_hours, attendance_records_archive, project_hours_archive"
+    )
+    return db.execute_query("""
+        SELECT table_name AS name, table_rows AS row_count,
+               data_length AS data_bytes, index_length AS index_bytes
+        FROM information_schema.tables
+        WHERE table_schema = DATABASE()
+          AND table_name IN ('attendance_records', 'project_hours',
+                             'attendance_records_archive', 'project_hours_archive')
+        ORDER BY table_name
+    """)
+
+
+def query_latencies(db, repeat):
+    """
+    頻出クエリの実行時間の中央値を計測する関数
+
+    Args:
+        db: DBAccessのインスタンス
+        repeat: 各クエリの実行回数
+
+    Returns:
+        dict: クエリ名と実行時間の中央値（ミリ秒）
+    """
+    today = date.today()
+    first_day, next_month = month_range(today.year, today.month)
+    employee = db.execute_query("SELECT MIN(id) AS id FROM employees")[0]['id']
+    rebuild_query = REBUILD_QUERY.format(where="WHERE date >= %s AND date < %s")
+    queries = {
+        'dashboard': ("""
+            SELECT date, attendance_type, start_minute, end_minute, break_minutes
+            FROM attendance_records
+            WHERE employee_id = %s AND date >= %s
+            ORDER BY date DESC
+            LIMIT 10
+        """, (employee, first_day)),
+        'attendance_view': ("""
+            SELECT ar.*, e.name as employee_name
+            FROM attendance_records ar
+            JOIN employees e ON ar.employee_id = e.id
+            WHERE ar.date = %s
+            LIMIT 1
+        """, (today,)),
+        'monthly_rebuild': (
+            rebuild_query[rebuild_query.index('SELECT'):rebuild_query.index('ON DUPLICATE KEY')],
+            (first_day, next_month) * 2
+        ),
+        'date_range_count': ("""
+            SELECT COUNT(*) AS count
+            FROM attendance_records
+            WHERE date >= %s
+        """, (date(today.year - 1, today.month, 1),)),
+    }
+
+    results = {}
+    for name, (query, params) in queries.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            db.execute_query(query, params)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results[name] = timings[len(timings) // 2]
+    return results
+
+
+def report(title, sizes, latencies):
+    """
+    計測結果を表示する関数
+
+    Args:
+        title: 見出し
+        sizes: table_sizesの結果
+        latencies: query_latenciesの結果
+    """
+    print(f"== {title} ==")
+    for row in sizes:
+        total_mb = ((row['data_bytes'] or 0) + (row['index_bytes'] or 0)) / 1024 / 1024
+        print(f"  {row['name']:<28} {row['row_count'] or 0:>10}行 {total_mb:>10.2f} MB")
+    for name, elapsed_ms in latencies.items():
+        print(f"  {name:<28} {elapsed_ms:>10.2f} ms")
+
+
+def main(argv=None):
+    """
+    アーカイブの前後でテーブルサイズとクエリの実行時間を計測するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='アーカイブの前後でテーブルサイズとクエリの実行時間を計測します。')
+    parser.add_argument('--fiscal-year', type=int, action='append', required=True,
+                        help='アーカイブする年度（複数指定可）')
+    parser.add_argument('--repeat', type=int, default=50, help='各クエリの実行回数')
+    parser.add_argument('--optimize', action='store_true',
+                        help='アーカイブ後に通常のテーブルを再構築し、削除した領域を解放する')
+    args = parser.parse_args(argv)
+
+    db = DBAccess()
+    try:
+        report('アーカイブ前', table_sizes(db), query_latencies(db, args.repeat))
+        for fiscal_year in args.fiscal_year:
+            moved = archive_fiscal_year(db, fiscal_year)
+            print(f"{fiscal_year}年度: {moved}件をアーカイブしました")
+        if args.optimize:
+            db.execute_query("OPTIMIZE TABLE attendance_records, project_hours")
+        report('アーカイブ後', table_sizes(db), query_latencies(db, args.repeat))
+    finally:
+        db.close_connection()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+勤怠記録モデルのマイクロベンチマーク
+
+辞書の行をコピーして時刻をフォーマットする従来の方法と、
+コンパクトな行からAttendanceRecordを生成して時刻を遅延フォーマットする方法について、
+行の変換と時刻の参照にかかる時間と、確保するメモリを比較します。データベースは使用しません。
+
+実行方法:
+    docker compose exec web python tests/benchmarks/bench_record_model.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/models.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.DBAccess import row_class
+from applications.models import AttendanceRecord
+from applications.time_format import format_minutes, format_time
+
+COLUMNS = (
+    'id', 'employee_id', 'date', 'attendance_type', 'start_time', 'end_time', 'break_time',
+    'start_minute', 'end_minute', 'break_minutes', 'work_minutes', 'notes',
+)
+TIME_COLUMNS = (('start_time', 'start_minute'), ('end_time', 'end_minute'), ('break_time', 'break_minutes'))
+
+
+def dict_copy_format(record):
+    """
+    従来の方法（行を辞書にコピーし、すべての時刻をすぐにフォーマットする）
+
+    Args:
+        record: 辞書の行
+
+    Returns:
+        dict: 時刻をフォーマットした行のコピー
+    """
+    formatted_record = dict(record)
+    for time_column, minute_column in TIME_COLUMNS:
+        minutes = formatted_record.get(minute_column)
+        if minutes is not None:
+            formatted_record[time_column] = format_minutes(minutes)
+        elif formatted_record.get(time_column):
+            formatted_record[time_column] = format_time(formatted_record[time_column])
+        else:
+            formatted_record.setdefault(time_column, None)
+    return formatted_record
+
+
+def make_rows(count):
+    """
+    ベンチマーク用の行を、辞書の行とコンパクトな行の両方で生成する関数
+
+    Args:
+        count: 行数
+
+    Returns:
+        tuple: (辞書の行のリスト, コンパクトな行のリスト)
+    """
+    Row = row_class(COLUMNS)
+    values = [
+        (i, 1, date(2025, 1, 1) + timedelta(days=i % 365), '出勤',
+         timedelta(hours=9), timedelta(hours=18), timedelta(hours=1), 540, 1080, 60, 540, '')
+        for i in range(count)
+    ]
+    return [dict(zip(COLUMNS, value)) for value in values], [Row._make(value) for value in values]
+
+
+def run_dict(rows):
+    """
+    従来の方法で行を変換し、テンプレートと同様に時刻を参照する関数
+    """
+    for record in map(dict_copy_format, rows):
+        record['start_time'], record['end_time'], record['break_time']
+
+
+def run_model(rows):
+    """
+    AttendanceRecordで行を変換し、テンプレートと同様に時刻を参照する関数
+    """
+    for record in AttendanceRecord.from_rows(rows):
+        record.start_time, record.end_time, record.break_time
+
+
+def peak_memory(func, rows):
+    """
+    変換後の行を保持した状態で確保したメモリの量を計測する関数
+
+    Returns:
+        int: 確保したメモリのピーク（バイト）
+    """
+    tracemalloc.start()
+    kept = func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return peak
+
+
+def main(argv=None):
+    """
+    2つの方法の実行時間とメモリを計測して表示するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='勤怠記録モデルと辞書のコピーの性能を比較します。')
+    parser.add_argument('--rows', type=int, default=10000, help='1回に変換する行数')
+    parser.add_argument('--repeat', type=int, default=20, help='計測の繰り返し回数')
+    args = parser.parse_args(argv)
+
+    dict_rows, compact_rows = make_rows(args.rows)
+    dict_ms = min(timeit.repeat(lambda: run_dict(dict_rows), number=1, repeat=args.repeat)) * 1000
+    model_ms = min(timeit.repeat(lambda: run_model(compact_rows), number=1, repeat=args.repeat)) * 1000
+    dict_bytes = peak_memory(lambda rows: list(map(dict_copy_format, rows)), dict_rows)
+    model_bytes = peak_memory(AttendanceRecord.from_rows, compact_rows)
+
+    print(f"{args.rows}行あたり")
+    print(f"  辞書のコピー       {dict_ms:>8.2f} ms {dict_bytes / 1024:>10.1f} KiB")
+    print(f"  AttendanceRecord   {model_ms:>8.2f} ms {model_bytes / 1024:>10.1f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
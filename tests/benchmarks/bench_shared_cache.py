@@ -0,0 +1,148 @@
+"""
+プロセス間共有キャッシュのベンチマーク
+
+複数のワーカープロセスが同じキーの集合を参照する負荷で、プロセスごとのキャッシュ（辞書）と
+プロセス間共有キャッシュ（SharedCache）を比較します。計算（クエリ）の回数、全体の所要時間、
+ヒット時の1回あたりの時間、ホスト全体でキャッシュが使うメモリ（値のサイズの合計）を表示します。
+計算はsleepで代用するため、データベースは使用しません。
+
+実行方法:
+    docker compose exec web python tests/benchmarks/bench_shared_cache.py --workers 8 --keys 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/shared_cache.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.shared_cache import SharedCache
+
+
+def make_value(key, rows):
+    """
+    キャッシュする値（月次レポート相当の行のリスト）を作成する関数
+
+    Args:
+        key: キー
+        rows: 行数
+
+    Returns:
+        list: 辞書の行のリスト
+    """
+    return [
+        {'employee_id': i, 'employee_name': f'社員{i:05d}', 'attendance_days': 20,
+         'total_hours': 160.0, 'total_break_hours': 20.0, 'key': key}
+        for i in range(rows)
+    ]
+
+
+def worker(mode, path, keys, requests, compute_ms, rows, seed):
+    """
+    1つのワーカープロセスで、ランダムなキーをrequests回参照する関数
+
+    Args:
+        mode: 'process'（プロセスごとの辞書）または 'shared'（SharedCache）
+        path: SharedCacheのファイルのパス
+        keys: キーの数
+        requests: 参照する回数
+        compute_ms: 1回の計算にかかる時間（ミリ秒）
+        rows: 値の行数
+        seed: 乱数のシード
+
+    Returns:
+        tuple: (計算した回数, ヒットした参照の合計時間（秒）, ヒットした回数, このプロセスが保持する値のサイズ)
+    """
+    rng = random.Random(seed)
+    computed = [0]
+
+    def compute(key):
+        computed[0] += 1
+        time.sleep(compute_ms / 1000)
+        return make_value(key, rows)
+
+    local = {}
+    shared = SharedCache(path, max_bytes=1024 * 1024 * 1024) if mode == 'shared' else None
+    hit_seconds, hits = 0.0, 0
+    for _ in range(requests):
+        key = f'report:{rng.randrange(keys)}'
+        before = computed[0]
+        start = time.perf_counter()
+        if shared is not None:
+            shared.get_or_compute(key, lambda: compute(key), ttl=3600)
+        elif key in local:
+            local[key]
+        else:
+            local[key] = compute(key)
+        if computed[0] == before:
+            hit_seconds += time.perf_counter() - start
+            hits += 1
+    local_bytes = sum(len(pickle.dumps(value)) for value in local.values())
+    return computed[0], hit_seconds, hits, local_bytes
+
+
+def run(mode, args):
+    """
+    ワーカープロセスを起動して、1つの方法の計測結果を集計する関数
+
+    Returns:
+        dict: 計測結果
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite3')
+        tasks = [
+            (mode, path, args.keys, args.requests, args.compute_ms, args.rows, seed)
+            for seed in range(args.workers)
+        ]
+        start = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(args.workers) as pool:
+            results = pool.starmap(worker, tasks)
+        elapsed = time.perf_counter() - start
+        cache_bytes = SharedCache(path).stats()['bytes'] if mode == 'shared' else sum(r[3] for r in results)
+
+    hits = sum(r[2] for r in results)
+    return {
+        'computes': sum(r[0] for r in results),
+        'elapsed': elapsed,
+        'hit_us': sum(r[1] for r in results) / hits * 1e6 if hits else 0.0,
+        'bytes': cache_bytes,
+    }
+
+
+def main(argv=None):
+    """
+    プロセスごとのキャッシュとプロセス間共有キャッシュを計測して表示するメソッド
+
+    Args:
+        argv: コマンドライン引数（省略時はsys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(description='プロセスごとのキャッシュとプロセス間共有キャッシュを比較します。')
+    parser.add_argument('--workers', type=int, default=8, help='ワーカープロセス数')
+    parser.add_argument('--keys', type=int, default=50, help='キーの数（レポートの種類）')
+    parser.add_argument('--requests', type=int, default=500, help='ワーカーごとの参照回数')
+    parser.add_argument('--compute-ms', type=float, default=20, help='1回の計算にかかる時間（ミリ秒）')
+    parser.add_argument('--rows', type=int, default=200, help='値の行数')
+    args = parser.parse_args(argv)
+
+    print(f"ワーカー{args.workers}、キー{args.keys}、ワーカーごとに{args.requests}回参照")
+    print(f"  {'方法':<12} {'計算回数':>8} {'所要時間':>10} {'ヒット時':>10} {'キャッシュ':>12}")
+    for mode, label in (('process', 'プロセスごと'), ('shared', '共有')):
+        result = run(mode, args)
+        print(f"  {label:<12} {result['computes']:>8} {result['elapsed']:>9.2f}s "
+              f"{result['hit_us']:>8.1f}us {result['bytes'] / 1024:>9.1f}KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
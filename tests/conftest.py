@@ -6,6 +6,7 @@ pytestの共通設定とfixtureを定義します。
 
 import pytest
 import os
+import sys
 
 
 @pytest.fixture(scope="session")
@@ -29,3 +30,18 @@ def test_base_url():
     """
     return os.getenv('TEST_BASE_URL', 'http://web:5000')
 
+
+@pytest.fixture(autouse=True)
+def clear_reference_cache():
+    """
+    参照データ・クエリ結果のプロセス内キャッシュをテストごとに破棄するfixture
+
+    前のテストでキャッシュしたデータ（モックの行）が、次のテストに持ち越されないようにします。
+    """
+    module = sys.modules.get('applications.reference_cache')
+    if module is not None:
+        module.reference_cache.clear()
+    module = sys.modules.get('applications.result_cache')
+    if module is not None:
+        module.result_cache.clear()
+    yield
@@ -0,0 +1,87 @@
+"""
+条件付きGETの統合テスト
+
+実際のデータベースに対して、ダッシュボードと勤怠記録詳細が変更のない再読み込みに304を返し、
+勤怠記録を更新した後は新しいETagで表示されることを確認します。
+"""
+
+import pytest
+import time
+from datetime import date
+from app import app
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+import hashlib
+
+
+class TestConditionalGet:
+    """
+    条件付きGETのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、テスト用の社員と今日の勤怠記録を作成します。
+        """
+        migrate()
+        self.db = DBAccess()
+
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_query("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, ('conditional_get_test@example.com', password_hash, '条件付きGET テスト', 'employee'))
+        self.employee_id = self.db.execute_query(
+            "SELECT id FROM employees WHERE email = %s", ('conditional_get_test@example.com',)
+        )[0]['id']
+        self.test_date = date.today()
+        self.db.execute_query("""
+            INSERT IGNORE INTO attendance_records
+            (employee_id, date, attendance_type, start_time, end_time, break_time)
+            VALUES (%s, %s, '出勤', '09:00:00', '18:00:00', '01:00:00')
+        """, (self.employee_id, self.test_date))
+        self.db.commit()
+        # 同じ秒のうちの更新は検知できないため、最終更新から1秒経ってから表示する
+        time.sleep(1.1)
+
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.employee_id
+            sess['user_email'] = 'conditional_get_test@example.com'
+            sess['user_name'] = '条件付きGET テスト'
+            sess['user_role'] = 'employee'
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員と勤怠記録を削除します。
+        """
+        self.db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (self.employee_id,))
+        self.db.execute_query("DELETE FROM employees WHERE id = %s", (self.employee_id,))
+        self.db.commit()
+        self.db.close_connection()
+
+    @pytest.mark.parametrize('path', ['/dashboard', '/attendance/view/{date}'])
+    def test_not_modified_until_updated(self, path):
+        """
+        変更がなければ304を返し、勤怠記録の更新後は新しいETagで表示されることを確認します。
+        """
+        url = path.format(date=self.test_date.isoformat())
+        first = self.client.get(url)
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+
+        assert self.client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+        self.db.execute_query(
+            "UPDATE attendance_records SET notes = %s WHERE employee_id = %s AND date = %s",
+            ('更新', self.employee_id, self.test_date)
+        )
+        self.db.commit()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers.get('ETag') != etag
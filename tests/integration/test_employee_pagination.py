@@ -0,0 +1,87 @@
+"""
+社員一覧のページ分割の統合テスト
+
+実際のデータベースに対して、社員一覧を前後のページへ移動したときに社員が重複・欠落せず、
+名前・メールアドレスの前方一致の検索がUNIONのクエリで正しく動くことを確認します。
+"""
+
+from app import app
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+from applications import employee_directory
+import hashlib
+
+# テスト用の社員（名前が同じ社員を含めて、idでの並びも確認する）
+NAMES = ['頁送り 青木', '頁送り 伊藤', '頁送り 伊藤', '頁送り 上田', '頁送り 江口', '頁送り 小川', '頁送り 加藤']
+
+
+class TestEmployeePagination:
+    """
+    社員一覧のページ分割のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、テスト用の社員を作成します。
+        """
+        migrate()
+        self.db = DBAccess()
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_many("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, 'employee')
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, [(f'paging_test{index}@example.com', password_hash, name) for index, name in enumerate(NAMES)])
+        self.db.commit()
+        rows = self.db.execute_query(
+            "SELECT id, name FROM employees WHERE email LIKE 'paging\\_test%%' ORDER BY name, id"
+        )
+        self.expected = [row['id'] for row in rows]
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員を削除します。
+        """
+        self.db.execute_query("DELETE FROM employees WHERE email LIKE 'paging\\_test%%'")
+        self.db.commit()
+        self.db.close_connection()
+
+    def test_forward_and_backward(self):
+        """
+        前方一致の検索結果を3件ずつ最後まで進み、前のページへ戻っても同じ社員が表示されることを確認します。
+        """
+        pages = [employee_directory.fetch_page(self.db, '頁送り', 3)]
+        while pages[-1].next_cursor:
+            pages.append(employee_directory.fetch_page(self.db, '頁送り', 3, after=pages[-1].next_cursor))
+
+        assert [row['id'] for page in pages for row in page.rows] == self.expected
+        previous = employee_directory.fetch_page(self.db, '頁送り', 3, before=pages[1].prev_cursor)
+        assert [row['id'] for row in previous.rows] == [row['id'] for row in pages[0].rows]
+
+    def test_search_by_email(self):
+        """
+        メールアドレスの前方一致で検索できることを確認します。
+        """
+        page = employee_directory.fetch_page(self.db, 'paging_test1@', 10)
+
+        assert [row['email'] for row in page.rows] == ['paging_test1@example.com']
+
+    def test_page(self):
+        """
+        社員一覧画面が検索結果の1ページ分だけを表示することを確認します。
+        """
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = self.expected[0]
+            sess['user_email'] = 'paging_test0@example.com'
+            sess['user_name'] = NAMES[0]
+            sess['user_role'] = 'manager'
+
+        html = client.get('/employees?q=頁送り&size=2').data.decode('utf-8')
+
+        assert html.count('paging_test') == 2
+        assert '次のページ' in html
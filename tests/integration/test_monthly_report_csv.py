@@ -0,0 +1,87 @@
+"""
+月次レポートのCSVダウンロードの統合テスト
+
+実際のデータベースに対して、CSVの各社員の出勤日数・時間が月次レポートの画面の値と一致することを確認します。
+"""
+
+import csv
+import io
+import re
+from datetime import date
+from app import app
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+from applications import monthly_summary
+import hashlib
+
+
+class TestMonthlyReportCsv:
+    """
+    月次レポートのCSVダウンロードのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、テスト用の社員と2025年1月の勤怠記録を作成して集計します。
+        """
+        migrate()
+        self.db = DBAccess()
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_query("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, ('report_csv_test@example.com', password_hash, 'CSV テスト', 'manager'))
+        self.employee_id = self.db.execute_query(
+            "SELECT id FROM employees WHERE email = %s", ('report_csv_test@example.com',)
+        )[0]['id']
+        self.db.execute_many("""
+            INSERT IGNORE INTO attendance_records
+            (employee_id, date, attendance_type, start_time, end_time, break_time,
+             start_minute, end_minute, break_minutes)
+            VALUES (%s, %s, '出勤', %s, %s, %s, %s, %s, %s)
+        """, [
+            (self.employee_id, date(2025, 1, 6), '09:00:00', '18:15:00', '01:00:00', 540, 1095, 60),
+            (self.employee_id, date(2025, 1, 7), '08:45:00', '17:30:00', '00:45:00', 525, 1050, 45),
+        ])
+        monthly_summary.rebuild_month(self.db, 2025, 1)
+        self.db.commit()
+
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.employee_id
+            sess['user_email'] = 'report_csv_test@example.com'
+            sess['user_name'] = 'CSV テスト'
+            sess['user_role'] = 'manager'
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員と勤怠記録を削除し、集計をやり直します。
+        """
+        self.db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (self.employee_id,))
+        self.db.execute_query("DELETE FROM employees WHERE id = %s", (self.employee_id,))
+        monthly_summary.rebuild_month(self.db, 2025, 1)
+        self.db.commit()
+        self.db.close_connection()
+
+    def test_csv_matches_html(self):
+        """
+        CSVの全社員の値が、月次レポートの画面の表の値と同じ順・同じ値であることを確認します。
+        """
+        html = self.client.get('/report/monthly?year=2025&month=1').data.decode('utf-8')
+        response = self.client.get('/report/monthly.csv?year=2025&month=1')
+        assert response.status_code == 200
+        csv_rows = list(csv.reader(io.StringIO(response.data.decode('utf-8-sig'))))[1:]
+
+        body = html.split('<tbody>')[1].split('</tbody>')[0]
+        html_rows = [[cell.strip() for cell in re.findall(r'<td>(.*?)</td>', row, re.S)]
+                     for row in re.findall(r'<tr>(.*?)</tr>', body, re.S)]
+        # 社員名はHTMLでエスケープされるため、数値の列と件数で比較する
+        assert len(html_rows) == len(csv_rows)
+        assert [row[1:] for row in html_rows] == [row[2:] for row in csv_rows]
+        mine = [row for row in csv_rows if row[0] == str(self.employee_id)]
+        assert mine == [[str(self.employee_id), 'CSV テスト', '2', '18.00', '1.75', '16.25']]
@@ -0,0 +1,145 @@
+"""
+勤怠記録テーブルのパーティションプルーニングの統合テスト
+
+実際のデータベースに対して、月で絞り込むクエリをEXPLAINし、
+該当する月のパーティションだけが読まれることを確認します。
+"""
+
+from datetime import date
+from unittest.mock import patch
+from app import app
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+from applications.monthly_summary import REBUILD_QUERY, month_range
+from applications.partitions import ensure_future_partitions, list_partitions, partition_name
+import hashlib
+
+
+class TestPartitionPruning:
+    """
+    パーティションプルーニングのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、先の月までのパーティションとテスト用の社員・勤怠記録を作成します。
+        """
+        migrate()
+        self.db = DBAccess()
+        ensure_future_partitions(self.db)
+
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_query("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, ('partition_test@example.com', password_hash, 'パーティション テスト', 'manager'))
+        self.employee_id = self.db.execute_query(
+            "SELECT id FROM employees WHERE email = %s", ('partition_test@example.com',)
+        )[0]['id']
+        self.test_date = date.today()
+        self.db.execute_query("""
+            INSERT IGNORE INTO attendance_records
+            (employee_id, date, attendance_type, start_time, end_time, break_time)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (self.employee_id, self.test_date, '出勤', '09:00:00', '18:00:00', '01:00:00'))
+        self.db.commit()
+
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.employee_id
+            sess['user_email'] = 'partition_test@example.com'
+            sess['user_name'] = 'パーティション テスト'
+            sess['user_role'] = 'manager'
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員と勤怠記録を削除します。
+        """
+        self.db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (self.employee_id,))
+        self.db.execute_query("DELETE FROM employees WHERE id = %s", (self.employee_id,))
+        self.db.commit()
+        self.db.close_connection()
+
+    def explain_partitions(self, query, params):
+        """
+        クエリが読む勤怠記録テーブルのパーティションを返すメソッド
+
+        Args:
+            query: SQL文
+            params: パラメータ
+
+        Returns:
+            set: パーティション名の集合
+        """
+        partitions = set()
+        for row in self.db.execute_query("EXPLAIN " + query, params):
+            if row['table'] in ('attendance_records', 'ar') and row['partitions']:
+                partitions.update(row['partitions'].split(','))
+        return partitions
+
+    def route_partitions(self, url):
+        """
+        画面が発行するSELECT文のうち、勤怠記録テーブルを読むものが読むパーティションを返すメソッド
+
+        Args:
+            url: 表示する画面のURL
+
+        Returns:
+            set: パーティション名の集合
+        """
+        captured = []
+        original = DBAccess.execute_query
+
+        def recording_execute_query(db, query, params=None, **kwargs):
+            if query.lstrip().upper().startswith('SELECT') and 'attendance_records' in query:
+                captured.append((query, params))
+            return original(db, query, params, **kwargs)
+
+        with patch.object(DBAccess, 'execute_query', recording_execute_query):
+            response = self.client.get(url)
+        assert response.status_code == 200
+        assert captured
+
+        partitions = set()
+        for query, params in captured:
+            partitions.update(self.explain_partitions(query, params))
+        return partitions
+
+    def test_attendance_view_reads_one_partition(self):
+        """
+        勤怠記録詳細が当月のパーティションだけを読むことを確認します。
+        """
+        partitions = self.route_partitions(f'/attendance/view/{self.test_date.isoformat()}')
+
+        assert partitions == {partition_name(self.test_date)}
+
+    def test_dashboard_reads_recent_partitions(self):
+        """
+        ダッシュボードが今月以降のパーティションだけを読むことを確認します。
+        """
+        first_day = self.test_date.replace(day=1)
+        expected = {
+            name for name, upper in list_partitions(self.db)
+            if upper is None or upper > first_day
+        }
+
+        partitions = self.route_partitions('/dashboard')
+
+        assert partitions == expected
+
+    def test_rebuild_month_reads_one_partition(self):
+        """
+        月次集計の再計算が指定月のパーティションだけを読むことを確認します。
+        """
+        first_day, next_month = month_range(self.test_date.year, self.test_date.month)
+        query = REBUILD_QUERY.format(where="WHERE date >= %s AND date < %s")
+        select = query[query.index('SELECT'):query.index('ON DUPLICATE KEY')]
+
+        partitions = self.explain_partitions(select, (first_day, next_month) * 2)
+
+        assert partitions == {partition_name(self.test_date)}
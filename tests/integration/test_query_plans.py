@@ -0,0 +1,149 @@
+"""
+頻出クエリの実行計画の統合テスト
+
+実際のデータベースに対してapp.pyの各画面が発行するSELECT文をEXPLAINし、
+勤怠記録・プロジェクト作業時間のテーブルがフルスキャンされないことを確認します。
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+from app import app
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+import hashlib
+
+# 全件を読むことが仕様上必要な参照系テーブル（社員一覧・プロジェクト一覧）
+FULL_SCAN_ALLOWED_TABLES = {'employees', 'e', 'projects', 'p'}
+
+# オプティマイザがインデックスを選ぶよう、集計対象外の過去の期間に投入する件数
+BACKGROUND_DAYS = 400
+
+
+class TestQueryPlans:
+    """
+    頻出クエリの実行計画のテストクラス
+
+    各画面で発行されるクエリを記録し、その実行計画を検証します。
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、テスト用の社員と勤怠記録を作成します。
+        """
+        migrate()
+        self.db = DBAccess()
+
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_query("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, ('query_plan_test@example.com', password_hash, '実行計画 テスト', 'manager'))
+        self.employee_id = self.db.execute_query(
+            "SELECT id FROM employees WHERE email = %s", ('query_plan_test@example.com',)
+        )[0]['id']
+
+        self.test_date = date.today()
+        background_start = date(2001, 1, 1)
+        rows = [
+            (self.employee_id, background_start + timedelta(days=offset), '出勤', '09:00:00', '18:00:00', '01:00:00')
+            for offset in range(BACKGROUND_DAYS)
+        ]
+        rows.append((self.employee_id, self.test_date, '出勤', '09:00:00', '18:00:00', '01:00:00'))
+        self.db.execute_many("""
+            INSERT IGNORE INTO attendance_records
+            (employee_id, date, attendance_type, start_time, end_time, break_time)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows)
+        self.db.commit()
+        self.db.execute_query("ANALYZE TABLE attendance_records, project_hours, employees")
+
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.employee_id
+            sess['user_email'] = 'query_plan_test@example.com'
+            sess['user_name'] = '実行計画 テスト'
+            sess['user_role'] = 'manager'
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員と勤怠記録を削除します。
+        """
+        self.db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (self.employee_id,))
+        self.db.execute_query("DELETE FROM employees WHERE id = %s", (self.employee_id,))
+        self.db.commit()
+        self.db.close_connection()
+
+    def capture_queries(self, url):
+        """
+        画面を表示し、その間に発行されたSELECT文とパラメータを記録するメソッド
+
+        Args:
+            url: 表示する画面のURL
+
+        Returns:
+            list: (SQL文, パラメータ) のリスト
+        """
+        captured = []
+        original = DBAccess.execute_query
+
+        def recording_execute_query(db, query, params=None, **kwargs):
+            if query.lstrip().upper().startswith('SELECT'):
+                captured.append((query, params))
+            return original(db, query, params, **kwargs)
+
+        with patch.object(DBAccess, 'execute_query', recording_execute_query):
+            response = self.client.get(url)
+        assert response.status_code == 200
+        assert captured
+        return captured
+
+    def assert_no_full_scan(self, url):
+        """
+        画面が発行するクエリに勤怠記録系テーブルのフルスキャンがないことを確認するメソッド
+
+        Args:
+            url: 表示する画面のURL
+        """
+        for query, params in self.capture_queries(url):
+            plan = self.db.execute_query("EXPLAIN " + query, params)
+            for row in plan:
+                if row['table'] in FULL_SCAN_ALLOWED_TABLES or row['table'] is None:
+                    continue
+                assert row['type'] != 'ALL', f"フルスキャン: table={row['table']} sql={query}"
+
+    def test_dashboard_query_plan(self):
+        """
+        ダッシュボードのクエリがインデックスを使用することを確認します。
+        """
+        self.assert_no_full_scan('/dashboard')
+
+    def test_attendance_view_query_plan(self):
+        """
+        勤怠記録詳細のクエリがインデックスを使用することを確認します。
+        """
+        self.assert_no_full_scan(f'/attendance/view/{self.test_date.isoformat()}')
+
+    def test_attendance_input_query_plan(self):
+        """
+        勤怠入力画面のクエリがインデックスを使用することを確認します。
+        """
+        self.assert_no_full_scan(f'/attendance/input?date={self.test_date.isoformat()}')
+
+    def test_monthly_report_query_plan(self):
+        """
+        月次レポートのクエリがインデックスを使用することを確認します。
+        """
+        self.assert_no_full_scan(f'/report/monthly?year={self.test_date.year}&month={self.test_date.month}')
+
+    def test_project_report_query_plan(self):
+        """
+        プロジェクト別レポートの集計のクエリがインデックスを使用することを確認します。
+        """
+        date_from = self.test_date.replace(day=1).isoformat()
+        self.assert_no_full_scan(f'/report/projects?from={date_from}&to={self.test_date.isoformat()}')
+        self.assert_no_full_scan(f'/report/projects?from={date_from}&to={self.test_date.isoformat()}&project_id=1')
@@ -0,0 +1,85 @@
+"""
+期間レポートの統合テスト
+
+実際のデータベースに対して、社員×月の表の各月の値が月次レポートの集計と一致することを確認します。
+"""
+
+from datetime import date
+from decimal import Decimal
+from applications.DBAccess import DBAccess
+from applications.db_init import migrate
+from applications import monthly_summary, pagination, range_report
+import hashlib
+
+
+class TestRangeReport:
+    """
+    期間レポートのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        マイグレーションを最新まで適用し、テスト用の社員と2024年12月・2025年2月の勤怠記録を作成して集計します。
+        """
+        migrate()
+        self.db = DBAccess()
+        password_hash = hashlib.sha256('password123'.encode()).hexdigest()
+        self.db.execute_query("""
+            INSERT INTO employees (email, password, name, role)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE name = VALUES(name)
+        """, ('range_report_test@example.com', password_hash, '期間レポート テスト', 'employee'))
+        self.employee_id = self.db.execute_query(
+            "SELECT id FROM employees WHERE email = %s", ('range_report_test@example.com',)
+        )[0]['id']
+        self.db.execute_many("""
+            INSERT IGNORE INTO attendance_records
+            (employee_id, date, attendance_type, start_time, end_time, break_time,
+             start_minute, end_minute, break_minutes)
+            VALUES (%s, %s, '出勤', %s, %s, %s, %s, %s, %s)
+        """, [
+            (self.employee_id, date(2024, 12, 2), '09:00:00', '18:00:00', '01:00:00', 540, 1080, 60),
+            (self.employee_id, date(2025, 2, 3), '09:00:00', '18:15:00', '01:00:00', 540, 1095, 60),
+            (self.employee_id, date(2025, 2, 4), '08:45:00', '17:30:00', '00:45:00', 525, 1050, 45),
+        ])
+        for year, month in ((2024, 12), (2025, 2)):
+            monthly_summary.rebuild_month(self.db, year, month)
+        self.db.commit()
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        テスト用の社員と勤怠記録を削除し、集計をやり直します。
+        """
+        self.db.execute_query("DELETE FROM attendance_records WHERE employee_id = %s", (self.employee_id,))
+        self.db.execute_query("DELETE FROM employees WHERE id = %s", (self.employee_id,))
+        for year, month in ((2024, 12), (2025, 2)):
+            monthly_summary.rebuild_month(self.db, year, month)
+        self.db.commit()
+        self.db.close_connection()
+
+    def test_matrix_matches_monthly_report(self):
+        """
+        年をまたぐ期間の各月の値と合計が、月ごとの月次レポートの値と一致することを確認します。
+        """
+        months = range_report.month_span((2024, 12), (2025, 2))
+        # テスト用の社員の直前からページを読む
+        cursor = pagination.encode_cursor(('期間レポート テスト', self.employee_id - 1))
+
+        page = range_report.fetch_matrix(self.db, months, size=1, after=cursor)
+
+        row = page.rows[0]
+        assert row.employee_id == self.employee_id
+        for (year, month), cell in zip(months, row.cells):
+            report = [r for r in self.db.execute_query(monthly_summary.REPORT_QUERY, (year, month))
+                      if r['employee_id'] == self.employee_id][0]
+            if cell is None:
+                assert report['attendance_days'] == 0
+            else:
+                assert (cell.attendance_days, cell.total_hours, cell.total_break_hours) == \
+                    (report['attendance_days'], report['total_hours'], report['total_break_hours'])
+        assert row.cells[1] is None
+        assert row.totals == (3, Decimal('27.0000'), Decimal('2.7500'))
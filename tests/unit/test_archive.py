@@ -0,0 +1,216 @@
+"""
+archive.pyの単体テスト
+
+年度の判定、締め済み年度の勤怠記録の移動、アーカイブからの勤怠記録詳細の表示をテストします。
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+from datetime import date, timedelta
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import archive
+
+
+class TestArchive:
+    """
+    締め済み年度のアーカイブのテストクラス
+    """
+
+    def test_fiscal_year(self):
+        """
+        4月始まりの年度と、その範囲が計算されることを確認します。
+        """
+        assert archive.fiscal_year_of(date(2024, 3, 31)) == 2023
+        assert archive.fiscal_year_of(date(2024, 4, 1)) == 2024
+        assert archive.fiscal_year_range(2023) == (date(2023, 4, 1), date(2024, 4, 1))
+
+    @pytest.mark.parametrize('date_str, expected', [
+        ('2024-03-31', True),
+        ('2024-04-01', False),
+        ('2025-01-10', False),
+        ('invalid', False),
+    ])
+    def test_may_be_archived(self, date_str, expected):
+        """
+        締め済みの年度の日付だけがアーカイブの対象と判定されることを確認します。
+        """
+        assert archive.may_be_archived(date_str, today=date(2025, 1, 10)) is expected
+
+    def test_archive_open_fiscal_year(self):
+        """
+        締められていない年度を指定した場合、エラーになることを確認します。
+        """
+        db = MagicMock()
+
+        with pytest.raises(ValueError):
+            archive.archive_fiscal_year(db, 2024, today=date(2025, 1, 10))
+        db.execute_query.assert_not_called()
+
+    def test_archive_fiscal_year(self):
+        """
+        勤怠記録がバッチごとにコピー・削除・コミットされ、アーカイブ済みの年度が記録されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.side_effect = [
+            [{'id': 1}, {'id': 2}],  # 1回目のバッチ
+            [], [], [], [],  # コピーと削除
+            [],  # 残りなし
+            [],  # アーカイブ済みの年度の記録
+        ]
+
+        moved = archive.archive_fiscal_year(db, 2023, batch_size=2, today=date(2025, 1, 10))
+
+        assert moved == 2
+        statements = [call.args[0] for call in db.execute_query.call_args_list]
+        assert 'INSERT IGNORE INTO project_hours_archive' in statements[1]
+        assert 'INSERT IGNORE INTO attendance_records_archive' in statements[2]
+        assert 'DELETE FROM project_hours' in statements[3]
+        assert 'DELETE FROM attendance_records' in statements[4]
+        assert db.execute_query.call_args_list[4].args[1] == (date(2023, 4, 1), date(2024, 4, 1), 1, 2)
+        assert db.execute_query.call_args_list[6].args[1] == (2023, 2)
+        assert db.commit.call_count == 2
+
+    def test_main_requires_fiscal_year(self):
+        """
+        年度も--listも指定しない場合、エラーになることを確認します。
+        """
+        with pytest.raises(SystemExit):
+            archive.main([])
+
+
+class TestArchivedAttendanceView:
+    """
+    アーカイブした勤怠記録の詳細表示のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        テストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = 'employee'
+
+    @patch('app.DBAccess')
+    def test_view_reads_archive(self, mock_dbaccess):
+        """
+        通常のテーブルにない締め済み年度の記録が、アーカイブテーブルから表示されることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.execute_query.side_effect = [
+            [],  # 通常のテーブルにはない
+            [{
+                'id': 1,
+                'employee_id': 1,
+                'date': date(2020, 5, 1),
+                'attendance_type': '出勤',
+                'start_time': timedelta(hours=9),
+                'end_time': timedelta(hours=18),
+                'break_time': timedelta(hours=1),
+                'notes': '',
+                'employee_name': 'Employee User'
+            }],
+            [{'project_id': 1, 'project_name': 'Project A', 'hours': 8.0}]
+        ]
+        mock_dbaccess.return_value = mock_db_instance
+
+        response = self.client.get('/attendance/view/2020-05-01')
+
+        assert response.status_code == 200
+        queries = [call.args[0] for call in mock_db_instance.execute_query.call_args_list]
+        assert 'FROM attendance_records_archive ar' in queries[1]
+        assert 'FROM project_hours_archive ph' in queries[2]
+
+    @patch('app.DBAccess')
+    def test_view_current_year_skips_archive(self, mock_dbaccess):
+        """
+        今年度の日付の記録がない場合、アーカイブテーブルを読まないことを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.execute_query.return_value = []
+        mock_dbaccess.return_value = mock_db_instance
+
+        response = self.client.get(f'/attendance/view/{date.today().isoformat()}')
+
+        assert response.status_code == 302
+        mock_db_instance.execute_query.assert_called_once()
+
+
+class TestArchivedAttendanceInput:
+    """
+    締め済み年度の勤怠入力のテストクラス
+    """
+
+    FORM = {
+        'date': '2020-05-01',
+        'attendance_type': '出勤',
+        'start_time': '09:00',
+        'end_time': '18:00',
+        'break_time': '01:00',
+    }
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        テストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = 'employee'
+
+    @patch('app.DBAccess')
+    def test_archived_record_is_rejected(self, mock_dbaccess):
+        """
+        アーカイブ済みの記録がある日付は、通常のテーブルに記録を作成せずに拒否されることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.execute_query.return_value = [{'id': 1}]
+        mock_dbaccess.return_value = mock_db_instance
+
+        response = self.client.post('/attendance/input', data=self.FORM)
+
+        assert response.status_code == 302
+        assert '/attendance/input' in response.location
+        query = mock_db_instance.execute_query.call_args.args[0]
+        assert 'FROM attendance_records_archive' in query
+        mock_db_instance.execute_query.assert_called_once()
+        mock_db_instance.get_cursor.assert_not_called()
+        mock_db_instance.commit.assert_not_called()
+
+    @patch('app.DBAccess')
+    def test_closed_year_without_archived_record(self, mock_dbaccess):
+        """
+        締め済み年度でもアーカイブ済みの記録がない日付は、通常のテーブルに作成されることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.get_cursor.return_value.lastrowid = 1
+        mock_db_instance.execute_query.side_effect = [
+            [],  # アーカイブ済みの記録なし
+            [],  # 既存記録なし
+            [{'id': 1, 'name': 'Project A'}],  # プロジェクト一覧
+            [],  # project_hours削除
+        ]
+        mock_dbaccess.return_value = mock_db_instance
+
+        response = self.client.post('/attendance/input', data=self.FORM)
+
+        assert response.status_code == 302
+        assert '/dashboard' in response.location
+        mock_db_instance.commit.assert_called()
@@ -0,0 +1,139 @@
+"""
+assets.pyの単体テスト
+
+静的ファイルのハッシュ付きのファイル名での出力・圧縮、テンプレートからの参照、
+圧縮済みファイルの配信とキャッシュヘッダーをテストします。
+"""
+
+import gzip
+import json
+import pytest
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import assets
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """
+    CSSとJavaScriptを1つずつ持つstaticディレクトリを作成するfixture
+    """
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'css' / 'app.css').write_text('body { color: #333; }\n' * 50)
+    (tmp_path / 'js' / 'app.js').write_text('console.log(1);\n')
+    return str(tmp_path)
+
+
+class TestBuild:
+    """
+    ビルドのテストクラス
+    """
+
+    def test_build_outputs_hashed_and_compressed_files(self, static_dir):
+        """
+        ハッシュ付きのファイル名で出力され、gzipのファイルが同じ内容に展開できることを確認します。
+        """
+        manifest = assets.build(static_dir)
+
+        target = manifest['css/app.css']
+        assert target.startswith('css/app.') and target.endswith('.css')
+        dist = os.path.join(static_dir, 'dist')
+        with open(os.path.join(dist, target), 'rb') as f:
+            content = f.read()
+        with open(os.path.join(dist, target + '.gz'), 'rb') as f:
+            assert gzip.decompress(f.read()) == content
+        with open(os.path.join(dist, 'manifest.json'), encoding='utf-8') as f:
+            assert json.load(f) == manifest
+
+    def test_brotli(self, static_dir):
+        """
+        brotliパッケージがある場合、brotliで圧縮したファイルも出力されることを確認します。
+        """
+        brotli = pytest.importorskip('brotli')
+        target = assets.build(static_dir)['js/app.js']
+
+        with open(os.path.join(static_dir, 'dist', target + '.br'), 'rb') as f:
+            assert brotli.decompress(f.read()) == b'console.log(1);\n'
+
+    def test_hash_changes_with_content(self, static_dir):
+        """
+        内容を変更するとファイル名が変わり、ビルドするまで最新ではないと判定されることを確認します。
+        """
+        before = assets.build(static_dir)['css/app.css']
+        assert assets.is_up_to_date(static_dir)
+
+        with open(os.path.join(static_dir, 'css', 'app.css'), 'a') as f:
+            f.write('h1 { margin: 0; }\n')
+
+        assert not assets.is_up_to_date(static_dir)
+        assert assets.build(static_dir)['css/app.css'] != before
+
+
+class TestServe:
+    """
+    テンプレートからの参照と配信のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        アプリケーションのstaticディレクトリをビルドし、テストクライアントを初期化します。
+        """
+        self.manifest = assets.build(app.static_folder)
+        assets.reset_manifest()
+        self.client = app.test_client()
+
+    def teardown_method(self):
+        """
+        読み込んだ対応表を破棄します。
+        """
+        assets.reset_manifest()
+
+    def test_template_references_hashed_css(self):
+        """
+        ページがCSSをインラインで含まず、ハッシュ付きのURLで参照することを確認します。
+        """
+        html = self.client.get('/login').data.decode('utf-8')
+
+        assert f"/assets/{self.manifest['css/app.css']}" in html
+        assert '<style>' not in html
+
+    def test_serve_gzip(self):
+        """
+        gzipを受け付ける場合、圧縮済みのファイルがimmutableのキャッシュヘッダー付きで返されることを確認します。
+        """
+        response = self.client.get(f"/assets/{self.manifest['css/app.css']}",
+                                   headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype == 'text/css'
+        assert 'immutable' in response.headers['Cache-Control']
+        assert 'max-age=31536000' in response.headers['Cache-Control']
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        with open(os.path.join(app.static_folder, 'css', 'app.css'), 'rb') as f:
+            assert gzip.decompress(response.data) == f.read()
+
+    def test_serve_identity(self):
+        """
+        圧縮を受け付けない場合、元の内容がそのまま返されることを確認します。
+        """
+        response = self.client.get(f"/assets/{self.manifest['js/attendance_input.js']}",
+                                   headers={'Accept-Encoding': 'identity'})
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert response.mimetype == 'application/javascript'
+
+    def test_unknown_type(self):
+        """
+        CSS・JavaScript以外のファイルは配信しないことを確認します。
+        """
+        assert self.client.get('/assets/manifest.json').status_code == 404
@@ -249,6 +249,9 @@ class TestAttendance:
             # commitが呼ばれたことを確認（記録作成とプロジェクト作業時間登録で複数回）
             # 実装上は2回呼ばれる（記録作成後のcommit + プロジェクト作業時間登録後のcommit）
             assert mock_db_instance.commit.call_count >= 1
+            # プロジェクト作業時間が1回の一括INSERTで登録されることを確認
+            mock_db_instance.execute_many.assert_called_once()
+            assert mock_db_instance.execute_many.call_args[0][1] == [(1, 1, 4.0), (1, 2, 4.0)]
     
     @patch('app.DBAccess')
     def test_attendance_input_with_existing_record(self, mock_dbaccess):
@@ -0,0 +1,184 @@
+"""
+attendance_export.pyの単体テスト
+
+勤怠記録・プロジェクト作業時間のシートの値、アーカイブテーブルを読む条件、
+XLSXダウンロードの応答とコマンドからのファイル出力をテストします。
+"""
+
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import attendance_export, xlsx_export
+from applications.DBAccess import row_class
+
+RecordRow = row_class(('employee_id', 'employee_name', 'date', 'attendance_type', 'start_minute',
+                       'end_minute', 'break_minutes', 'work_minutes', 'notes'))
+HoursRow = row_class(('employee_id', 'employee_name', 'date', 'project_id', 'project_name', 'hours'))
+
+RECORD = RecordRow(1, '佐藤 花子', date(2025, 10, 1), '出勤', 540, 1095, 60, 555, 'メモ')
+HOURS = HoursRow(1, '佐藤 花子', date(2025, 10, 1), 7, '案件A', Decimal('7.50'))
+
+
+def mock_db(*results):
+    """
+    iter_queryが呼ばれるたびに順に行のバッチを返すモックのDBAccessを作成するヘルパー関数
+    """
+    db = MagicMock()
+    db.iter_query.side_effect = [iter(batches) for batches in results]
+    return db
+
+
+class TestValues:
+    """
+    セルの値の変換のテストクラス
+    """
+
+    def test_record_values(self):
+        """
+        勤怠記録の総労働時間・実労働時間が時間数に変換されることを確認します。
+        """
+        assert attendance_export.record_values(RECORD) == (
+            1, '佐藤 花子', date(2025, 10, 1), '出勤', 540, 1095, 60, 9.25, 8.25, 'メモ'
+        )
+
+    def test_record_values_without_times(self):
+        """
+        出勤・退勤時刻がない勤怠記録（休暇など）は、時間数のセルが空になることを確認します。
+        """
+        row = RecordRow(1, '佐藤 花子', date(2025, 10, 2), '有給休暇', None, None, None, None, None)
+
+        assert attendance_export.record_values(row)[4:] == (None, None, None, None, None, None)
+
+    def test_hours_values(self):
+        """
+        プロジェクト作業時間の行がシートの列の順に変換されることを確認します。
+        """
+        assert attendance_export.hours_values(HOURS) == (1, '佐藤 花子', date(2025, 10, 1), 7, '案件A', Decimal('7.50'))
+
+
+class TestWorkbookSheets:
+    """
+    シートの定義のテストクラス
+    """
+
+    def test_current_year(self):
+        """
+        今年度の期間は、通常のテーブルだけを日付の順に読むことを確認します。
+        """
+        db = mock_db([[RECORD]], [[HOURS]])
+
+        sheets = attendance_export.workbook_sheets(db, date(2025, 10, 1), date(2025, 11, 1), today=date(2025, 10, 20))
+        assert [sheet.name for sheet in sheets] == ['勤怠記録', 'プロジェクト作業時間']
+        db.iter_query.assert_not_called()
+
+        assert list(sheets[0].batches) == [[RECORD]]
+        assert list(sheets[1].batches) == [[HOURS]]
+        assert db.iter_query.call_count == 2
+        query, params = db.iter_query.call_args_list[0].args
+        assert 'FROM attendance_records ar' in query
+        assert 'ORDER BY ar.date, ar.employee_id' in query
+        assert params == (date(2025, 10, 1), date(2025, 11, 1))
+        assert 'JOIN project_hours ph' in db.iter_query.call_args_list[1].args[0]
+
+    def test_closed_year_reads_archive(self):
+        """
+        締め済みの年度の期間は、通常のテーブルに続けてアーカイブテーブルも読むことを確認します。
+        """
+        db = mock_db([], [[RECORD]])
+
+        sheets = attendance_export.workbook_sheets(db, date(2025, 3, 1), date(2025, 4, 1), today=date(2025, 10, 20))
+
+        assert list(sheets[0].batches) == [[RECORD]]
+        assert 'FROM attendance_records ar' in db.iter_query.call_args_list[0].args[0]
+        assert 'FROM attendance_records_archive ar' in db.iter_query.call_args_list[1].args[0]
+
+
+class TestAttendanceXlsx:
+    """
+    XLSXダウンロードのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        課長としてログインしたテストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = 'manager'
+
+    @patch('app.DBAccess')
+    def test_streams_workbook(self, mock_dbaccess):
+        """
+        指定月の勤怠記録とプロジェクト作業時間を、2つのシートのXLSXとしてストリーミングで返すことを確認します。
+        """
+        db = mock_db([[RECORD]], [[HOURS]])
+        mock_dbaccess.return_value = db
+        today = date.today()
+
+        response = self.client.get(f'/report/attendance.xlsx?year={today.year}&month={today.month}')
+
+        # 送信中はiter_queryの接続だけを使い、リクエストの接続は先に返している
+        db.close_connection.assert_called_once()
+        assert response.status_code == 200
+        assert response.mimetype == xlsx_export.MIMETYPE
+        assert response.is_streamed
+        assert f'attendance_{today.year:04d}{today.month:02d}.xlsx' in response.headers['Content-Disposition']
+        with zipfile.ZipFile(io.BytesIO(response.data)) as workbook:
+            assert '佐藤 花子' in workbook.read('xl/worksheets/sheet1.xml').decode('utf-8')
+            assert '案件A' in workbook.read('xl/worksheets/sheet2.xml').decode('utf-8')
+        db.execute_query.assert_not_called()
+        response.close()
+
+    def test_invalid_month(self):
+        """
+        年月が不正な場合は月次レポートの画面へリダイレクトすることを確認します。
+        """
+        response = self.client.get('/report/attendance.xlsx?year=2025&month=13')
+
+        assert response.status_code == 302
+        assert '/report/monthly' in response.location
+
+    def test_requires_manager(self):
+        """
+        社員はダウンロードできないことを確認します。
+        """
+        with self.client.session_transaction() as sess:
+            sess['user_role'] = 'employee'
+
+        assert self.client.get('/report/attendance.xlsx?year=2025&month=10').status_code != 200
+
+
+class TestMain:
+    """
+    コマンドからのファイル出力のテストクラス
+    """
+
+    @patch('applications.attendance_export.DBAccess')
+    def test_export_month_to_file(self, mock_dbaccess, tmp_path):
+        """
+        指定月の勤怠記録がXLSXファイルに出力されることを確認します。
+        """
+        db = mock_db([[RECORD]], [], [[HOURS]], [])
+        mock_dbaccess.return_value = db
+        output = tmp_path / 'attendance.xlsx'
+
+        assert attendance_export.main(['--year', '2025', '--month', '3', '--output', str(output)]) == 0
+
+        with zipfile.ZipFile(output) as workbook:
+            assert workbook.testzip() is None
+        assert db.iter_query.call_args_list[0].args[1] == (date(2025, 3, 1), date(2025, 4, 1))
+        db.close_connection.assert_called_once()
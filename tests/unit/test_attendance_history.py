@@ -0,0 +1,212 @@
+"""
+attendance_history.pyの単体テスト
+
+勤怠記録の履歴のシーク・期間の条件、アーカイブテーブルを読む条件、
+プロジェクト作業時間のまとめての取得、履歴APIの応答をテストします。
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from datetime import date, timedelta
+from decimal import Decimal
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import attendance_history, pagination
+from applications.DBAccess import row_class
+
+TODAY = date(2025, 10, 20)
+
+RecordRow = row_class(('id', 'date', 'attendance_type', 'start_minute', 'end_minute',
+                       'break_minutes', 'work_minutes', 'notes'))
+HoursRow = row_class(('attendance_record_id', 'project_id', 'project_name', 'hours'))
+
+
+def records(first_day, count, start_id=1):
+    """
+    指定した日から1日ずつ古くなる勤怠記録の行を作成するヘルパー関数
+    """
+    return [RecordRow(start_id + offset, first_day - timedelta(days=offset), '出勤', 540, 1080, 60, 540, None)
+            for offset in range(count)]
+
+
+def mock_db(*results):
+    """
+    execute_queryが順に結果を返すモックのDBAccessを作成するヘルパー関数
+    """
+    db = MagicMock()
+    db.execute_query.side_effect = list(results)
+    return db
+
+
+class TestFetchPage:
+    """
+    ページの取得のテストクラス
+    """
+
+    def test_first_page(self):
+        """
+        今年度の記録で埋まった最初のページは、勤怠記録とプロジェクト作業時間の2回のクエリで取得されることを確認します。
+        """
+        rows = records(date(2025, 10, 10), 4)
+        db = mock_db(rows, [HoursRow(1, 7, '案件A', Decimal('7.50'))])
+
+        page, hours = attendance_history.fetch_page(db, 5, size=3, today=TODAY)
+
+        assert db.execute_query.call_count == 2
+        query, params = db.execute_query.call_args_list[0].args
+        assert 'FROM attendance_records' in query
+        assert 'ORDER BY date DESC' in query
+        assert params == (5, 4)
+        assert [record.date for record in page.rows] == [date(2025, 10, 10), date(2025, 10, 9), date(2025, 10, 8)]
+        assert page.rows[0].start_time == '09:00'
+        assert pagination.decode_cursor(page.next_cursor, 1) == ['2025-10-08']
+        assert page.prev_cursor is None
+
+        hours_query, hours_params = db.execute_query.call_args_list[1].args
+        assert 'WHERE ph.attendance_record_id IN (%s, %s, %s)' in hours_query
+        assert hours_params == (1, 2, 3)
+        assert [row.project_name for row in hours[1]] == ['案件A']
+        assert hours[2] == []
+
+    def test_seek_and_range(self):
+        """
+        カーソルと期間を指定すると、employee_idの等値・期間・日付のシークの条件で読むことを確認します。
+        """
+        db = mock_db(records(date(2025, 9, 30), 1), [])
+        cursor = pagination.encode_cursor((date(2025, 10, 1),))
+
+        page, _ = attendance_history.fetch_page(db, 5, date_from=date(2025, 9, 1), date_to=date(2025, 9, 30),
+                                                size=3, after=cursor, today=TODAY)
+
+        query, params = db.execute_query.call_args_list[0].args
+        assert 'employee_id = %s AND date >= %s AND date <= %s AND (date <= %s AND (date < %s))' in query
+        assert params == (5, date(2025, 9, 1), date(2025, 9, 30), '2025-10-01', '2025-10-01', 4)
+        assert page.next_cursor is None
+        assert page.prev_cursor is not None
+
+    def test_reads_archive_for_closed_years(self):
+        """
+        今年度の記録でページが埋まらない場合は、アーカイブテーブルも読んで日付の順に合わせることを確認します。
+        """
+        current = records(date(2025, 4, 2), 2, start_id=1)
+        archived = records(date(2025, 3, 31), 2, start_id=100)
+        db = mock_db(current, archived, [], [HoursRow(100, 7, '案件A', Decimal('8.00'))])
+
+        page, hours = attendance_history.fetch_page(db, 5, size=3, today=TODAY)
+
+        assert 'FROM attendance_records_archive' in db.execute_query.call_args_list[1].args[0]
+        assert [record.id for record in page.rows] == [1, 2, 100]
+        assert 'FROM project_hours ph' in db.execute_query.call_args_list[2].args[0]
+        assert db.execute_query.call_args_list[2].args[1] == (1, 2)
+        assert 'FROM project_hours_archive ph' in db.execute_query.call_args_list[3].args[0]
+        assert db.execute_query.call_args_list[3].args[1] == (100,)
+        assert hours[100][0].hours == Decimal('8.00')
+
+    def test_range_within_current_year_skips_archive(self):
+        """
+        期間の初日が今年度の場合は、ページが埋まらなくてもアーカイブテーブルを読まないことを確認します。
+        """
+        db = mock_db([])
+
+        page, hours = attendance_history.fetch_page(db, 5, date_from=date(2025, 4, 1), size=3, today=TODAY)
+
+        db.execute_query.assert_called_once()
+        assert page.rows == []
+        assert hours == {}
+
+    def test_backward(self):
+        """
+        前のページへ戻る場合は昇順に読み、新しい日付の順に並べ直すことを確認します。
+        """
+        rows = list(reversed(records(date(2025, 10, 13), 3)))
+        db = mock_db(rows, [])
+        cursor = pagination.encode_cursor((date(2025, 10, 10),))
+
+        page, _ = attendance_history.fetch_page(db, 5, size=3, before=cursor, today=TODAY)
+
+        query, _ = db.execute_query.call_args_list[0].args
+        assert 'date >= %s AND (date > %s)' in query
+        assert 'ORDER BY date LIMIT' in ' '.join(query.split())
+        assert [record.date.day for record in page.rows] == [13, 12, 11]
+        assert page.next_cursor is not None
+
+
+class TestHistoryApi:
+    """
+    履歴APIのテストクラス
+    """
+
+    def login(self, role='employee'):
+        """
+        指定した権限でログインしたテストクライアントを返すヘルパーメソッド
+        """
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = 5
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = role
+        return client
+
+    @patch('app.DBAccess')
+    def test_json(self, mock_dbaccess):
+        """
+        勤怠記録がプロジェクト作業時間とカーソルを含むJSONで返されることを確認します。
+        """
+        today = date.today()
+        mock_dbaccess.return_value = mock_db(records(today, 3), [HoursRow(1, 7, '案件A', Decimal('7.50'))])
+
+        # 期間の初日を今年度にして、アーカイブテーブルを読まないようにする
+        response = self.login().get(f'/api/attendance/history?size=2&from={today.isoformat()}')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['records'][0] == {
+            'id': 1, 'date': today.isoformat(), 'attendance_type': '出勤', 'start_time': '09:00',
+            'end_time': '18:00', 'break_time': '01:00', 'notes': None,
+            'project_hours': [{'project_id': 7, 'project_name': '案件A', 'hours': 7.5}],
+        }
+        assert len(data['records']) == 2
+        assert data['next'] and data['prev'] is None
+
+    @pytest.mark.parametrize('query', [
+        'from=2025-13-01',
+        'after=broken',
+        f'after={pagination.encode_cursor((20251001,))}',
+        f'before={pagination.encode_cursor(([2025, 10, 1],))}',
+        f'before={pagination.encode_cursor(("2025-10-xx",))}',
+    ])
+    @patch('app.DBAccess')
+    def test_bad_request(self, mock_dbaccess, query):
+        """
+        不正な日付・カーソル（日付でない値を含むカーソルを含む）は400を返すことを確認します。
+        """
+        mock_dbaccess.return_value = MagicMock()
+
+        assert self.login().get(f'/api/attendance/history?{query}').status_code == 400
+
+    def test_other_employee_requires_manager(self):
+        """
+        社員が他の社員の履歴を指定すると403を返すことを確認します。
+        """
+        assert self.login().get('/api/attendance/history?employee_id=9').status_code == 403
+
+    @patch('app.DBAccess')
+    def test_manager_can_view_other_employee(self, mock_dbaccess):
+        """
+        課長は他の社員の履歴を取得できることを確認します。
+        """
+        db = mock_db([])
+        mock_dbaccess.return_value = db
+
+        response = self.login('manager').get(f'/api/attendance/history?employee_id=9&from={date.today().isoformat()}')
+
+        assert response.status_code == 200
+        assert db.execute_query.call_args_list[0].args[1][0] == 9
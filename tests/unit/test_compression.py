@@ -0,0 +1,319 @@
+"""
+compression.pyの単体テスト
+
+Accept-Encodingによる方式の選択、Content-Lengthのある応答とストリーミングの応答の圧縮、
+圧縮しない応答の判定、ルートごとの集計をテストします。
+"""
+
+import gzip
+import pytest
+import zlib
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import compression
+from applications.compression import CompressionMiddleware, CompressionStats
+
+BODY = b'<tr><td>2025-10-01</td><td>09:00</td><td>18:00</td></tr>\n' * 100
+
+
+def wsgi_app(chunks, content_type='text/html; charset=utf-8', length=True, headers=(), status='200 OK'):
+    """
+    指定したチャンクを返すWSGIアプリケーションを作成するヘルパー関数
+
+    Args:
+        chunks: 本文のチャンクのリスト
+        content_type: Content-Type
+        length: Content-Lengthを付けるかどうか
+        headers: 追加するヘッダー
+        status: ステータス
+
+    Returns:
+        function: WSGIアプリケーション
+    """
+    def application(environ, start_response):
+        response_headers = [('Content-Type', content_type)] + list(headers)
+        if length:
+            response_headers.append(('Content-Length', str(sum(len(chunk) for chunk in chunks))))
+        start_response(status, response_headers)
+        return iter(chunks)
+    return application
+
+
+def call(application, accept_encoding='gzip', method='GET'):
+    """
+    WSGIアプリケーションを呼び出し、ステータス・ヘッダー・本文のチャンクを返すヘルパー関数
+    """
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = status
+        started['headers'] = dict(headers)
+
+    environ = {'REQUEST_METHOD': method, 'HTTP_ACCEPT_ENCODING': accept_encoding}
+    result = application(environ, start_response)
+    try:
+        chunks = list(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return started['status'], started['headers'], chunks
+
+
+class TestChooseEncoding:
+    """
+    方式の選択のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        ミドルウェアを初期化します。
+        """
+        self.middleware = CompressionMiddleware(wsgi_app([BODY]), min_size=100, level=6, brotli_quality=4)
+
+    def choose(self, value, method='GET'):
+        """
+        Accept-Encodingから選ばれる方式を返すヘルパーメソッド
+        """
+        return self.middleware.choose_encoding({'REQUEST_METHOD': method, 'HTTP_ACCEPT_ENCODING': value})
+
+    def test_gzip(self):
+        """
+        gzipだけを受け付ける場合はgzipが選ばれることを確認します。
+        """
+        assert self.choose('gzip') == 'gzip'
+
+    def test_quality(self):
+        """
+        品質値の高い方式が選ばれ、q=0の方式は選ばれないことを確認します。
+        """
+        assert self.choose('br;q=0, gzip') == 'gzip'
+        assert self.choose('identity') is None
+        assert self.choose('') is None
+
+    def test_brotli_preferred(self):
+        """
+        brotliパッケージがある場合、同じ品質値ではbrotliが選ばれることを確認します。
+        """
+        pytest.importorskip('brotli')
+        assert self.choose('gzip, deflate, br') == 'br'
+
+    def test_head_and_disabled(self):
+        """
+        HEADリクエストと、圧縮レベル0の場合は圧縮しないことを確認します。
+        """
+        assert self.choose('gzip', method='HEAD') is None
+        self.middleware.level = 0
+        assert self.choose('gzip') is None
+
+
+class TestCompress:
+    """
+    応答の圧縮のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        集計先を初期化します。
+        """
+        self.stats = CompressionStats()
+
+    def middleware(self, application, min_size=100):
+        """
+        テスト用の設定でミドルウェアを作成するヘルパーメソッド
+        """
+        return CompressionMiddleware(application, min_size=min_size, level=6, brotli_quality=4, stats=self.stats)
+
+    def test_known_length(self):
+        """
+        Content-Lengthのある応答がまとめて圧縮され、Content-Lengthが付け直されることを確認します。
+        """
+        status, headers, chunks = call(self.middleware(wsgi_app([BODY[:1000], BODY[1000:]])))
+
+        assert status == '200 OK'
+        assert headers['Content-Encoding'] == 'gzip'
+        assert headers['Vary'] == 'Accept-Encoding'
+        body = b''.join(chunks)
+        assert int(headers['Content-Length']) == len(body)
+        assert gzip.decompress(body) == BODY
+
+    def test_streaming_is_incremental(self):
+        """
+        ストリーミングの応答は、チャンクを受け取るごとに圧縮したデータが出力されることを確認します。
+        """
+        produced = []
+
+        def chunks():
+            for index in range(5):
+                produced.append(index)
+                yield BODY
+
+        application = self.middleware(wsgi_app(chunks(), length=False))
+        started = {}
+        result = application({'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': 'gzip'},
+                             lambda status, headers, exc_info=None: started.update(dict(headers)))
+        iterator = iter(result)
+        decompressor = zlib.decompressobj(31)
+
+        # 最初の出力の時点では、最初のチャンクだけが読まれ、展開できる
+        first = next(iterator)
+        assert produced == [0]
+        assert decompressor.decompress(first) == BODY
+        assert started['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in started
+
+        rest = b''.join(iterator)
+        assert decompressor.decompress(rest) == BODY * 4
+        assert decompressor.eof
+
+    def test_brotli(self):
+        """
+        brotliを受け付ける場合、brotliで圧縮されることを確認します。
+        """
+        brotli = pytest.importorskip('brotli')
+        _, headers, chunks = call(self.middleware(wsgi_app([BODY])), accept_encoding='br')
+
+        assert headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(b''.join(chunks)) == BODY
+
+    @pytest.mark.parametrize('kwargs', [
+        {'content_type': 'image/png'},
+        {'headers': [('Content-Encoding', 'gzip')]},
+        {'headers': [('Cache-Control', 'no-transform')]},
+        {'status': '304 NOT MODIFIED'},
+    ])
+    def test_not_compressed(self, kwargs):
+        """
+        圧縮済みの形式・圧縮済みの応答・no-transform・200以外の応答は圧縮しないことを確認します。
+        """
+        _, headers, chunks = call(self.middleware(wsgi_app([BODY], **kwargs)))
+
+        assert headers.get('Content-Encoding') == dict(kwargs.get('headers', [])).get('Content-Encoding')
+        assert b''.join(chunks) == BODY
+        assert self.stats.snapshot() == []
+        # 304はVaryを付け、それ以外は圧縮の対象外のためVaryを付けない
+        assert ('Vary' in headers) == (kwargs.get('status') == '304 NOT MODIFIED')
+
+    @pytest.mark.parametrize('length', [True, False])
+    def test_small_response(self, length):
+        """
+        最小サイズ未満の応答は、Content-Lengthの有無にかかわらず圧縮しないことを確認します。
+        """
+        _, headers, chunks = call(self.middleware(wsgi_app([b'a' * 50, b'b' * 40], length=length)))
+
+        assert 'Content-Encoding' not in headers
+        assert headers['Vary'] == 'Accept-Encoding'
+        assert b''.join(chunks) == b'a' * 50 + b'b' * 40
+
+    @pytest.mark.parametrize('accept_encoding, method', [('', 'GET'), ('identity', 'GET'), ('gzip', 'HEAD')])
+    def test_vary_without_compression(self, accept_encoding, method):
+        """
+        圧縮を受け付けないリクエスト・HEADリクエストでも、圧縮の対象の形式の応答にはVaryを付けることを確認します。
+        """
+        application = self.middleware(wsgi_app([BODY], headers=[('Vary', 'Cookie')]))
+
+        _, headers, chunks = call(application, accept_encoding=accept_encoding, method=method)
+
+        assert 'Content-Encoding' not in headers
+        assert headers['Vary'] == 'Cookie, Accept-Encoding'
+        assert b''.join(chunks) == BODY
+
+    def test_no_vary_when_disabled_or_not_compressible(self):
+        """
+        圧縮レベル0の場合と、圧縮の対象外の形式の応答にはVaryを付けないことを確認します。
+        """
+        disabled = CompressionMiddleware(wsgi_app([BODY]), min_size=100, level=0, stats=self.stats)
+        image = self.middleware(wsgi_app([BODY], content_type='image/png'))
+
+        assert 'Vary' not in call(disabled, accept_encoding='')[1]
+        assert 'Vary' not in call(image, accept_encoding='')[1]
+
+    def test_close_is_forwarded(self):
+        """
+        応答を閉じると、アプリケーションの応答のcloseが呼ばれることを確認します。
+        """
+        app_iter = MagicMock()
+        app_iter.__iter__.return_value = iter([BODY])
+
+        def application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/html')])
+            return app_iter
+
+        call(self.middleware(application))
+
+        app_iter.close.assert_called_once()
+
+    def test_stats(self):
+        """
+        圧縮前後のサイズと応答数が集計されることを確認します。
+        """
+        application = self.middleware(wsgi_app([BODY]))
+        call(application)
+        _, _, chunks = call(application)
+
+        [entry] = self.stats.snapshot()
+        assert entry['route'] == '-'
+        assert entry['encoding'] == 'gzip'
+        assert entry['responses'] == 2
+        assert entry['bytes_in'] == 2 * len(BODY)
+        assert entry['bytes_out'] == 2 * len(b''.join(chunks))
+        assert entry['ratio'] < 0.1
+        assert entry['cpu_ms'] >= 0
+
+
+class TestApplication:
+    """
+    アプリケーションに組み込んだミドルウェアのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        集計結果を破棄し、テストクライアントを初期化して社員としてログインします。
+        """
+        compression.reset_compression_stats()
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = 'employee'
+
+    @patch('app.DBAccess')
+    def test_page_is_compressed_and_revalidated(self, mock_dbaccess):
+        """
+        画面がgzipで圧縮されてURLルールごとに集計され、弱いETagでも304が返ることを確認します。
+        """
+        db = MagicMock()
+        db.get_cursor.return_value.fetchone.return_value = {
+            'record_count': 1, 'records_modified': 1760000000, 'now': 1760000060,
+        }
+        db.execute_query.return_value = []
+        mock_dbaccess.return_value = db
+
+        response = self.client.get('/dashboard', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert '<html' in gzip.decompress(response.data).decode('utf-8')
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+        assert [entry['route'] for entry in compression.get_compression_stats()] == ['/dashboard']
+
+        response = self.client.get('/dashboard', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_without_accept_encoding(self):
+        """
+        Accept-Encodingがない場合は圧縮しないことを確認します。
+        """
+        response = self.client.get('/login')
+
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert '<html' in response.data.decode('utf-8')
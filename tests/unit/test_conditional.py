@@ -0,0 +1,244 @@
+"""
+conditional.pyの単体テスト
+
+ダッシュボード・勤怠記録詳細・月次レポートの条件付きGET（ETag・Last-Modified）をテストします。
+"""
+
+import re
+from unittest.mock import patch, MagicMock
+import sys
+import os
+from datetime import date, datetime, timedelta, timezone
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+
+MODIFIED = 1760000000
+
+
+def mock_db(probe_row, rows=None):
+    """
+    プローブの結果と画面のクエリの結果を返すモックのDBAccessを作成するヘルパー関数
+
+    Args:
+        probe_row: プローブのクエリが返す行（Noneは行なし）
+        rows: 画面のクエリが返す行のリスト
+
+    Returns:
+        MagicMock: モックのDBAccess
+    """
+    db = MagicMock()
+    db.get_cursor.return_value.fetchone.return_value = probe_row
+    db.execute_query.return_value = rows or []
+    return db
+
+
+def probe_row(count=1, modified=MODIFIED, now=MODIFIED + 60):
+    """
+    プローブのクエリの行を作成するヘルパー関数
+    """
+    return {'record_count': count, 'records_modified': modified, 'now': now}
+
+
+class TestConditionalGet:
+    """
+    条件付きGETのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストクライアントを初期化し、社員としてログインします。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = 'employee'
+
+    @patch('app.DBAccess')
+    def test_dashboard_sets_validators(self, mock_dbaccess):
+        """
+        ダッシュボードの応答にETag・Last-Modified・Cache-Controlが設定されることを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row())
+
+        response = self.client.get('/dashboard')
+
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert response.last_modified == datetime.fromtimestamp(MODIFIED, timezone.utc)
+        assert 'no-cache' in response.headers['Cache-Control']
+        assert 'private' in response.headers['Cache-Control']
+
+    @patch('app.DBAccess')
+    def test_dashboard_not_modified(self, mock_dbaccess):
+        """
+        If-None-Matchが一致する場合、勤怠記録のクエリを実行せずに304を返すことを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row())
+        etag = self.client.get('/dashboard').headers['ETag']
+
+        db = mock_db(probe_row())
+        mock_dbaccess.return_value = db
+        response = self.client.get('/dashboard', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        db.execute_query.assert_not_called()
+
+    @patch('app.DBAccess')
+    def test_dashboard_changed(self, mock_dbaccess):
+        """
+        件数が変わった場合、ETagが一致せず通常どおり表示されることを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row(count=1))
+        etag = self.client.get('/dashboard').headers['ETag']
+
+        db = mock_db(probe_row(count=2))
+        mock_dbaccess.return_value = db
+        response = self.client.get('/dashboard', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        db.execute_query.assert_called_once()
+
+    @patch('app.DBAccess')
+    def test_if_modified_since(self, mock_dbaccess):
+        """
+        If-None-Matchがない場合、If-Modified-Sinceで判定されることを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row())
+
+        response = self.client.get('/dashboard', headers={
+            'If-Modified-Since': 'Thu, 09 Oct 2025 09:00:00 GMT',
+        })
+
+        assert response.status_code == 304
+
+    @patch('app.DBAccess')
+    def test_modified_within_current_second(self, mock_dbaccess):
+        """
+        最終更新が現在の1秒の中にある場合、検証用のヘッダーを付けないことを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row(modified=MODIFIED, now=MODIFIED))
+
+        response = self.client.get('/dashboard')
+
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+
+    @patch('app.DBAccess')
+    def test_pending_flash_skips_validation(self, mock_dbaccess):
+        """
+        表示するフラッシュメッセージがある場合、304を返さないことを確認します。
+        """
+        mock_dbaccess.return_value = mock_db(probe_row())
+        etag = self.client.get('/dashboard').headers['ETag']
+        with self.client.session_transaction() as sess:
+            sess['_flashes'] = [('success', '勤怠記録を保存しました')]
+
+        response = self.client.get('/dashboard', headers={'If-None-Match': etag})
+
+        assert response.status_code == 200
+        assert '勤怠記録を保存しました' in response.data.decode('utf-8')
+
+    @patch('app.DBAccess')
+    def test_attendance_view_without_record(self, mock_dbaccess):
+        """
+        勤怠記録詳細のプローブが行を返さない場合、通常どおり処理されることを確認します。
+        """
+        db = mock_db(None)
+        mock_dbaccess.return_value = db
+
+        response = self.client.get(f'/attendance/view/{date.today().isoformat()}')
+
+        assert response.status_code == 302
+        db.execute_query.assert_called_once()
+
+    @patch('app.DBAccess')
+    def test_attendance_view_not_modified(self, mock_dbaccess):
+        """
+        勤怠記録詳細でIf-None-Matchが一致する場合、304を返すことを確認します。
+        """
+        row = {'record_count': 1, 'hours_count': 2, 'record_modified': MODIFIED,
+               'employee_modified': MODIFIED - 100, 'hours_modified': None,
+               'projects_modified': None, 'now': MODIFIED + 60}
+        record = {'id': 1, 'employee_id': 1, 'date': date(2025, 10, 1), 'attendance_type': '出勤',
+                  'start_time': timedelta(hours=9), 'end_time': timedelta(hours=18),
+                  'break_time': timedelta(hours=1), 'notes': '', 'employee_name': 'Employee User'}
+        db = mock_db(row)
+        db.execute_query.side_effect = [[record], []]
+        mock_dbaccess.return_value = db
+        etag = self.client.get('/attendance/view/2025-10-01').headers['ETag']
+
+        db = mock_db(row)
+        mock_dbaccess.return_value = db
+        response = self.client.get('/attendance/view/2025-10-01', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        db.execute_query.assert_not_called()
+
+    @patch('app.DBAccess')
+    def test_attendance_view_same_record_as_probe(self, mock_dbaccess):
+        """
+        課長の勤怠記録詳細で、プローブと画面のクエリが同じ順で先頭の記録を読むことを確認します。
+        """
+        with self.client.session_transaction() as sess:
+            sess['user_role'] = 'manager'
+        db = mock_db(probe_row())
+        mock_dbaccess.return_value = db
+
+        self.client.get('/attendance/view/2025-10-01')
+
+        probe_query = db.get_cursor.return_value.execute.call_args.args[0]
+        record_query = db.execute_query.call_args_list[0].args[0]
+        assert re.search(r'ORDER BY employee_id\s+LIMIT 1', probe_query)
+        assert re.search(r'ORDER BY ar\.employee_id\s+LIMIT 1', record_query)
+
+    @patch('app.DBAccess')
+    def test_monthly_report_scope(self, mock_dbaccess):
+        """
+        月次レポートのETagが年月ごとに異なり、同じ年月では304を返すことを確認します。
+        """
+        with self.client.session_transaction() as sess:
+            sess['user_role'] = 'manager'
+        row = {'employee_count': 3, 'employees_modified': MODIFIED, 'summary_count': 3,
+               'summary_modified': MODIFIED, 'now': MODIFIED + 60}
+        mock_dbaccess.return_value = mock_db(row)
+        october = self.client.get('/report/monthly?year=2025&month=10').headers['ETag']
+        september = self.client.get('/report/monthly?year=2025&month=9').headers['ETag']
+
+        response = self.client.get('/report/monthly?year=2025&month=10', headers={'If-None-Match': october})
+
+        assert october != september
+        assert response.status_code == 304
+
+    @patch('app.DBAccess')
+    def test_validated_response_bypasses_result_cache(self, mock_dbaccess):
+        """
+        ETagを付ける応答はクエリ結果キャッシュを使わずに読み、付けない応答はキャッシュを使うことを確認します。
+        """
+        with self.client.session_transaction() as sess:
+            sess['user_role'] = 'manager'
+        row = {'employee_count': 3, 'employees_modified': MODIFIED, 'summary_count': 3,
+               'summary_modified': MODIFIED, 'now': MODIFIED + 60}
+        db = mock_db(row)
+        mock_dbaccess.return_value = db
+
+        response = self.client.get('/report/monthly?year=2025&month=10')
+
+        assert response.headers['ETag']
+        assert db.execute_query.call_args.kwargs['cache'] is False
+
+        db = mock_db(dict(row, now=MODIFIED))
+        mock_dbaccess.return_value = db
+        response = self.client.get('/report/monthly?year=2025&month=10')
+
+        assert 'ETag' not in response.headers
+        assert db.execute_query.call_args.kwargs['cache'] is True
@@ -0,0 +1,157 @@
+"""
+csv_export.pyの単体テスト
+
+CSVのストリーミング出力（見出しを先に送ること、バッチごとの出力、途中終了時の解放）と、
+月次レポートのCSVの値が画面の値と一致することをテストします。
+"""
+
+import csv
+import io
+import re
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import csv_export, monthly_summary
+from applications.DBAccess import row_class
+
+ReportRow = row_class(('employee_id', 'employee_name', 'attendance_days', 'total_hours', 'total_break_hours'))
+
+REPORT_ROWS = [
+    ReportRow(1, '佐藤, 花子', 20, Decimal('160.1250'), Decimal('20.0000')),
+    ReportRow(2, '鈴木 "一郎"', 3, Decimal('24.5000'), Decimal('3.2500')),
+    ReportRow(3, '田中 次郎', 0, None, None),
+]
+
+
+def parse_csv(data):
+    """
+    CSVのバイト列をBOMを除いて行のリストに変換するヘルパー関数
+    """
+    text = data.decode('utf-8')
+    assert text.startswith(csv_export.BOM)
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+class TestStreamCsv:
+    """
+    CSVのストリーミング出力のテストクラス
+    """
+
+    def test_header_before_query(self):
+        """
+        見出しの行は、行のバッチを読む前に出力されることを確認します。
+        """
+        read = []
+
+        def batches():
+            read.append(True)
+            yield [(1, 'a')]
+
+        chunks = csv_export.stream_csv(('id', 'name'), batches(), tuple)
+
+        assert next(chunks) == csv_export.BOM.encode('utf-8') + b'id,name\r\n'
+        assert read == []
+        assert list(chunks) == [b'1,a\r\n']
+
+    def test_chunk_per_batch(self):
+        """
+        バッチごとに1つのチャンクが出力され、カンマ・引用符が正しくエスケープされることを確認します。
+        """
+        chunks = list(csv_export.stream_csv(('id', 'name'), [[(1, 'a,b')], [(2, 'c"d'), (3, 'e')]], tuple))
+
+        assert len(chunks) == 3
+        assert parse_csv(b''.join(chunks)) == [['id', 'name'], ['1', 'a,b'], ['2', 'c"d'], ['3', 'e']]
+
+    def test_close_releases_batches(self):
+        """
+        出力の途中で閉じると、行のバッチのジェネレータも閉じられることを確認します。
+        """
+        batches = MagicMock()
+        batches.__iter__.return_value = iter([[(1,)], [(2,)]])
+
+        chunks = csv_export.stream_csv(('id',), batches, tuple)
+        next(chunks)
+        next(chunks)
+        chunks.close()
+
+        batches.close.assert_called_once()
+
+
+class TestMonthlyReportCsv:
+    """
+    月次レポートのCSVダウンロードのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        課長としてログインしたテストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = 'manager'
+
+    @patch('app.DBAccess')
+    def test_streams_report_query(self, mock_dbaccess):
+        """
+        月次レポートと同じクエリをサーバーサイドカーソルで読み、chunkedのCSVとして返すことを確認します。
+        """
+        db = MagicMock()
+        db.iter_query.return_value = iter([REPORT_ROWS[:2], REPORT_ROWS[2:]])
+        mock_dbaccess.return_value = db
+
+        response = self.client.get('/report/monthly.csv?year=2025&month=10')
+
+        # 送信中はiter_queryの接続だけを使い、リクエストの接続は先に返している
+        db.close_connection.assert_called_once()
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert 'Content-Length' not in response.headers
+        assert 'monthly_report_202510.csv' in response.headers['Content-Disposition']
+        assert response.is_streamed
+        db.iter_query.assert_called_once_with(monthly_summary.REPORT_QUERY, (2025, 10), compact=True)
+        db.execute_query.assert_not_called()
+        rows = parse_csv(response.data)
+        assert rows[0] == list(monthly_summary.REPORT_CSV_HEADER)
+        assert rows[1] == ['1', '佐藤, 花子', '20', '160.12', '20.00', '140.12']
+        assert rows[3] == ['3', '田中 次郎', '0', '0.00', '0.00', '0.00']
+        response.close()
+
+    @patch('app.DBAccess')
+    def test_matches_html_report(self, mock_dbaccess):
+        """
+        CSVの社員名・出勤日数・時間が、月次レポートの画面の表の値と一致することを確認します。
+        """
+        db = MagicMock()
+        db.get_cursor.return_value.fetchone.return_value = None
+        db.execute_query.return_value = REPORT_ROWS
+        db.iter_query.return_value = iter([REPORT_ROWS])
+        mock_dbaccess.return_value = db
+
+        html = self.client.get('/report/monthly?year=2025&month=10').data.decode('utf-8')
+        csv_rows = parse_csv(self.client.get('/report/monthly.csv?year=2025&month=10').data)
+
+        body = html.split('<tbody>')[1].split('</tbody>')[0]
+        html_rows = [[re.sub(r'\s+', ' ', cell).strip().replace('&#34;', '"')
+                      for cell in re.findall(r'<td>(.*?)</td>', row, re.S)]
+                     for row in re.findall(r'<tr>(.*?)</tr>', body, re.S)]
+        assert html_rows == [row[1:] for row in csv_rows[1:]]
+
+    def test_invalid_month(self):
+        """
+        年月が不正な場合は月次レポートの画面へリダイレクトすることを確認します。
+        """
+        response = self.client.get('/report/monthly.csv?year=2025&month=13')
+
+        assert response.status_code == 302
+        assert '/report/monthly' in response.location
@@ -0,0 +1,127 @@
+"""
+db_init.pyの単体テスト
+
+マイグレーションの検出・バージョン確認・適用をテストします。
+"""
+
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import pymysql
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/db_init.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications import db_init
+
+
+def make_db(version):
+    """
+    指定したバージョンが適用済みのデータベースを模したモックを作成する関数
+
+    Args:
+        version: 適用済みのバージョン（Noneの場合はschema_versionテーブルが存在しない）
+
+    Returns:
+        MagicMock: DBAccessのモック
+    """
+    db = MagicMock()
+    state = {'version': version}
+
+    def execute_query(query, params=None):
+        if 'MAX(version)' in query:
+            if state['version'] is None:
+                raise pymysql.err.ProgrammingError(1146, "Table 'schema_version' doesn't exist")
+            return [{'version': state['version']}]
+        if 'GET_LOCK' in query:
+            return [{'locked': 1}]
+        if 'INSERT INTO schema_version' in query:
+            state['version'] = params[0]
+        return []
+
+    db.execute_query.side_effect = execute_query
+    return db
+
+
+class TestMigrations:
+    """
+    マイグレーションのテストクラス
+
+    マイグレーションの検出と適用の動作をテストします。
+    """
+
+    def test_get_migrations(self):
+        """
+        マイグレーションがバージョン順に検出されることを確認します。
+        """
+        all_migrations = db_init.get_migrations()
+
+        versions = [version for version, _, _ in all_migrations]
+        assert versions == sorted(versions)
+        assert all_migrations[0][:2] == (1, 'initial_schema')
+        assert db_init.head_version() == versions[-1]
+
+    @patch('applications.db_init.DBAccess')
+    def test_migrate_up_to_date(self, mock_dbaccess):
+        """
+        最新の場合、schema_versionへの1回のクエリだけで終了することを確認します。
+        """
+        db = make_db(db_init.head_version())
+        mock_dbaccess.return_value = db
+
+        assert db_init.migrate() == []
+        db.execute_query.assert_called_once()
+        db.close_connection.assert_called_once()
+
+    @patch('applications.db_init.DBAccess')
+    def test_migrate_from_empty(self, mock_dbaccess):
+        """
+        schema_versionテーブルがない場合、すべてのマイグレーションが順に適用されることを確認します。
+        """
+        db = make_db(None)
+        mock_dbaccess.return_value = db
+
+        with patch('applications.db_init.importlib.import_module') as mock_import:
+            applied = db_init.migrate()
+
+        assert applied == [version for version, _, _ in db_init.get_migrations()]
+        assert mock_import.return_value.upgrade.call_count == len(applied)
+        # ロックが解放されることを確認
+        assert any('RELEASE_LOCK' in call.args[0] for call in db.execute_query.call_args_list)
+
+    @patch('applications.db_init.DBAccess')
+    def test_migrate_target(self, mock_dbaccess):
+        """
+        targetを指定した場合、そのバージョンまでだけ適用されることを確認します。
+        """
+        db = make_db(0)
+        mock_dbaccess.return_value = db
+
+        with patch('applications.db_init.importlib.import_module'):
+            assert db_init.migrate(target=1) == [1]
+
+    @patch('applications.db_init.DBAccess')
+    def test_main_check(self, mock_dbaccess):
+        """
+        --checkで、最新でない場合に終了コード1が返されることを確認します。
+        """
+        mock_dbaccess.return_value = make_db(0)
+        assert db_init.main(['--check']) == 1
+
+        mock_dbaccess.return_value = make_db(db_init.head_version())
+        assert db_init.main(['--check']) == 0
+
+    @patch.dict(os.environ, {'AUTO_MIGRATE': '0'})
+    @patch('applications.db_init.init_database')
+    @patch('applications.db_init.DBAccess')
+    def test_ensure_database_without_auto_migrate(self, mock_dbaccess, mock_init_database):
+        """
+        AUTO_MIGRATE=0の場合、起動時にマイグレーションが適用されないことを確認します。
+        """
+        mock_dbaccess.return_value = make_db(0)
+
+        db_init.ensure_database()
+
+        mock_init_database.assert_not_called()
@@ -15,7 +15,40 @@ sys.path.insert(0, '/usr/src/app')
 # ローカル環境用のフォールバック
 if not os.path.exists('/usr/src/app/applications/DBAccess.py'):
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
-from applications.DBAccess import DBAccess
+from applications.DBAccess import (
+    DBAccess, ConnectionPool, PoolTimeoutError, TimedCursor, TimedSSDictCursor, reset_pool, row_class
+)
+
+
+class FakeSSCursor:
+    """
+    サーバーサイドカーソルの代わりに使用するクラス
+
+    pymysqlのSSCursorと同様に、closeで読み残しの行をすべて読み込みます。
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = (('id',),)
+        self.drained = False
+
+    def execute(self, query, args=None):
+        return len(self.rows)
+
+    def fetchmany(self, size):
+        batch = self.rows[:size]
+        del self.rows[:size]
+        return batch
+
+    def close(self):
+        self.drained = True
+        self.rows.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 class TestDBAccess:
@@ -25,6 +58,22 @@ class TestDBAccess:
     各メソッドの動作をテストします。
     """
     
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+        
+        前のテストの接続が残らないよう、コネクションプールを破棄します。
+        """
+        reset_pool()
+    
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+        
+        コネクションプールを破棄します。
+        """
+        reset_pool()
+    
     @patch('applications.DBAccess.pymysql.connect')
     def test_init(self, mock_connect):
         """
@@ -76,7 +125,7 @@ class TestDBAccess:
         """
         close_connectionメソッドのテスト
         
-        接続が正しく閉じられることを確認します。
+        接続が閉じられずにロールバックされ、プールに返却されることを確認します。
         """
         # モックの設定
         mock_conn = MagicMock()
@@ -88,8 +137,35 @@ class TestDBAccess:
         # close_connection()を呼び出し
         db.close_connection()
         
-        # 接続のclose()が呼ばれたことを確認
-        mock_conn.close.assert_called_once()
+        # 接続は閉じられず、未コミットの状態がロールバックされたことを確認
+        mock_conn.close.assert_not_called()
+        mock_conn.rollback.assert_called_once()
+        
+        # 次のインスタンスは同じ接続を再利用することを確認
+        db2 = DBAccess()
+        assert db2.conn == mock_conn
+        mock_connect.assert_called_once()
+    
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_close_connection_twice(self, mock_connect):
+        """
+        close_connectionメソッドの二重呼び出しのテスト
+        
+        二重に呼び出しても接続が一度だけ返却されることを確認します。
+        """
+        # モックの設定
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+        
+        # インスタンス作成
+        db = DBAccess()
+        
+        # close_connection()を2回呼び出し
+        db.close_connection()
+        db.close_connection()
+        
+        # 返却処理は一度だけ行われることを確認
+        mock_conn.rollback.assert_called_once()
     
     @patch('applications.DBAccess.pymysql.connect')
     def test_execute_query_success(self, mock_connect):
@@ -156,6 +232,35 @@ class TestDBAccess:
         # 結果が正しく返されることを確認
         assert results == expected_results
     
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_execute_query_compact(self, mock_connect):
+        """
+        execute_queryメソッドのコンパクト行モードのテスト
+        
+        タプルカーソルの結果が属性アクセス可能な行に変換されることを確認します。
+        """
+        # モックの設定
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        mock_cursor.description = (('id', 3), ('name', 253))
+        mock_cursor.fetchall.return_value = ((1, 'test'), (2, 'test2'))
+        mock_connect.return_value = mock_conn
+        
+        db = DBAccess()
+        results = db.execute_query("SELECT id, name FROM test_table", compact=True)
+        
+        # タプルカーソルが使用されたことを確認
+        mock_conn.cursor.assert_called_once_with(TimedCursor)
+        # 属性・列名・添字のいずれでもアクセスできることを確認
+        assert results[0].id == 1
+        assert results[0]['name'] == 'test'
+        assert results[1][1] == 'test2'
+        assert results[1].get('missing') is None
+        # 行はインスタンス辞書を持たないことを確認
+        assert not hasattr(results[0], '__dict__')
+    
     @patch('applications.DBAccess.pymysql.connect')
     def test_commit(self, mock_connect):
         """
@@ -223,4 +328,227 @@ class TestDBAccess:
         mock_conn.rollback.assert_called_once()
         # Noneが返されることを確認
         assert result is None
+    
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_execute_many(self, mock_connect):
+        """
+        execute_manyメソッドのテスト
+        
+        複数行INSERTがmax_allowed_packetに収まる長さで実行され、
+        影響行数の合計が返されることを確認します。
+        """
+        # モックの設定
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value.__enter__ = Mock(return_value=mock_cursor)
+        mock_conn.cursor.return_value.__exit__ = Mock(return_value=None)
+        mock_cursor.fetchone.return_value = {'max_allowed_packet': 65536}
+        mock_cursor.executemany.return_value = 2
+        mock_connect.return_value = mock_conn
+        
+        db = DBAccess()
+        query = "INSERT INTO project_hours (attendance_record_id, project_id, hours) VALUES (%s, %s, %s)"
+        params_list = [(1, 1, 4.0), (1, 2, 4.0)]
+        result = db.execute_many(query, params_list)
+        
+        # 影響行数の合計が返されることを確認
+        assert result == 2
+        mock_cursor.executemany.assert_called_once_with(query, params_list)
+        # 1文の長さがmax_allowed_packetから余白を引いた値に制限されることを確認
+        assert mock_cursor.max_stmt_length == 65536 - 1024
+        
+        # max_allowed_packetはプール単位でキャッシュされることを確認
+        db.execute_many(query, params_list)
+        assert mock_cursor.execute.call_count == 1
+    
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_execute_many_empty(self, mock_connect):
+        """
+        execute_manyメソッドの空リストのテスト
+        
+        パラメータが空の場合、クエリを実行せずに0が返されることを確認します。
+        """
+        mock_conn = MagicMock()
+        mock_connect.return_value = mock_conn
+        
+        db = DBAccess()
+        
+        assert db.execute_many("INSERT INTO projects (name) VALUES (%s)", []) == 0
+        mock_conn.cursor.assert_not_called()
+    
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_iter_query_batches(self, mock_connect):
+        """
+        iter_queryメソッドのテスト
+        
+        サーバーサイドカーソルで取得した行がbatch_size件ずつyieldされ、
+        読み切った後に接続がプールへ返却されることを確認します。
+        """
+        # モックの設定（DBAccess用とiter_query用で別の接続）
+        main_conn = MagicMock()
+        stream_conn = MagicMock()
+        mock_cursor = stream_conn.cursor.return_value
+        mock_cursor.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+        mock_connect.side_effect = [main_conn, stream_conn]
+        
+        db = DBAccess()
+        query = "SELECT id FROM attendance_records"
+        batches = list(db.iter_query(query, batch_size=2))
+        
+        # バッチ単位で結果が返されることを確認
+        assert batches == [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+        stream_conn.cursor.assert_called_once_with(TimedSSDictCursor)
+        mock_cursor.execute.assert_called_once_with(query, None)
+        mock_cursor.fetchmany.assert_called_with(2)
+        # 読み切ったカーソルを閉じ、接続は閉じずに返却されることを確認
+        mock_cursor.close.assert_called_once()
+        stream_conn.close.assert_not_called()
+        stream_conn.rollback.assert_called_once()
+    
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_iter_query_closed_early(self, mock_connect):
+        """
+        iter_queryメソッドの途中終了のテスト
+        
+        ジェネレータを途中で閉じた場合、読み残しの行をサーバーから読まずに
+        接続が破棄されることを確認します。
+        """
+        # モックの設定
+        main_conn = MagicMock()
+        stream_conn = MagicMock()
+        cursor = FakeSSCursor([{'id': 1}, {'id': 2}, {'id': 3}])
+        stream_conn.cursor.return_value = cursor
+        mock_connect.side_effect = [main_conn, stream_conn]
+        
+        db = DBAccess()
+        rows = db.iter_query("SELECT id FROM attendance_records", batch_size=1)
+        assert next(rows) == [{'id': 1}]
+        rows.close()
+        
+        # 読み残しの行は読まれず、接続が破棄されて枠が解放されたことを確認
+        assert cursor.drained is False
+        assert cursor.rows == [{'id': 2}, {'id': 3}]
+        stream_conn.close.assert_called_once()
+        assert db.pool._size == 1
 
+
+class TestConnectionPool:
+    """
+    ConnectionPoolクラスのテストクラス
+    
+    接続の貸し出し・返却・検証・タイムアウトの動作をテストします。
+    """
+    
+    def test_acquire_reuses_released_connection(self):
+        """
+        返却された接続が再利用されることを確認します。
+        """
+        mock_conn = MagicMock()
+        connect = Mock(return_value=mock_conn)
+        pool = ConnectionPool(max_size=2, connect=connect)
+        
+        conn = pool.acquire()
+        pool.release(conn)
+        
+        assert pool.acquire() == mock_conn
+        connect.assert_called_once()
+    
+    def test_acquire_timeout(self):
+        """
+        上限まで貸し出し中の場合、タイムアウトで例外が送出されることを確認します。
+        """
+        connect = Mock(side_effect=lambda: MagicMock())
+        pool = ConnectionPool(max_size=1, timeout=0.05, connect=connect)
+        
+        pool.acquire()
+        
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+    
+    def test_acquire_waits_for_release(self):
+        """
+        上限に達していても、返却された接続を待って取得できることを確認します。
+        """
+        import threading
+        mock_conn = MagicMock()
+        pool = ConnectionPool(max_size=1, timeout=2, connect=Mock(return_value=mock_conn))
+        
+        conn = pool.acquire()
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        timer.start()
+        
+        assert pool.acquire() == mock_conn
+        timer.join()
+    
+    def test_expired_connection_is_recycled(self):
+        """
+        max_ageを超えた接続は破棄され、新しい接続が作成されることを確認します。
+        """
+        old_conn = MagicMock()
+        new_conn = MagicMock()
+        connect = Mock(side_effect=[old_conn, new_conn])
+        pool = ConnectionPool(max_size=1, max_age=0, connect=connect)
+        
+        conn = pool.acquire()
+        pool.release(conn)
+        
+        assert pool.acquire() == new_conn
+        old_conn.close.assert_called_once()
+    
+    def test_dead_connection_is_replaced(self):
+        """
+        pingに失敗した接続は破棄され、新しい接続が作成されることを確認します。
+        """
+        dead_conn = MagicMock()
+        dead_conn.ping.side_effect = pymysql.err.OperationalError(2006, 'MySQL server has gone away')
+        new_conn = MagicMock()
+        connect = Mock(side_effect=[dead_conn, new_conn])
+        pool = ConnectionPool(max_size=1, ping_interval=0, connect=connect)
+        
+        conn = pool.acquire()
+        pool.release(conn)
+        
+        assert pool.acquire() == new_conn
+        dead_conn.close.assert_called_once()
+    
+    def test_connect_failure_frees_slot(self):
+        """
+        接続作成に失敗しても枠が解放され、次の取得ができることを確認します。
+        """
+        mock_conn = MagicMock()
+        connect = Mock(side_effect=[pymysql.err.OperationalError(2003, 'connection refused'), mock_conn])
+        pool = ConnectionPool(max_size=1, timeout=0.05, connect=connect)
+        
+        with pytest.raises(pymysql.err.OperationalError):
+            pool.acquire()
+        
+        assert pool.acquire() == mock_conn
+
+
+class TestRowClass:
+    """
+    row_class関数のテストクラス
+    
+    コンパクトな行クラスの生成とキャッシュをテストします。
+    """
+    
+    def test_row_class_is_cached(self):
+        """
+        同じ列名の組に対して同じクラスが返されることを確認します。
+        """
+        assert row_class(('id', 'name')) is row_class(['id', 'name'])
+        assert row_class(('id', 'name')) is not row_class(('id', 'email'))
+    
+    def test_row_class_invalid_column_name(self):
+        """
+        識別子として使えない列名でも行クラスが生成でき、元の列名で値を取得できることを確認します。
+        """
+        row = row_class(('id', 'COUNT(*)', 'SUM(x)'))._make((1, 5, 7))
+        
+        assert row.id == 1
+        assert row[1] == 5
+        assert row['COUNT(*)'] == 5
+        assert row.get('SUM(x)') == 7
+        assert row.get('_1') is None
+        with pytest.raises(KeyError):
+            row['missing']
@@ -0,0 +1,137 @@
+"""
+employee_directory.pyの単体テスト
+
+社員一覧のページのクエリ（シーク・前方一致検索のUNION）、最初のページのキャッシュ、
+社員一覧画面のページ送りをテストします。
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import employee_directory, pagination
+
+
+def employees(count, start=1):
+    """
+    社員の行を作成するヘルパー関数
+    """
+    return [{'id': index, 'email': f'user{index}@example.com', 'name': f'社員{index:04d}',
+             'role': 'employee', 'created_at': None}
+            for index in range(start, start + count)]
+
+
+class TestFetchPage:
+    """
+    ページの取得のテストクラス
+    """
+
+    def test_first_page_is_cached(self):
+        """
+        検索とカーソルのない最初のページは、参照データのキャッシュから返されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = employees(pagination.DEFAULT_PAGE_SIZE + 1)
+
+        employee_directory.fetch_page(db)
+        page = employee_directory.fetch_page(db)
+
+        db.execute_query.assert_called_once()
+        assert 'LIMIT' in db.execute_query.call_args.args[0]
+        assert len(page.rows) == pagination.DEFAULT_PAGE_SIZE
+        assert page.next_cursor is not None
+
+    def test_next_page_seeks(self):
+        """
+        次のページは、カーソルの (name, id) より後の行をページサイズ+1件読むことを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = employees(3, start=11)
+        cursor = pagination.encode_cursor(('社員0010', 10))
+
+        page = employee_directory.fetch_page(db, size=5, after=cursor)
+
+        query, params = db.execute_query.call_args.args
+        assert 'name >= %s AND (name > %s OR (name = %s AND (id > %s)))' in query
+        assert 'ORDER BY name, id LIMIT %s' in query
+        assert params == ('社員0010', '社員0010', '社員0010', 10, 6)
+        assert page.next_cursor is None
+        assert pagination.decode_cursor(page.prev_cursor, 2) == ['社員0011', 11]
+
+    def test_search_uses_union(self):
+        """
+        検索は名前とメールアドレスの前方一致をUNIONで合わせ、LIKEの特殊文字をエスケープすることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = []
+
+        employee_directory.fetch_page(db, search='50%_off', size=10)
+
+        query, params = db.execute_query.call_args.args
+        assert '(SELECT id, email, name, role, created_at FROM employees WHERE name LIKE %s' in query
+        assert ') UNION (SELECT id, email, name, role, created_at FROM employees WHERE email LIKE %s' in query
+        assert params == ('50\\%\\_off%', 11, '50\\%\\_off%', 11, 11)
+
+    @pytest.mark.parametrize('cursor', ['invalid', pagination.encode_cursor(({'name': 'a'}, 1))])
+    def test_invalid_cursor(self, cursor):
+        """
+        不正なカーソル・型の合わない値のカーソルはValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            employee_directory.fetch_page(MagicMock(), after=cursor)
+
+
+class TestEmployeesListPage:
+    """
+    社員一覧画面のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        課長としてログインしたテストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = 'manager'
+
+    @patch('app.DBAccess')
+    def test_renders_one_page(self, mock_dbaccess):
+        """
+        1ページ分だけを表示し、検索語とページサイズを引き継いだ次のページへのリンクがあることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = employees(4)
+        mock_dbaccess.return_value = db
+
+        html = self.client.get('/employees?q=社員&size=3').data.decode('utf-8')
+
+        assert '社員0003' in html
+        assert '社員0004' not in html
+        cursor = pagination.encode_cursor(('社員0003', 3))
+        assert f'after={cursor}' in html
+        assert 'size=3' in html
+        assert '前のページ' not in html
+
+    @patch('app.DBAccess')
+    def test_invalid_cursor_shows_first_page(self, mock_dbaccess):
+        """
+        不正なカーソルの場合は最初のページを表示することを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = employees(2)
+        mock_dbaccess.return_value = db
+
+        response = self.client.get('/employees?size=5&after=broken')
+
+        assert response.status_code == 200
+        assert '社員0002' in response.data.decode('utf-8')
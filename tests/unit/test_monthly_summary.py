@@ -0,0 +1,152 @@
+"""
+月次集計テーブル管理の単体テスト
+
+勤怠記録の書き込み時の差分反映と、再計算処理をテストします。
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+from datetime import date
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import monthly_summary
+
+
+class TestMonthlySummary:
+    """
+    月次集計テーブル管理のテストクラス
+
+    差分の反映と再計算の動作をテストします。
+    """
+
+    def test_remove_and_add_record(self):
+        """
+        変更前の値の差し引きと変更後の値の加算が、カーソルで実行されることを確認します。
+        """
+        db = MagicMock()
+        cursor = db.get_cursor.return_value.__enter__.return_value
+
+        monthly_summary.remove_record(db, 5)
+        monthly_summary.add_record(db, 5)
+        monthly_summary.add_record(db, 6, new_record=True)
+
+        params = [call.args[1] for call in cursor.execute.call_args_list]
+        # (出勤日数, 勤務秒数の符号, 休憩秒数の符号, 勤怠記録ID)
+        assert params == [(0, -1, -1, 5), (0, 1, 1, 5), (1, 1, 1, 6)]
+
+    def test_rebuild_month(self):
+        """
+        指定月の集計が削除され、勤怠記録とアーカイブから再計算されることを確認します。
+        """
+        db = MagicMock()
+
+        monthly_summary.rebuild_month(db, 2024, 12)
+
+        delete_call, rebuild_call = db.execute_query.call_args_list
+        assert delete_call.args[1] == (2024, 12)
+        assert rebuild_call.args[1] == (date(2024, 12, 1), date(2025, 1, 1)) * 2
+        assert 'GROUP BY' in rebuild_call.args[0]
+        assert 'attendance_records_archive' in rebuild_call.args[0]
+
+    def test_main_requires_month(self):
+        """
+        年月も--allも指定しない場合、エラーになることを確認します。
+        """
+        with pytest.raises(SystemExit):
+            monthly_summary.main(['--year', '2024'])
+
+    @patch('applications.monthly_summary.DBAccess')
+    def test_main_rebuild(self, mock_dbaccess):
+        """
+        コマンドラインから再計算した場合、コミットされることを確認します。
+        """
+        db = MagicMock()
+        mock_dbaccess.return_value = db
+
+        assert monthly_summary.main(['--year', '2024', '--month', '1']) == 0
+
+        db.commit.assert_called_once()
+        db.close_connection.assert_called_once()
+
+
+class TestAttendanceInputSummary:
+    """
+    勤怠入力時の月次集計反映のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        テストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'employee@example.com'
+            sess['user_name'] = 'Employee User'
+            sess['user_role'] = 'employee'
+
+    @patch('app.monthly_summary')
+    @patch('app.DBAccess')
+    def test_update_applies_delta(self, mock_dbaccess, mock_summary):
+        """
+        既存記録の更新時に、変更前の値の差し引きと変更後の値の加算がコミット前に行われることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.execute_query.side_effect = [
+            [{'id': 3}],  # 既存記録あり
+            [{'id': 1, 'name': 'Project A'}],  # プロジェクト一覧
+            [],  # 勤怠記録の更新
+            []  # project_hours削除
+        ]
+        mock_dbaccess.return_value = mock_db_instance
+        calls = []
+        mock_db_instance.commit.side_effect = lambda: calls.append('commit')
+        mock_summary.remove_record.side_effect = lambda db, record_id: calls.append(('remove', record_id))
+        mock_summary.add_record.side_effect = lambda db, record_id: calls.append(('add', record_id))
+
+        response = self.client.post('/attendance/input', data={
+            'date': date.today().isoformat(),
+            'attendance_type': '出勤',
+            'start_time': '09:00',
+            'end_time': '18:00',
+            'break_time': '01:00'
+        })
+
+        assert response.status_code == 302
+        assert calls[:3] == [('remove', 3), ('add', 3), 'commit']
+
+    @patch('app.monthly_summary')
+    @patch('app.DBAccess')
+    def test_create_adds_day(self, mock_dbaccess, mock_summary):
+        """
+        新規作成時に、出勤日数を含めて集計に加算されることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.get_cursor.return_value.lastrowid = 7
+        mock_db_instance.execute_query.side_effect = [
+            [],  # 既存記録なし
+            [{'id': 1, 'name': 'Project A'}],  # プロジェクト一覧
+            []  # project_hours削除
+        ]
+        mock_dbaccess.return_value = mock_db_instance
+
+        response = self.client.post('/attendance/input', data={
+            'date': date.today().isoformat(),
+            'attendance_type': '出勤',
+            'start_time': '09:00',
+            'end_time': '18:00',
+            'break_time': '01:00'
+        })
+
+        assert response.status_code == 302
+        mock_summary.add_record.assert_called_once_with(mock_db_instance, 7, new_record=True)
+        mock_summary.remove_record.assert_not_called()
@@ -0,0 +1,168 @@
+"""
+pagination.pyの単体テスト
+
+カーソルの変換、ページサイズの解釈、シークの条件の作成、読み込んだ行からのページの作成をテストします。
+"""
+
+import pytest
+from datetime import date
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications import pagination
+from applications.pagination import Page
+
+
+class TestCursor:
+    """
+    カーソルの変換のテストクラス
+    """
+
+    def test_round_trip(self):
+        """
+        カーソルがURLに使える文字だけで構成され、元の値に戻せることを確認します。
+        """
+        cursor = pagination.encode_cursor(('山田 太郎', 42))
+
+        assert cursor.replace('-', '').replace('_', '').isalnum()
+        assert pagination.decode_cursor(cursor, 2) == ['山田 太郎', 42]
+
+    def test_date_is_string(self):
+        """
+        日付の値はISO形式の文字列になることを確認します。
+        """
+        cursor = pagination.encode_cursor((3, date(2025, 10, 1)))
+
+        assert pagination.decode_cursor(cursor, 2) == [3, '2025-10-01']
+
+    @pytest.mark.parametrize('cursor', ['!!!', 'e30', pagination.encode_cursor(('a',))])
+    def test_invalid(self, cursor):
+        """
+        不正な文字列・リストでない値・列数の違う値はValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            pagination.decode_cursor(cursor, 2)
+
+    def test_types(self):
+        """
+        値の型を指定した場合、型が合えば値が返されることを確認します。
+        """
+        cursor = pagination.encode_cursor(('山田 太郎', 42))
+
+        assert pagination.decode_cursor(cursor, 2, (str, int)) == ['山田 太郎', 42]
+
+    @pytest.mark.parametrize('values', [(1, 42), ('a', '42'), ('a', True), ('a', None), (['a'], 42)])
+    def test_invalid_types(self, values):
+        """
+        値の型が合わない場合はValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            pagination.decode_cursor(pagination.encode_cursor(values), 2, (str, int))
+
+
+class TestPageSize:
+    """
+    ページサイズの解釈のテストクラス
+    """
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, pagination.DEFAULT_PAGE_SIZE),
+        ('abc', pagination.DEFAULT_PAGE_SIZE),
+        ('20', 20),
+        ('0', 1),
+        ('100000', pagination.MAX_PAGE_SIZE),
+    ])
+    def test_page_size(self, value, expected):
+        """
+        値がない・不正な場合はデフォルト、範囲外の場合は1〜MAX_PAGE_SIZEに収まることを確認します。
+        """
+        assert pagination.page_size(value) == expected
+
+
+class TestSeekCondition:
+    """
+    シークの条件の作成のテストクラス
+    """
+
+    def test_ascending(self):
+        """
+        2列のソートキーで、先頭の列の範囲条件を含む展開した条件になることを確認します。
+        """
+        condition, params = pagination.seek_condition(('name', 'id'), ['佐藤', 7])
+
+        assert condition == 'name >= %s AND (name > %s OR (name = %s AND (id > %s)))'
+        assert params == ['佐藤', '佐藤', '佐藤', 7]
+
+    def test_descending(self):
+        """
+        降順の場合は比較が逆向きになり、ORDER BYの列にDESCが付くことを確認します。
+        """
+        condition, params = pagination.seek_condition(('date',), ['2025-10-01'], descending=True)
+
+        assert condition == 'date <= %s AND (date < %s)'
+        assert params == ['2025-10-01', '2025-10-01']
+        assert pagination.order_by(('employee_id', 'date'), descending=True) == 'employee_id DESC, date DESC'
+
+    def test_matches_tuple_comparison(self):
+        """
+        展開した条件が、タプルの大小比較と同じ行を選ぶことを確認します。
+        """
+        condition, params = pagination.seek_condition(('a', 'b', 'c'), [1, 2, 3])
+        expression = condition.replace('%s', '{}').replace(' = ', ' == ').format(*params)
+        expression = expression.replace('AND', 'and').replace('OR', 'or')
+
+        for a in range(3):
+            for b in range(4):
+                for c in range(5):
+                    assert eval(expression, {'a': a, 'b': b, 'c': c}) == ((a, b, c) > (1, 2, 3))
+
+
+class TestPage:
+    """
+    ページの作成のテストクラス
+    """
+
+    ROWS = [{'name': name, 'id': index} for index, name in enumerate('abcd', start=1)]
+
+    def test_first_page(self):
+        """
+        1件多く読めた場合は次のページのカーソルがあり、最初のページに前のページはないことを確認します。
+        """
+        page = Page.from_rows(self.ROWS, 3, ('name', 'id'))
+
+        assert [row['name'] for row in page.rows] == ['a', 'b', 'c']
+        assert pagination.decode_cursor(page.next_cursor, 2) == ['c', 3]
+        assert page.prev_cursor is None
+
+    def test_last_page(self):
+        """
+        カーソルで進んだ最後のページは、前のページのカーソルだけを持つことを確認します。
+        """
+        page = Page.from_rows(self.ROWS[3:], 3, ('name', 'id'), has_cursor=True)
+
+        assert page.next_cursor is None
+        assert pagination.decode_cursor(page.prev_cursor, 2) == ['d', 4]
+
+    def test_backward(self):
+        """
+        前のページへ戻るクエリの結果（逆順）は表示の順に戻され、両方向のカーソルを持つことを確認します。
+        """
+        page = Page.from_rows(list(reversed(self.ROWS)), 3, ('name', 'id'), backward=True, has_cursor=True)
+
+        assert [row['name'] for row in page.rows] == ['b', 'c', 'd']
+        assert pagination.decode_cursor(page.prev_cursor, 2) == ['b', 2]
+        assert pagination.decode_cursor(page.next_cursor, 2) == ['d', 4]
+
+    def test_empty(self):
+        """
+        行がない場合はどちらのカーソルもないことを確認します。
+        """
+        page = Page.from_rows([], 3, ('name', 'id'), has_cursor=True)
+
+        assert page.rows == []
+        assert page.next_cursor is None and page.prev_cursor is None
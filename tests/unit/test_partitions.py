@@ -0,0 +1,153 @@
+"""
+partitions.pyの単体テスト
+
+パーティション定義の生成、先の月のパーティションの作成、古いパーティションの削除をテストします。
+"""
+
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+from datetime import date
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/partitions.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications import partitions
+
+
+def partition_rows(*names):
+    """
+    information_schema.partitionsの行を作成するヘルパー関数
+
+    Args:
+        names: 月のパーティション名（p202401 形式）
+
+    Returns:
+        list: パーティション名と上限の行のリスト（末尾にpmaxを含む）
+    """
+    rows = []
+    for name in names:
+        upper = partitions.add_months(date(int(name[1:5]), int(name[5:7]), 1), 1)
+        rows.append({'name': name, 'description': f"'{upper.isoformat()}'"})
+    rows.append({'name': 'pmax', 'description': 'MAXVALUE'})
+    return rows
+
+
+class TestPartitions:
+    """
+    パーティション管理のテストクラス
+    """
+
+    def test_partition_clauses(self):
+        """
+        年をまたぐ範囲の月ごとのパーティション定義が生成されることを確認します。
+        """
+        clauses = partitions.partition_clauses(date(2024, 11, 1), date(2025, 1, 15))
+
+        assert clauses == [
+            "PARTITION p202411 VALUES LESS THAN ('2024-12-01')",
+            "PARTITION p202412 VALUES LESS THAN ('2025-01-01')",
+            "PARTITION p202501 VALUES LESS THAN ('2025-02-01')",
+        ]
+
+    def test_list_partitions(self):
+        """
+        パーティションの上限が日付に変換され、pmaxの上限がNoneになることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = partition_rows('p202401')
+
+        assert partitions.list_partitions(db) == [('p202401', date(2024, 2, 1)), ('pmax', None)]
+
+    def test_ensure_future_partitions(self):
+        """
+        最後の月のパーティションの翌月から、先の月までのパーティションがpmaxの分割で作成されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.side_effect = [partition_rows('p202401', 'p202402'), []]
+
+        created = partitions.ensure_future_partitions(db, months_ahead=2, today=date(2024, 3, 20))
+
+        assert created == ['p202403', 'p202404', 'p202405']
+        alter = db.execute_query.call_args_list[1].args[0]
+        assert alter.startswith('ALTER TABLE attendance_records REORGANIZE PARTITION pmax INTO (')
+        assert alter.endswith('PARTITION pmax VALUES LESS THAN (MAXVALUE))')
+
+    def test_ensure_future_partitions_up_to_date(self):
+        """
+        先の月までのパーティションが作成済みの場合、何もしないことを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = partition_rows('p202403', 'p202404')
+
+        assert partitions.ensure_future_partitions(db, months_ahead=1, today=date(2024, 3, 1)) == []
+        db.execute_query.assert_called_once()
+
+    def test_ensure_future_partitions_not_partitioned(self):
+        """
+        テーブルがパーティション分割されていない場合、エラーになることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = []
+
+        with pytest.raises(RuntimeError):
+            partitions.ensure_future_partitions(db)
+
+    def test_ensure_past_partitions(self):
+        """
+        最初のパーティションが、指定した月からの月ごとのパーティションに分割されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.side_effect = [partition_rows('p202404', 'p202405'), []]
+
+        created = partitions.ensure_past_partitions(db, date(2024, 1, 15))
+
+        assert created == ['p202401', 'p202402', 'p202403']
+        alter = db.execute_query.call_args_list[1].args[0]
+        assert alter.startswith('ALTER TABLE attendance_records REORGANIZE PARTITION p202404 INTO (')
+        assert alter.endswith("PARTITION p202404 VALUES LESS THAN ('2024-05-01'))")
+
+    def test_ensure_past_partitions_covered(self):
+        """
+        指定した月が最初のパーティションの月以降の場合、何もしないことを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = partition_rows('p202404')
+
+        assert partitions.ensure_past_partitions(db, date(2024, 4, 1)) == []
+        db.execute_query.assert_called_once()
+
+    def test_expire_partitions(self):
+        """
+        保持期間を過ぎたパーティションだけが、プロジェクト作業時間の削除の後に削除されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = partition_rows('p202401', 'p202402', 'p202403')
+
+        expired = partitions.expire_partitions(db, retain_months=1, today=date(2024, 4, 10))
+
+        assert expired == ['p202401', 'p202402']
+        statements = [call.args[0].strip() for call in db.execute_query.call_args_list[1:]]
+        assert statements[0].startswith('DELETE ph')
+        assert 'PARTITION (p202401)' in statements[0]
+        assert statements[1] == 'ALTER TABLE attendance_records DROP PARTITION p202401'
+        assert statements[3] == 'ALTER TABLE attendance_records DROP PARTITION p202402'
+
+    def test_expire_partitions_exchange(self):
+        """
+        exchangeを指定した場合、削除する前に退避テーブルと交換されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = partition_rows('p202401', 'p202402')
+
+        partitions.expire_partitions(db, retain_months=1, today=date(2024, 3, 1), exchange=True)
+
+        statements = [call.args[0].strip() for call in db.execute_query.call_args_list[1:]]
+        assert 'INSERT INTO project_hours_p202401' in statements[1]
+        assert statements[-2] == (
+            'ALTER TABLE attendance_records EXCHANGE PARTITION p202401 WITH TABLE attendance_records_p202401'
+        )
+        assert statements[-1] == 'ALTER TABLE attendance_records DROP PARTITION p202401'
@@ -0,0 +1,207 @@
+"""
+project_report.pyの単体テスト
+
+プロジェクトごと・月ごと、プロジェクトごと・社員ごとの集計、アーカイブテーブルの合算、
+プロジェクト別レポートの画面とCSVダウンロードをテストします。
+"""
+
+import csv
+import io
+import pytest
+from unittest.mock import patch, MagicMock
+from datetime import date
+from decimal import Decimal
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import project_report
+from applications.DBAccess import row_class
+
+TODAY = date(2025, 10, 20)
+
+MonthRow = row_class(('project_id', 'project_name', 'year', 'month', 'hours'))
+EmployeeRow = row_class(('project_id', 'employee_id', 'employee_name', 'hours'))
+CsvRow = row_class(('project_id', 'project_name', 'year', 'month', 'employee_id', 'employee_name', 'hours'))
+
+
+def mock_db(*results):
+    """
+    execute_queryが順に結果を返すモックのDBAccessを作成するヘルパー関数
+    """
+    db = MagicMock()
+    db.execute_query.side_effect = list(results)
+    return db
+
+
+class TestFetchReport:
+    """
+    プロジェクト別の集計のテストクラス
+    """
+
+    def test_project_month_and_employee(self):
+        """
+        プロジェクトごと・月ごとの表と、プロジェクトごとの社員の作業時間（多い順）が作成されることを確認します。
+        """
+        db = mock_db(
+            [MonthRow(7, '案件B', 2025, 4, Decimal('8.00')), MonthRow(7, '案件B', 2025, 6, Decimal('1.50')),
+             MonthRow(3, '案件A', 2025, 5, Decimal('2.25'))],
+            [EmployeeRow(7, 1, '佐藤', Decimal('1.50')), EmployeeRow(7, 2, '鈴木', Decimal('8.00')),
+             EmployeeRow(3, 1, '佐藤', Decimal('2.25'))],
+        )
+
+        months, projects, employees = project_report.fetch_report(db, date(2025, 4, 1), date(2025, 6, 30), today=TODAY)
+
+        assert months == [(2025, 4), (2025, 5), (2025, 6)]
+        assert [row.project_name for row in projects] == ['案件A', '案件B']
+        assert projects[1].cells == [Decimal('8.00'), None, Decimal('1.50')]
+        assert projects[1].total == Decimal('9.50')
+        assert [row.employee_name for row in employees[7]] == ['鈴木', '佐藤']
+        assert db.execute_query.call_count == 2
+
+        query, params = db.execute_query.call_args_list[0].args
+        assert 'FROM project_hours ph' in query
+        assert 'JOIN attendance_records ar ON ar.id = ph.attendance_record_id' in query
+        assert 'GROUP BY ph.project_id, p.name, YEAR(ar.date), MONTH(ar.date)' in query
+        assert params == (date(2025, 4, 1), date(2025, 7, 1))
+
+    def test_project_filter(self):
+        """
+        プロジェクトを指定すると、project_idの条件を付けて集計することを確認します。
+        """
+        db = mock_db([], [])
+
+        project_report.fetch_report(db, date(2025, 4, 1), date(2025, 4, 30), project_id=7, today=TODAY)
+
+        for call in db.execute_query.call_args_list:
+            query, params = call.args
+            assert 'AND ph.project_id = %s' in query
+            assert params == (date(2025, 4, 1), date(2025, 5, 1), 7)
+
+    def test_adds_archive(self):
+        """
+        締め済みの年度を含む期間は、アーカイブテーブルの集計も合計に加えることを確認します。
+        """
+        db = mock_db(
+            [MonthRow(7, '案件B', 2025, 3, Decimal('4.00'))],
+            [MonthRow(7, '案件B', 2025, 4, Decimal('2.00'))],
+            [EmployeeRow(7, 1, '佐藤', Decimal('4.00'))],
+            [EmployeeRow(7, 1, '佐藤', Decimal('2.00'))],
+        )
+
+        months, projects, employees = project_report.fetch_report(db, date(2025, 3, 1), date(2025, 4, 30), today=TODAY)
+
+        assert 'FROM project_hours_archive ph' in db.execute_query.call_args_list[0].args[0]
+        assert 'FROM project_hours ph' in db.execute_query.call_args_list[1].args[0]
+        assert projects[0].cells == [Decimal('4.00'), Decimal('2.00')]
+        assert employees[7] == [(1, '佐藤', Decimal('6.00'))]
+
+    def test_invalid_range(self):
+        """
+        最終日が初日より前の期間はValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            project_report.fetch_report(MagicMock(), date(2025, 5, 1), date(2025, 4, 30), today=TODAY)
+
+
+class TestProjectReportViews:
+    """
+    プロジェクト別レポートの画面とCSVダウンロードのテストクラス
+    """
+
+    def login(self, role='manager'):
+        """
+        指定した権限でログインしたテストクライアントを返すヘルパーメソッド
+        """
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = role
+        return client
+
+    @patch('app.reference_cache')
+    @patch('app.DBAccess')
+    def test_report(self, mock_dbaccess, mock_reference_cache):
+        """
+        プロジェクトごとの表と社員ごとの作業時間、CSVのリンクが表示されることを確認します。
+        """
+        mock_reference_cache.get.return_value = [{'id': 7, 'name': '案件B'}]
+        today = date.today()
+        mock_dbaccess.return_value = mock_db(
+            [MonthRow(7, '案件B', today.year, today.month, Decimal('7.50'))],
+            [EmployeeRow(7, 1, '佐藤 花子', Decimal('7.50'))],
+        )
+
+        response = self.login().get(f'/report/projects?from={today:%Y-%m}-01&to={today.isoformat()}')
+
+        assert response.status_code == 200
+        html = response.data.decode('utf-8')
+        assert '案件B' in html and '佐藤 花子' in html and '7.50' in html
+        assert '/report/projects.csv?' in html
+
+    @patch('app.reference_cache')
+    @patch('app.DBAccess')
+    def test_invalid_range(self, mock_dbaccess, mock_reference_cache):
+        """
+        不正な期間はエラーを表示し、集計しないことを確認します。
+        """
+        mock_reference_cache.get.return_value = []
+        db = MagicMock()
+        mock_dbaccess.return_value = db
+
+        response = self.login().get('/report/projects?from=2025-05-01&to=2025-04-01')
+
+        assert response.status_code == 200
+        assert '期間を正しく指定してください' in response.data.decode('utf-8')
+        db.execute_query.assert_not_called()
+
+    @patch('app.DBAccess')
+    def test_csv(self, mock_dbaccess):
+        """
+        プロジェクト・年月・社員ごとの作業時間がサーバーサイドカーソルで読まれ、CSVで返されることを確認します。
+        """
+        db = MagicMock()
+        db.iter_query.side_effect = [
+            iter([[CsvRow(7, '案件B', 2025, 3, 1, '佐藤 花子', Decimal('4.00'))]]),
+            iter([[CsvRow(7, '案件B', 2025, 4, 1, '佐藤 花子', Decimal('2.50'))]]),
+        ]
+        mock_dbaccess.return_value = db
+
+        response = self.login().get('/report/projects.csv?from=2025-03-01&to=2025-04-30&project_id=7')
+
+        # 送信中はiter_queryの接続だけを使い、リクエストの接続は先に返している
+        db.close_connection.assert_called_once()
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert 'project_report_20250301_20250430.csv' in response.headers['Content-Disposition']
+        rows = list(csv.reader(io.StringIO(response.data.decode('utf-8-sig'))))
+        assert rows == [list(project_report.CSV_HEADER),
+                        ['2025', '3', '7', '案件B', '1', '佐藤 花子', '4.00'],
+                        ['2025', '4', '7', '案件B', '1', '佐藤 花子', '2.50']]
+        query, params = db.iter_query.call_args_list[1].args
+        assert 'ORDER BY year, month, ph.project_id, ar.employee_id' in query
+        assert params == (date(2025, 3, 1), date(2025, 5, 1), 7)
+        db.execute_query.assert_not_called()
+        response.close()
+
+    def test_csv_invalid_range(self):
+        """
+        不正な期間のCSVはプロジェクト別レポートの画面へリダイレクトすることを確認します。
+        """
+        response = self.login().get('/report/projects.csv?from=2025-05-01&to=broken')
+
+        assert response.status_code == 302
+        assert '/report/projects' in response.location
+
+    def test_requires_manager(self):
+        """
+        社員はプロジェクト別レポートを表示できないことを確認します。
+        """
+        assert self.login('employee').get('/report/projects').status_code != 200
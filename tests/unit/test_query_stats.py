@@ -0,0 +1,160 @@
+"""
+query_stats.pyの単体テスト
+
+クエリのフィンガープリント、ヒストグラム集計、スロークエリログをテストします。
+"""
+
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import logging
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/query_stats.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.query_stats import QueryStats, fingerprint, get_query_stats, record_query, reset_query_stats
+from applications.DBAccess import TimedDictCursor
+
+
+class TestFingerprint:
+    """
+    fingerprint関数のテストクラス
+
+    SQL文がパラメータを除いて正規化されることをテストします。
+    """
+
+    def test_placeholders_and_whitespace(self):
+        """
+        プレースホルダと空白が正規化されることを確認します。
+        """
+        query = """
+            SELECT id FROM attendance_records
+            WHERE employee_id = %s AND date = %s
+        """
+        assert fingerprint(query) == 'select id from attendance_records where employee_id = ? and date = ?'
+
+    def test_literals(self):
+        """
+        文字列・数値リテラルが除去されることを確認します。
+        """
+        assert fingerprint("SELECT * FROM employees WHERE email = 'a@example.com' AND id = 12") == \
+            fingerprint("SELECT * FROM employees WHERE email = 'b@example.com' AND id = 3")
+
+    def test_in_and_values_lists(self):
+        """
+        IN句と複数行VALUESの件数違いが同じフィンガープリントになることを確認します。
+        """
+        assert fingerprint("SELECT name FROM projects WHERE id IN (1, 2, 3)") == \
+            fingerprint("SELECT name FROM projects WHERE id IN (%s)")
+        assert fingerprint("INSERT INTO projects (name) VALUES ('a'),('b'),('c')") == \
+            fingerprint("INSERT INTO projects (name) VALUES (%s)")
+
+
+class TestQueryStats:
+    """
+    QueryStatsクラスのテストクラス
+
+    実行時間のヒストグラム集計をテストします。
+    """
+
+    def test_record_and_snapshot(self):
+        """
+        記録した実行時間が件数・合計・最大・累積バケットに集計されることを確認します。
+        """
+        stats = QueryStats(buckets=(10, 100))
+        stats.record('select ?', 5)
+        stats.record('select ?', 50)
+        stats.record('select ?', 500)
+
+        result = stats.snapshot()[0]
+
+        assert result['fingerprint'] == 'select ?'
+        assert result['count'] == 3
+        assert result['total_ms'] == 555
+        assert result['max_ms'] == 500
+        assert result['buckets'] == {10: 1, 100: 2, '+Inf': 3}
+
+    def test_snapshot_order(self):
+        """
+        集計結果が合計時間の降順で返されることを確認します。
+        """
+        stats = QueryStats()
+        stats.record('fast', 1)
+        stats.record('slow', 100)
+
+        assert [result['fingerprint'] for result in stats.snapshot()] == ['slow', 'fast']
+
+
+class TestRecordQuery:
+    """
+    record_query関数のテストクラス
+
+    プロセス共通の統計への記録とスロークエリログをテストします。
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        プロセス共通の統計を破棄します。
+        """
+        reset_query_stats()
+
+    def teardown_method(self):
+        """
+        テストメソッド実行後のクリーンアップ
+
+        プロセス共通の統計を破棄します。
+        """
+        reset_query_stats()
+
+    @patch.dict(os.environ, {'SLOW_QUERY_THRESHOLD_MS': '100'})
+    def test_slow_query_logged(self, caplog):
+        """
+        閾値を超えたクエリのみがスロークエリログに出力されることを確認します。
+        """
+        with caplog.at_level(logging.WARNING, logger='applications.slow_query'):
+            record_query("SELECT * FROM employees WHERE id = %s", 10)
+            record_query("SELECT * FROM employees WHERE id = %s", 150)
+
+        assert len(caplog.records) == 1
+        assert 'select * from employees where id = ?' in caplog.records[0].getMessage()
+        assert 'route=-' in caplog.records[0].getMessage()
+        assert get_query_stats()[0]['count'] == 2
+
+    @patch('pymysql.cursors.DictCursor.execute', return_value=1)
+    def test_timed_cursor_records(self, mock_execute):
+        """
+        TimedDictCursorで実行したクエリが統計に記録されることを確認します。
+        """
+        cursor = TimedDictCursor(MagicMock())
+
+        assert cursor.execute("SELECT id FROM projects WHERE id = %s", (1,)) == 1
+
+        mock_execute.assert_called_once_with("SELECT id FROM projects WHERE id = %s", (1,))
+        stats = get_query_stats()
+        assert stats[0]['fingerprint'] == 'select id from projects where id = ?'
+        assert stats[0]['count'] == 1
+
+    @patch('pymysql.cursors.DictCursor.execute', return_value=2)
+    def test_executemany_records_template(self, mock_execute):
+        """
+        executemanyは、値を埋め込んだ複数行INSERTの文ではなく、元の文で1回だけ記録されることを確認します。
+        """
+        connection = MagicMock(encoding='utf8')
+        connection.literal.side_effect = repr
+        cursor = TimedDictCursor(connection)
+        cursor.max_stmt_length = 64
+        query = "INSERT INTO projects (id, name) VALUES (%s, %s)"
+
+        with patch('applications.DBAccess.result_cache') as mock_result_cache:
+            assert cursor.executemany(query, [(index, f'project {index}') for index in range(10)]) > 0
+
+        assert mock_execute.call_count > 1
+        assert mock_execute.call_args.args[0].startswith(b'INSERT INTO projects (id, name) VALUES (')
+        stats = get_query_stats()
+        assert [stat['fingerprint'] for stat in stats] == ['insert into projects (id, name) values (?, ?)']
+        assert stats[0]['count'] == 1
+        mock_result_cache.note_write.assert_called_once_with(cursor.connection, query)
@@ -0,0 +1,190 @@
+"""
+range_report.pyの単体テスト
+
+期間の年月の解釈、社員×月の表への組み替え、1回のクエリでの取得とページ分割、
+期間レポートの画面をテストします。
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from decimal import Decimal
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications import pagination, range_report
+from applications.DBAccess import row_class
+
+SummaryRow = row_class(('employee_id', 'employee_name', 'year', 'month', 'attendance_days',
+                        'total_hours', 'total_break_hours'))
+
+MONTHS = [(2024, 11), (2024, 12), (2025, 1)]
+
+ROWS = [
+    SummaryRow(2, '佐藤 花子', 2024, 11, 20, Decimal('160.0000'), Decimal('20.0000')),
+    SummaryRow(2, '佐藤 花子', 2025, 1, 3, Decimal('24.5000'), Decimal('3.0000')),
+    SummaryRow(1, '田中 次郎', None, None, None, None, None),
+]
+
+
+class TestMonths:
+    """
+    期間の年月のテストクラス
+    """
+
+    def test_parse_month(self):
+        """
+        YYYY-MM形式の年月が (年, 月) に変換されることを確認します。
+        """
+        assert range_report.parse_month('2025-04') == (2025, 4)
+
+    @pytest.mark.parametrize('value', ['2025-13', '2025', '2025-04-01', 'abc', None])
+    def test_parse_month_invalid(self, value):
+        """
+        不正な年月はValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            range_report.parse_month(value)
+
+    def test_month_span_across_years(self):
+        """
+        年をまたぐ期間の年月が順に返されることを確認します。
+        """
+        assert range_report.month_span((2024, 11), (2025, 1)) == MONTHS
+
+    def test_month_span_limits(self):
+        """
+        逆順の期間と、MAX_MONTHSか月を超える期間はValueErrorになることを確認します。
+        """
+        with pytest.raises(ValueError):
+            range_report.month_span((2025, 2), (2025, 1))
+        assert len(range_report.month_span((2020, 1), (2024, 12))) == range_report.MAX_MONTHS
+        with pytest.raises(ValueError):
+            range_report.month_span((2020, 1), (2025, 1))
+
+
+class TestFetchMatrix:
+    """
+    社員×月の表の取得のテストクラス
+    """
+
+    def test_pivot(self):
+        """
+        社員・年月ごとの行が、月の順のセルと期間の合計を持つ社員ごとの行に組み替えられることを確認します。
+        """
+        matrix = range_report.pivot(ROWS, MONTHS)
+
+        assert [row.employee_name for row in matrix] == ['佐藤 花子', '田中 次郎']
+        first = matrix[0]
+        assert first.cells[0] == (20, Decimal('160.0000'), Decimal('20.0000'))
+        assert first.cells[1] is None
+        assert first.totals == (23, Decimal('184.5000'), Decimal('23.0000'))
+        assert matrix[1].cells == [None, None, None]
+        assert matrix[1].totals == (0, 0, 0)
+
+    def test_single_query(self):
+        """
+        期間の月数にかかわらず、1ページ分の社員と期間内の集計を1回のクエリで読むことを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = ROWS
+
+        page = range_report.fetch_matrix(db, MONTHS, size=1)
+
+        db.execute_query.assert_called_once()
+        query, params = db.execute_query.call_args.args
+        assert 'LEFT JOIN employee_monthly_summary s' in query
+        assert 'GROUP BY' not in query
+        assert params == (2, 2024, 2025, 2024, 11, 2025, 1)
+        assert [row.employee_id for row in page.rows] == [2]
+        assert pagination.decode_cursor(page.next_cursor, 2) == ['佐藤 花子', 2]
+        assert page.prev_cursor is None
+
+    def test_seek(self):
+        """
+        カーソルを指定すると、社員を (name, id) のシークで読むことを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = ROWS[2:]
+        cursor = pagination.encode_cursor(('佐藤 花子', 2))
+
+        page = range_report.fetch_matrix(db, MONTHS, size=1, after=cursor)
+
+        query, params = db.execute_query.call_args.args
+        assert 'WHERE name >= %s AND (name > %s OR (name = %s AND (id > %s)))' in query
+        assert params[:5] == ('佐藤 花子', '佐藤 花子', '佐藤 花子', 2, 2)
+        assert [row.employee_id for row in page.rows] == [1]
+        assert page.next_cursor is None
+        assert page.prev_cursor is not None
+
+    @pytest.mark.parametrize('cursor', ['broken', pagination.encode_cursor((2, '佐藤 花子'))])
+    def test_invalid_cursor(self, cursor):
+        """
+        不正なカーソル・型の合わない値のカーソルはValueErrorになり、クエリを実行しないことを確認します。
+        """
+        db = MagicMock()
+
+        with pytest.raises(ValueError):
+            range_report.fetch_matrix(db, MONTHS, size=1, after=cursor)
+        db.execute_query.assert_not_called()
+
+
+class TestRangeReportView:
+    """
+    期間レポートの画面のテストクラス
+    """
+
+    def login(self, role='manager'):
+        """
+        指定した権限でログインしたテストクライアントを返すヘルパーメソッド
+        """
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = role
+        return client
+
+    @patch('app.DBAccess')
+    def test_pivoted_table(self, mock_dbaccess):
+        """
+        月ごとの列と合計の列を持つ表が表示されることを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = ROWS
+        mock_dbaccess.return_value = db
+
+        response = self.login().get('/report/range?from=2024-11&to=2025-01')
+
+        assert response.status_code == 200
+        html = response.data.decode('utf-8')
+        assert '2024年11月' in html and '2025年1月' in html and '合計' in html
+        assert '184.50' in html
+        db.execute_query.assert_called_once()
+
+    @patch('app.DBAccess')
+    def test_invalid_range_shows_default(self, mock_dbaccess):
+        """
+        不正な期間はエラーを表示し、今年度の期間で表示することを確認します。
+        """
+        db = MagicMock()
+        db.execute_query.return_value = []
+        mock_dbaccess.return_value = db
+
+        response = self.login().get('/report/range?from=2025-06&to=2025-01')
+
+        assert response.status_code == 200
+        assert '期間の最後の月は最初の月以降を指定してください' in response.data.decode('utf-8')
+        db.execute_query.assert_called_once()
+
+    def test_requires_manager(self):
+        """
+        社員は期間レポートを表示できないことを確認します。
+        """
+        assert self.login('employee').get('/report/range').status_code != 200
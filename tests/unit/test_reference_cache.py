@@ -0,0 +1,160 @@
+"""
+reference_cache.pyの単体テスト
+
+参照データのキャッシュ、バージョンによる無効化、確認間隔をテストします。
+"""
+
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from app import app
+from applications.reference_cache import ReferenceCache
+
+QUERIES = {'projects': ("SELECT id, name FROM projects ORDER BY name", False)}
+
+
+def mock_db(versions):
+    """
+    cache_versionsの内容を返すモックのDBAccessを作成するヘルパー関数
+
+    Args:
+        versions: 名前とバージョンの辞書
+
+    Returns:
+        MagicMock: モックのDBAccess
+    """
+    db = MagicMock()
+    cursor = db.get_cursor.return_value.__enter__.return_value
+    cursor.fetchall.side_effect = lambda: [
+        {'name': name, 'version': version} for name, version in versions.items()
+    ]
+    db.execute_query.return_value = [{'id': 1, 'name': 'Project A'}]
+    return db
+
+
+class TestReferenceCache:
+    """
+    参照データのキャッシュのテストクラス
+    """
+
+    def test_cached_until_version_changes(self):
+        """
+        バージョンが同じ間はキャッシュを返し、上がった場合に読み直すことを確認します。
+        """
+        versions = {'projects': 1}
+        db = mock_db(versions)
+        cache = ReferenceCache(QUERIES, ttl=0)
+
+        first = cache.get(db, 'projects')
+        assert cache.get(db, 'projects') is first
+        db.execute_query.assert_called_once()
+
+        versions['projects'] = 2
+        cache.get(db, 'projects')
+        assert db.execute_query.call_count == 2
+
+    def test_ttl_limits_version_checks(self):
+        """
+        確認間隔の間は、cache_versionsを読まないことを確認します。
+        """
+        db = mock_db({'projects': 1})
+        cache = ReferenceCache(QUERIES, ttl=60)
+
+        cache.get(db, 'projects')
+        cache.get(db, 'projects')
+
+        db.get_cursor.assert_called_once()
+
+    def test_checks_once_per_request(self):
+        """
+        同じリクエスト内では、確認間隔に関係なくバージョンを1回だけ読むことを確認します。
+        """
+        db = mock_db({'projects': 1})
+        cache = ReferenceCache(QUERIES, ttl=0)
+
+        with app.test_request_context('/attendance/input'):
+            cache.get(db, 'projects')
+            cache.get(db, 'projects')
+
+        db.get_cursor.assert_called_once()
+
+    def test_bump(self):
+        """
+        バージョンを上げると、同じトランザクションで更新され、このプロセスのデータが破棄されることを確認します。
+        """
+        db = mock_db({})
+        cache = ReferenceCache(QUERIES, ttl=60)
+        cache.get(db, 'projects')
+
+        cache.bump(db, 'projects')
+        cache.get(db, 'projects')
+
+        cursor = db.get_cursor.return_value.__enter__.return_value
+        assert 'ON DUPLICATE KEY UPDATE version = version + 1' in cursor.execute.call_args_list[1].args[0]
+        assert cursor.execute.call_args_list[1].args[1] == ('projects',)
+        assert db.execute_query.call_count == 2
+        db.commit.assert_not_called()
+
+
+class TestReferenceCacheRoutes:
+    """
+    画面での参照データのキャッシュのテストクラス
+    """
+
+    def setup_method(self):
+        """
+        テストメソッド実行前のセットアップ
+
+        課長としてログインしたテストクライアントを初期化します。
+        """
+        self.client = app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = 1
+            sess['user_email'] = 'manager@example.com'
+            sess['user_name'] = 'Manager User'
+            sess['user_role'] = 'manager'
+
+    @patch('app.DBAccess')
+    def test_employees_list_cached(self, mock_dbaccess):
+        """
+        社員一覧を2回表示しても、社員の読み込みは1回だけであることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_db_instance.execute_query.return_value = [
+            {'id': 1, 'email': 'employee@example.com', 'name': 'Employee User', 'role': 'employee',
+             'created_at': None}
+        ]
+        mock_dbaccess.return_value = mock_db_instance
+
+        assert self.client.get('/employees').status_code == 200
+        assert self.client.get('/employees').status_code == 200
+
+        mock_db_instance.execute_query.assert_called_once()
+
+    @patch('app.DBAccess')
+    def test_employee_create_bumps_version(self, mock_dbaccess):
+        """
+        社員を作成すると、コミット前に社員一覧のバージョンが上がることを確認します。
+        """
+        mock_db_instance = MagicMock()
+        mock_dbaccess.return_value = mock_db_instance
+        calls = []
+        cursor = mock_db_instance.get_cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = lambda query, params=None: calls.append(params)
+        mock_db_instance.commit.side_effect = lambda: calls.append('commit')
+
+        response = self.client.post('/employees/create', data={
+            'email': 'new@example.com',
+            'password': 'password123',
+            'name': 'New User',
+            'role': 'employee'
+        })
+
+        assert response.status_code == 302
+        assert calls == [('employees',), 'commit']
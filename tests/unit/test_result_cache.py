@@ -0,0 +1,250 @@
+"""
+result_cache.pyの単体テスト
+
+クエリ結果のキャッシュ、テーブル名による無効化、LRU・有効期限・サイズ上限による破棄、
+DBAccess.execute_queryとの連携をテストします。
+"""
+
+from unittest.mock import patch, MagicMock, Mock
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/result_cache.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.DBAccess import DBAccess, reset_pool
+from applications.result_cache import ResultCache, estimate_size, is_write, result_cache, tables_of
+
+QUERY = "SELECT id, name FROM employees ORDER BY name"
+
+
+class Connection:
+    """
+    接続の代わりに使用するクラス（弱参照できるオブジェクト）
+    """
+
+
+def runner(rows):
+    """
+    実行した回数を数えるクエリの実行関数を作成するヘルパー関数
+
+    Args:
+        rows: 返す行のリスト
+
+    Returns:
+        Mock: 呼び出すたびに行のリストの複製を返すモック
+    """
+    return Mock(side_effect=lambda: [dict(row) for row in rows])
+
+
+class TestTables:
+    """
+    テーブル名の抽出と書き込みの判定のテストクラス
+    """
+
+    def test_tables_of_select(self):
+        """
+        FROM・JOIN・カンマ区切りのテーブル名が取り出され、文字列リテラルは無視されることを確認します。
+        """
+        assert tables_of("""
+            SELECT ar.*, e.name FROM attendance_records ar
+            JOIN employees e ON ar.employee_id = e.id
+            WHERE ar.notes = 'from projects'
+        """) == {'attendance_records', 'employees'}
+        assert tables_of("SELECT * FROM employees e, projects p") == {'employees', 'projects'}
+
+    def test_tables_of_write(self):
+        """
+        INSERT・UPDATE・DELETE・ALTERの対象のテーブル名が取り出されることを確認します。
+        """
+        assert tables_of("INSERT INTO projects (name) VALUES (%s)") == {'projects'}
+        assert tables_of("UPDATE `employees` SET name = %s") == {'employees'}
+        assert 'project_hours' in tables_of(
+            "DELETE ph FROM project_hours ph JOIN attendance_records ar ON ph.attendance_record_id = ar.id"
+        )
+        assert tables_of("ALTER TABLE attendance_records DROP PARTITION p202401") == {'attendance_records'}
+
+    def test_is_write(self):
+        """
+        先頭のキーワードで書き込みが判定されることを確認します。
+        """
+        assert is_write("  INSERT INTO projects (name) VALUES ('a')")
+        assert is_write(b"delete from projects")
+        assert not is_write("SELECT * FROM projects")
+
+
+class TestResultCache:
+    """
+    ResultCacheクラスのテストクラス
+    """
+
+    def test_hit_and_miss(self):
+        """
+        同じSQL文とパラメータの2回目はキャッシュから返し、パラメータが異なれば実行することを確認します。
+        """
+        cache = ResultCache(ttl=60, max_bytes=1024 * 1024)
+        conn = Connection()
+        run = runner([{'id': 1, 'name': 'A'}])
+
+        first = cache.execute(conn, QUERY, (1,), False, run)
+        second = cache.execute(conn, QUERY, [1], False, run)
+        cache.execute(conn, QUERY, (2,), False, run)
+
+        assert second == first
+        assert run.call_count == 2
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+    def test_returned_rows_are_copies(self):
+        """
+        返した行を変更しても、キャッシュした結果が変わらないことを確認します。
+        """
+        cache = ResultCache(ttl=60, max_bytes=1024 * 1024)
+        conn = Connection()
+        run = runner([{'id': 1, 'name': 'A'}])
+
+        cache.execute(conn, QUERY, None, False, run)[0]['name'] = 'changed'
+
+        assert cache.execute(conn, QUERY, None, False, run)[0]['name'] == 'A'
+
+    def test_write_invalidates_tagged_entries(self):
+        """
+        書き込んだテーブルを読んだ結果だけが破棄されることを確認します。
+        """
+        cache = ResultCache(ttl=60, max_bytes=1024 * 1024)
+        conn = Connection()
+        employees = runner([{'id': 1}])
+        projects = runner([{'id': 2}])
+        cache.execute(conn, QUERY, None, False, employees)
+        cache.execute(conn, "SELECT id FROM projects", None, False, projects)
+
+        cache.note_write(Connection(), "UPDATE employees SET name = %s WHERE id = %s")
+        cache.execute(conn, QUERY, None, False, employees)
+        cache.execute(conn, "SELECT id FROM projects", None, False, projects)
+
+        assert employees.call_count == 2
+        assert projects.call_count == 1
+        assert cache.stats()['invalidations'] == 1
+
+    def test_uncommitted_write_bypasses_cache(self):
+        """
+        コミット前に書き込んだ接続ではキャッシュを使わず、コミット後に改めて破棄されることを確認します。
+        """
+        cache = ResultCache(ttl=60, max_bytes=1024 * 1024)
+        writer, reader = Connection(), Connection()
+        run = runner([{'id': 1}])
+
+        cache.note_write(writer, "INSERT INTO employees (name) VALUES (%s)")
+        cache.execute(writer, QUERY, None, False, run)
+        assert cache.stats()['entries'] == 0
+
+        # 他の接続はコミット前のデータを読まないため、キャッシュしてよい
+        cache.execute(reader, QUERY, None, False, run)
+        assert cache.stats()['entries'] == 1
+
+        cache.end_transaction(writer, committed=True)
+        assert cache.stats()['entries'] == 0
+
+    def test_write_during_query_is_not_cached(self):
+        """
+        クエリの実行中に同じテーブルへの書き込みがあった場合、結果を保存しないことを確認します。
+        """
+        cache = ResultCache(ttl=60, max_bytes=1024 * 1024)
+        conn = Connection()
+
+        def run():
+            cache.invalidate(['employees'])
+            return [{'id': 1}]
+
+        cache.execute(conn, QUERY, None, False, run)
+
+        assert cache.stats()['entries'] == 0
+
+    def test_ttl_expiration(self):
+        """
+        有効期限を過ぎた結果は破棄されて再実行されることを確認します。
+        """
+        cache = ResultCache(ttl=10, max_bytes=1024 * 1024)
+        conn = Connection()
+        run = runner([{'id': 1}])
+
+        with patch('applications.result_cache.time.monotonic', return_value=100.0):
+            cache.execute(conn, QUERY, None, False, run)
+        with patch('applications.result_cache.time.monotonic', return_value=111.0):
+            cache.execute(conn, QUERY, None, False, run)
+
+        assert run.call_count == 2
+        assert cache.stats()['expirations'] == 1
+
+    def test_lru_eviction_by_size(self):
+        """
+        合計サイズが上限を超えた場合、最も長く使われていない結果から破棄されることを確認します。
+        """
+        rows = [{'id': 1, 'name': 'x' * 300}]
+        # 4件までしか保持できない上限
+        cache = ResultCache(ttl=60, max_bytes=int(estimate_size(rows) * 4.5))
+        conn = Connection()
+        runs = {params: runner(rows) for params in range(5)}
+
+        for params in range(4):
+            cache.execute(conn, QUERY, params, False, runs[params])
+        cache.execute(conn, QUERY, 0, False, runs[0])
+        cache.execute(conn, QUERY, 4, False, runs[4])
+        cache.execute(conn, QUERY, 0, False, runs[0])
+        cache.execute(conn, QUERY, 1, False, runs[1])
+
+        assert cache.stats()['evictions'] >= 1
+        assert runs[0].call_count == 1
+        assert runs[1].call_count == 2
+
+    def test_disabled(self):
+        """
+        有効期限が0の場合は、毎回クエリを実行することを確認します。
+        """
+        cache = ResultCache(ttl=0)
+        run = runner([{'id': 1}])
+
+        cache.execute(Connection(), QUERY, None, False, run)
+        cache.execute(Connection(), QUERY, None, False, run)
+
+        assert run.call_count == 2
+
+
+class TestDBAccessCache:
+    """
+    DBAccess.execute_queryのcache引数のテストクラス
+    """
+
+    def setup_method(self):
+        """
+        前のテストの接続が残らないよう、コネクションプールを破棄します。
+        """
+        reset_pool()
+
+    def teardown_method(self):
+        """
+        コネクションプールを破棄します。
+        """
+        reset_pool()
+
+    @patch('applications.DBAccess.pymysql.connect')
+    def test_execute_query_cache(self, mock_connect):
+        """
+        cache=Trueの場合は2回目をキャッシュから返し、書き込みのコミット後に再実行することを確認します。
+        """
+        mock_conn = MagicMock()
+        mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [{'id': 1, 'name': 'test'}]
+        mock_connect.return_value = mock_conn
+        db = DBAccess()
+
+        assert db.execute_query(QUERY, cache=True) == [{'id': 1, 'name': 'test'}]
+        db.execute_query(QUERY, cache=True)
+        assert mock_cursor.execute.call_count == 1
+
+        result_cache.note_write(db.conn, "DELETE FROM employees WHERE id = %s")
+        db.commit()
+        db.execute_query(QUERY, cache=True)
+        assert mock_cursor.execute.call_count == 2
@@ -0,0 +1,225 @@
+"""
+shared_cache.pyの単体テスト
+
+プロセス間共有キャッシュの保存・有効期限・サイズ上限による破棄・get_or_compute、
+クエリ結果・参照データのキャッシュとの連携をテストします。
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/shared_cache.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.DBAccess import row_class
+from applications.reference_cache import ReferenceCache
+from applications.result_cache import ResultCache
+from applications.shared_cache import SharedCache
+
+QUERY = "SELECT id, name FROM employees ORDER BY name"
+
+
+class Connection:
+    """
+    接続の代わりに使用するクラス（弱参照できるオブジェクト）
+    """
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """
+    キャッシュファイルのパスを返すfixture
+    """
+    return str(tmp_path / 'cache.sqlite3')
+
+
+class TestSharedCache:
+    """
+    SharedCacheクラスのテストクラス
+    """
+
+    def test_set_and_get(self, cache_path):
+        """
+        保存した値を、別のインスタンス（別のプロセスに相当）から読めることを確認します。
+        """
+        SharedCache(cache_path).set('key', {'rows': [1, 2]}, ttl=60)
+
+        assert SharedCache(cache_path).get('key') == (True, {'rows': [1, 2]})
+        assert SharedCache(cache_path).get('missing') == (False, None)
+
+    def test_expired(self, cache_path):
+        """
+        有効期限を過ぎた値は見つからないことを確認します。
+        """
+        cache = SharedCache(cache_path)
+        cache.set('key', 'value', ttl=-1)
+
+        assert cache.get('key') == (False, None)
+
+    def test_eviction_by_size(self, cache_path):
+        """
+        合計サイズが上限を超えた場合、最終参照時刻の古い値から破棄されることを確認します。
+        """
+        cache = SharedCache(cache_path, max_bytes=10000)
+        for i in range(5):
+            cache.set(f'key{i}', 'x' * 2000, ttl=60)
+
+        stats = cache.stats()
+        assert stats['bytes'] <= 10000
+        assert cache.get('key0') == (False, None)
+        assert cache.get('key4')[0]
+
+    def test_too_large_value_is_not_saved(self, cache_path):
+        """
+        上限に対して大きすぎる値は保存しないことを確認します。
+        """
+        cache = SharedCache(cache_path, max_bytes=1000)
+
+        assert cache.set('key', 'x' * 1000, ttl=60) is False
+        assert cache.stats()['entries'] == 0
+
+    def test_get_or_compute_once(self, cache_path):
+        """
+        同じキーを同時に求めた場合、1回だけ計算されることを確認します。
+        キャッシュファイルがない状態から、すべてのスレッドが同時に接続を始めます。
+        """
+        compute = Mock(side_effect=lambda: time.sleep(0.05) or 'value')
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            cache = SharedCache(cache_path)
+            barrier.wait()
+            results.append(cache.get_or_compute('key', compute, ttl=60))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 8
+        compute.assert_called_once()
+
+    def test_get_or_compute_waits_while_locked(self, cache_path):
+        """
+        キャッシュファイルがロックされている場合、ロックなしで計算せずに待ち直すことを確認します。
+        """
+        cache = SharedCache(cache_path)
+        compute = Mock(return_value='value')
+
+        with patch.object(cache, '_acquire', side_effect=[sqlite3.OperationalError('database is locked'), True]):
+            assert cache.get_or_compute('key', compute, ttl=60) == 'value'
+
+        compute.assert_called_once()
+        assert SharedCache(cache_path).get('key') == (True, 'value')
+
+    def test_initialize_retries_while_locked(self, cache_path):
+        """
+        初期化中にキャッシュファイルがロックされている場合、再試行することを確認します。
+        """
+        initialize = SharedCache._initialize
+        calls = []
+
+        def flaky(self):
+            calls.append(self)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError('database is locked')
+            initialize(self)
+
+        with patch.object(SharedCache, '_initialize', flaky):
+            cache = SharedCache(cache_path)
+            cache.set('key', 'value', ttl=60)
+
+        assert len(calls) == 2
+        assert cache.get('key') == (True, 'value')
+
+    def test_get_or_compute_unavailable(self, tmp_path):
+        """
+        キャッシュファイルにアクセスできない場合、計算した値を返すことを確認します。
+        """
+        cache = SharedCache(str(tmp_path / 'missing' / 'cache.sqlite3'))
+
+        assert cache.get_or_compute('key', lambda: 'value', ttl=60) == 'value'
+
+    def test_get_or_compute_failure_releases_lock(self, cache_path):
+        """
+        計算に失敗した場合、ロックが解放されて次の呼び出しで計算し直すことを確認します。
+        """
+        cache = SharedCache(cache_path)
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute('key', Mock(side_effect=ValueError), ttl=60)
+
+        assert cache.get_or_compute('key', lambda: 'value', ttl=60) == 'value'
+
+    def test_tag_versions(self, cache_path):
+        """
+        タグのバージョンが上がることを確認します。
+        """
+        cache = SharedCache(cache_path)
+        cache.bump_tags(['employees'])
+        cache.bump_tags(['employees', 'projects'])
+
+        assert cache.tag_versions(['employees', 'projects', 'other']) == {
+            'employees': 2, 'projects': 1, 'other': 0
+        }
+
+    def test_compact_rows_are_picklable(self):
+        """
+        コンパクトな行をpickleで復元できることを確認します。
+        """
+        row = row_class(('id', 'name'))._make((1, 'A'))
+
+        restored = pickle.loads(pickle.dumps([row]))[0]
+
+        assert restored == row
+        assert restored['name'] == 'A'
+
+
+class TestSharedBackends:
+    """
+    クエリ結果・参照データのキャッシュとの連携のテストクラス
+    """
+
+    def test_result_cache_shared_between_processes(self, cache_path):
+        """
+        あるプロセスの結果を他のプロセスが使い、書き込みのコミット後は読み直すことを確認します。
+        """
+        first = ResultCache(ttl=60, backend=SharedCache(cache_path))
+        second = ResultCache(ttl=60, backend=SharedCache(cache_path))
+        run = Mock(return_value=[{'id': 1}])
+
+        first.execute(Connection(), QUERY, None, False, run)
+        assert second.execute(Connection(), QUERY, None, False, run) == [{'id': 1}]
+        assert run.call_count == 1
+
+        writer = Connection()
+        first.note_write(writer, "UPDATE employees SET name = %s")
+        first.end_transaction(writer, committed=True)
+        second.execute(Connection(), QUERY, None, False, run)
+        assert run.call_count == 2
+
+    def test_reference_cache_shared_between_processes(self, cache_path):
+        """
+        同じバージョンの参照データを、他のプロセスが読み込まずに使うことを確認します。
+        """
+        queries = {'projects': ("SELECT id, name FROM projects ORDER BY name", False)}
+        db = MagicMock()
+        cursor = db.get_cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [{'name': 'projects', 'version': 3}]
+        db.execute_query.return_value = [{'id': 1, 'name': 'Project A'}]
+
+        ReferenceCache(queries, ttl=0, backend=SharedCache(cache_path)).get(db, 'projects')
+        rows = ReferenceCache(queries, ttl=0, backend=SharedCache(cache_path)).get(db, 'projects')
+
+        assert rows == [{'id': 1, 'name': 'Project A'}]
+        db.execute_query.assert_called_once()
@@ -0,0 +1,53 @@
+"""
+time_format.pyの単体テスト
+
+時刻と整数（分）の変換、HH:MM形式へのフォーマットをテストします。
+"""
+
+import pytest
+import sys
+import os
+from datetime import time, timedelta
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/applications/time_format.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications.time_format import format_minutes, format_time, to_minutes
+
+
+class TestTimeFormat:
+    """
+    時刻の変換・フォーマットのテストクラス
+    """
+
+    @pytest.mark.parametrize('value, expected', [
+        (timedelta(hours=9, minutes=15), 555),
+        (time(18, 30), 1110),
+        ('09:45', 585),
+        ('01:00:00', 60),
+        ('', None),
+        (None, None),
+    ])
+    def test_to_minutes(self, value, expected):
+        """
+        各種の時刻表現が0時からの経過分に変換されることを確認します。
+        """
+        assert to_minutes(value) == expected
+
+    def test_format_minutes(self):
+        """
+        経過分がHH:MM形式に変換されることを確認します。
+        """
+        assert format_minutes(555) == '09:15'
+        assert format_minutes(0) == '00:00'
+        assert format_minutes(None) is None
+
+    def test_format_time(self):
+        """
+        TIME型の値がHH:MM形式に変換され、文字列はそのまま返されることを確認します。
+        """
+        assert format_time(timedelta(hours=1)) == '01:00'
+        assert format_time(time(9, 0)) == '09:00'
+        assert format_time('09:00') == '09:00'
@@ -175,7 +175,7 @@ class TestTimeFormatting:
         from datetime import time as dt_time
         
         # モックの設定
-        mock_db = Mock()
+        mock_db = MagicMock()  # 参照データのキャッシュがカーソルを使うため
         mock_dbaccess.return_value = mock_db
         
         # timedeltaオブジェクトを含むテストデータ
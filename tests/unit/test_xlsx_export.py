@@ -0,0 +1,159 @@
+"""
+xlsx_export.pyの単体テスト
+
+XLSXのストリーミング出力（ZIPとして読めること、セルの型、バッチごとの出力、途中終了時の解放）をテストします。
+"""
+
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# コンテナ内のパス構造に対応するため、パスを追加
+sys.path.insert(0, '/usr/src/app')
+# ローカル環境用のフォールバック
+if not os.path.exists('/usr/src/app/app.py'):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from applications import xlsx_export
+
+NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+COLUMNS = (('ID', 'number'), ('名前', 'string'), ('日付', 'date'), ('出勤', 'time'), ('時間', 'hours'))
+
+
+def read_sheet(data, index=1):
+    """
+    XLSXのバイト列から指定したシートのセルを (参照, 型, スタイル, 値) の行のリストで返すヘルパー関数
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        assert workbook.testzip() is None
+        root = ET.fromstring(workbook.read(f'xl/worksheets/sheet{index}.xml'))
+    rows = []
+    for row in root.iterfind('m:sheetData/m:row', NS):
+        cells = []
+        for cell in row.iterfind('m:c', NS):
+            text = cell.find('m:is/m:t', NS)
+            value = text.text if text is not None else cell.find('m:v', NS).text
+            cells.append((cell.get('r'), cell.get('t'), cell.get('s'), value))
+        rows.append(cells)
+    return rows
+
+
+class TestColumnName:
+    """
+    列名の変換のテストクラス
+    """
+
+    def test_column_name(self):
+        """
+        列番号がExcelの列名に変換されることを確認します。
+        """
+        assert [xlsx_export.column_name(index) for index in (0, 25, 26, 27, 701, 702)] == \
+            ['A', 'Z', 'AA', 'AB', 'ZZ', 'AAA']
+
+
+class TestStreamWorkbook:
+    """
+    XLSXのストリーミング出力のテストクラス
+    """
+
+    def test_workbook_parts(self):
+        """
+        出力がブック・シート・スタイルを含むZIPとして読めることを確認します。
+        """
+        sheets = [xlsx_export.Sheet('勤怠記録', COLUMNS, [], tuple),
+                  xlsx_export.Sheet('A & B', COLUMNS, [], tuple)]
+
+        data = b''.join(xlsx_export.stream_workbook(sheets))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+            assert set(workbook.namelist()) == {
+                '[Content_Types].xml', '_rels/.rels', 'xl/workbook.xml', 'xl/_rels/workbook.xml.rels',
+                'xl/styles.xml', 'xl/worksheets/sheet1.xml', 'xl/worksheets/sheet2.xml',
+            }
+            root = ET.fromstring(workbook.read('xl/workbook.xml'))
+        assert [sheet.get('name') for sheet in root.iterfind('m:sheets/m:sheet', NS)] == ['勤怠記録', 'A & B']
+        assert read_sheet(data, 2) == [[('A1', 'inlineStr', '1', 'ID'), ('B1', 'inlineStr', '1', '名前'),
+                                        ('C1', 'inlineStr', '1', '日付'), ('D1', 'inlineStr', '1', '出勤'),
+                                        ('E1', 'inlineStr', '1', '時間')]]
+
+    def test_cell_types(self):
+        """
+        数値・文字列・日付・時刻・時間数のセルと、空のセル・エスケープが正しく書き込まれることを確認します。
+        """
+        rows = [(1, '佐藤 <花子> & "\x01"', date(2025, 1, 6), 540, Decimal('7.50')),
+                (2, None, date(1900, 3, 1), None, None)]
+        sheets = [xlsx_export.Sheet('勤怠記録', COLUMNS, [rows], tuple)]
+
+        cells = read_sheet(b''.join(xlsx_export.stream_workbook(sheets)))
+
+        assert cells[1] == [('A2', None, None, '1'), ('B2', 'inlineStr', None, '佐藤 <花子> & ""'),
+                            ('C2', None, '2', '45663'), ('D2', None, '3', '0.375'), ('E2', None, '4', '7.5')]
+        assert cells[2] == [('A3', None, None, '2'), ('C3', None, '2', '61')]
+
+    def test_chunk_per_batch(self):
+        """
+        行のバッチを読む前にブックの先頭を出力し、行のバッチを読むごとに出力されることを確認します。
+        """
+        read = []
+
+        def batches():
+            for number in range(3):
+                read.append(number)
+                # 圧縮で溜め込まれないよう、圧縮しにくい値を書き込む
+                yield [(number, os.urandom(16000).hex(), None, None, None)]
+
+        chunks = xlsx_export.stream_workbook([xlsx_export.Sheet('勤怠記録', COLUMNS, batches(), tuple)])
+
+        head = next(chunks)
+        assert read == []
+        rest = list(chunks)
+        assert read == [0, 1, 2]
+        assert len(rest) >= 2
+        assert [row[0][3] for row in read_sheet(head + b''.join(rest))[1:]] == ['0', '1', '2']
+
+    @patch.object(xlsx_export, 'MAX_SHEET_ROWS', 4)
+    def test_continuation_sheets(self):
+        """
+        シートが最大行数に達した場合、続きのシートに書き込まれることを確認します。
+        """
+        batches = [[(number, 'a', None, None, None) for number in range(start, start + size)]
+                   for start, size in ((0, 2), (2, 5))]
+        sheets = [xlsx_export.Sheet('勤怠記録', COLUMNS, batches, tuple),
+                  xlsx_export.Sheet('プロジェクト作業時間', COLUMNS, [[(7, 'b', None, None, None)] * 3], tuple)]
+
+        data = b''.join(xlsx_export.stream_workbook(sheets))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+            root = ET.fromstring(workbook.read('xl/workbook.xml'))
+            content_types = workbook.read('[Content_Types].xml').decode('utf-8')
+        assert [sheet.get('name') for sheet in root.iterfind('m:sheets/m:sheet', NS)] == \
+            ['勤怠記録', '勤怠記録 (2)', '勤怠記録 (3)', 'プロジェクト作業時間']
+        assert '/xl/worksheets/sheet4.xml' in content_types
+        assert [[row[0][:1] + row[0][3:] for row in read_sheet(data, index)[1:]] for index in (1, 2, 3, 4)] == [
+            [('A2', '0'), ('A3', '1'), ('A4', '2')],
+            [('A2', '3'), ('A3', '4'), ('A4', '5')],
+            [('A2', '6')],
+            [('A2', '7'), ('A3', '7'), ('A4', '7')],
+        ]
+        assert read_sheet(data, 2)[0][0] == ('A1', 'inlineStr', '1', 'ID')
+
+    def test_close_releases_batches(self):
+        """
+        出力の途中で閉じると、すべてのシートの行のバッチのジェネレータが閉じられることを確認します。
+        """
+        first = MagicMock()
+        first.__iter__.return_value = iter([[(1, 'a', None, None, None)]])
+        second = MagicMock()
+
+        chunks = xlsx_export.stream_workbook([xlsx_export.Sheet('a', COLUMNS, first, tuple),
+                                              xlsx_export.Sheet('b', COLUMNS, second, tuple)])
+        next(chunks)
+        chunks.close()
+
+        first.close.assert_called_once()
+        second.close.assert_called_once()